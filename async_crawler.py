@@ -0,0 +1,312 @@
+#! python3
+# async_crawler.py
+
+"""
+This module runs the whole name_translations.py pipeline (list pages,
+    links, person pages, rows) on asyncio. Pages are fetched with
+    aiohttp through a host_scheduler.HostScheduler, which bounds the
+    number of requests in flight (and, optionally, the request rate) on
+    each host separately, so thousands of pending pages cost a few
+    coroutines rather than threads, and lists and pages on many wikis
+    can be crawled at once. Pages are parsed in a worker thread so that
+    parsing does not block the event loop.
+
+It can be embedded in an async service:
+
+    import async_crawler
+
+    async for row in async_crawler.run(concurrency=50):
+        ...
+
+or run from the command line:
+
+    python async_crawler.py --concurrency 50 --output name_translations.csv
+
+    python async_crawler.py --host-rate 10 \
+        --host-limit fr.wikipedia.org=4:2 --host-limit de.wikipedia.org=8
+
+The rows are the same dictionaries that name_translations.py writes to
+    its csv (or, with raw=True, to its raw csv). The English rows for all
+    pages are yielded as soon as the lists have been scraped, and the
+    rows for each page's interlanguage links as soon as that page has
+    been parsed, so rows from different pages may arrive in any order.
+    As in name_translations.py, a list or page that cannot be scraped is
+    skipped, and recorded in a dead-letter file if one is given (see
+    dead_letters.py).
+
+This module needs aiohttp, which name_translations.py does not.
+"""
+
+# Import libraries.
+import argparse
+import asyncio
+import importlib.util
+import os
+from urllib.parse import urlsplit
+
+import dead_letters
+import derive_names
+import frontier_pruning
+import host_scheduler
+import name_translations
+from page_urls import canonical_url
+
+# Set the default number of requests in flight at once on each host.
+DEFAULT_CONCURRENCY = host_scheduler.DEFAULT_CONCURRENCY
+
+
+async def fetch_page(scheduler, url, cache_dir=None):
+    """
+    Return the text of the page at url, waiting for a free slot on its
+        host in scheduler (a host_scheduler.HostScheduler) before sending
+        the request. If cache_dir is given, the page is read from the
+        cache if it has been scraped before, and saved to the cache
+        otherwise.
+    """
+    if cache_dir is not None:
+        cache_path = name_translations.get_cache_path(url, cache_dir)
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as cache_file:
+                return cache_file.read()
+    data = await scheduler.fetch(url)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as cache_file:
+            cache_file.write(data)
+    return data
+
+
+async def get_namespaces(scheduler, url, cache_dir=None):
+    """
+    Return the namespaces of the wiki of url, as
+        name_translations.get_namespaces does.
+    """
+    siteinfo_url = name_translations.get_siteinfo_url(url)
+    if siteinfo_url is None:
+        return {}
+    try:
+        return frontier_pruning.parse_siteinfo(
+            await fetch_page(scheduler, siteinfo_url, cache_dir))
+    except Exception:
+        return {}
+
+
+async def get_candidate_links(scheduler, list_sources, cache_dir=None,
+                              letters=None):
+    """
+    Scrape the Wikipedia lists in list_sources concurrently and return a
+        list of (list name, href, title) tuples in the same order as
+        name_translations.get_candidate_links, and a dictionary from the
+        host of each wiki other than the English language one to its
+        namespaces, for frontier_pruning.prune_links. A list that cannot
+        be scraped has no links, and is recorded in letters (a
+        dead_letters.DeadLetters) if it is given.
+    """
+    styles_by_url = {}
+    names_by_url = {}
+    for url, name, style in list_sources:
+        styles_by_url.setdefault(url, []).append(style)
+        names_by_url.setdefault(url, name)
+
+    namespaces = {}
+
+    async def get_list_links(url):
+        try:
+            data = await fetch_page(scheduler, url, cache_dir)
+            host = urlsplit(url).netloc.lower()
+            if host not in namespaces:
+                namespaces[host] = await get_namespaces(scheduler, url,
+                                                        cache_dir)
+            url_links = await asyncio.to_thread(
+                name_translations.extract_list_links, data,
+                styles_by_url[url], namespaces[host])
+        except Exception as error:
+            if letters is not None:
+                letters.record(url, "list", error,
+                               {"URL": url, "Source": names_by_url[url]})
+            url_links = {style: [] for style in styles_by_url[url]}
+        return url, {style: name_translations.resolve_links(url, links)
+                     for style, links in url_links.items()}
+
+    links_by_url = dict(await asyncio.gather(
+        *[get_list_links(url) for url in styles_by_url]))
+    candidate_links = []
+    for url, name, style in list_sources:
+        for href, title in links_by_url[url][style]:
+            candidate_links.append((name, href, title))
+    return candidate_links, namespaces
+
+
+async def run(list_sources=None, concurrency=DEFAULT_CONCURRENCY,
+              session=None, cache_dir=None, prune=False,
+              check_people=False, raw=False, rate=None, host_limits=None,
+              letters=None):
+    """
+    Scrape the Wikipedia lists in list_sources (by default, all of the
+        lists in name_translations.py) and the pages they link to, and
+        yield a dictionary for each row of the results as it is
+        produced. At most concurrency requests are in flight at once on
+        each host, and, if rate is given, at most rate requests are
+        started per second on each host. host_limits is a dictionary
+        from a host to its own (concurrency, rate) tuple.
+
+    An existing aiohttp.ClientSession can be passed as session, to be
+        shared by every host; otherwise each host gets its own, which is
+        closed by this function. If prune
+        is True, links that do not lead to articles (and, if
+        check_people is True, links to articles that are not about
+        people) are skipped, as in frontier_pruning.py. If raw is True,
+        the raw dictionaries described in derive_names.py are yielded
+        instead of derived rows.
+
+    Pages found on lists on other wikis are yielded under the URL of the
+        person's English language page (see
+        name_translations.get_entity_url), and left out if that person
+        has already been yielded.
+
+    A list or page that cannot be scraped or parsed is skipped, and
+        recorded in letters (a dead_letters.DeadLetters) if it is
+        given, so one failure does not stop the crawl.
+    """
+    if importlib.util.find_spec("aiohttp") is None:
+        raise ImportError("async_crawler.py needs aiohttp; install it "
+                          "with 'pip install aiohttp'")
+
+    if list_sources is None:
+        list_sources = name_translations.get_list_sources()
+    scheduler = host_scheduler.HostScheduler(concurrency, rate,
+                                             host_limits, session)
+    try:
+        candidate_links, namespaces = await get_candidate_links(
+            scheduler, list_sources, cache_dir, letters)
+        if prune:
+            candidate_links, reasons = await asyncio.to_thread(
+                frontier_pruning.prune_links, candidate_links,
+                check_people,
+                name_translations.get_entity_cache_path(cache_dir),
+                namespaces)
+        english_dicts = name_translations.get_english_dicts(
+            candidate_links)
+        frontier_dicts = [english_dict for english_dict in english_dicts
+                          if english_dict["Language Code"] == "en"]
+        seen_urls = {canonical_url(english_dict["URL"])
+                     for english_dict in frontier_dicts}
+        if raw:
+            english_rows = frontier_dicts
+        else:
+            english_rows = derive_names.derive_rows(frontier_dicts)
+        for english_row in english_rows:
+            yield english_row
+
+        async def get_translation_dicts(english_dict):
+            stage = "fetch"
+            try:
+                data = await fetch_page(scheduler, english_dict["URL"],
+                                        cache_dir)
+                stage = "parse"
+                translation_dicts = await asyncio.to_thread(
+                    name_translations.parse_translation_dicts,
+                    english_dict, data)
+            except Exception as error:
+                if letters is not None:
+                    letters.record(english_dict["URL"], stage, error,
+                                   english_dict)
+                return []
+            if english_dict["Language Code"] != "en":
+                # Leave out people who have already been yielded. A
+                #   page on another wiki has its own English row.
+                if not translation_dicts:
+                    return []
+                url = canonical_url(translation_dicts[0]["URL"])
+                if url in seen_urls:
+                    return []
+                seen_urls.add(url)
+                if raw:
+                    return translation_dicts
+                return derive_names.derive_rows(translation_dicts)
+            if raw:
+                return translation_dicts
+            # Derive the names together with the page's English row,
+            #   which supplies the English names, and then drop it.
+            return derive_names.derive_rows(
+                [english_dict] + translation_dicts)[1:]
+
+        tasks = [asyncio.ensure_future(get_translation_dicts(english_dict))
+                 for english_dict in english_dicts]
+        try:
+            for task in asyncio.as_completed(tasks):
+                for translation_dict in await task:
+                    yield translation_dict
+        finally:
+            # Cancel the remaining requests if the caller stops early.
+            for task in tasks:
+                task.cancel()
+    finally:
+        await scheduler.close()
+
+
+async def write_csv(output, **kwargs):
+    """
+    Run the pipeline and write its rows to a csv at output. Lists and
+        pages that cannot be scraped are recorded in a dead-letter file
+        beside it.
+    """
+    import pandas as pd
+
+    failures_path = os.path.join(os.path.dirname(output),
+                                 dead_letters.FILE_NAME)
+    if os.path.exists(failures_path):
+        os.remove(failures_path)
+    with dead_letters.DeadLetters(failures_path) as letters:
+        rows = [row async for row in run(letters=letters, **kwargs)]
+    pd.DataFrame(rows).to_csv(output, encoding="utf-8-sig")
+    print(f"Saved {len(rows)} rows to {output}.")
+    if letters.count > 0:
+        print(f"{letters.count} pages failed; see {failures_path}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scrape translations of people's names with asyncio.")
+    parser.add_argument("--concurrency", "--host-concurrency", type=int,
+                        default=DEFAULT_CONCURRENCY,
+                        help="maximum number of requests in flight on "
+                             "each host")
+    parser.add_argument("--host-rate", type=float,
+                        help="maximum number of requests started per "
+                             "second on each host")
+    parser.add_argument("--host-limit", action="append", default=[],
+                        metavar="HOST=CONCURRENCY[:RATE]",
+                        help="concurrency and rate of one host (may be "
+                             "repeated)")
+    parser.add_argument("--output", default="name_translations.csv",
+                        help="path of the csv to write")
+    parser.add_argument("--cache-dir",
+                        help="directory in which to cache scraped pages")
+    parser.add_argument("--prune", action="store_true",
+                        help="skip links that do not lead to articles")
+    parser.add_argument("--check-people", action="store_true",
+                        help="with --prune, also skip articles whose "
+                             "Wikidata items are not people")
+    parser.add_argument("--source", action="append", dest="sources",
+                        help="name of a list in sources.json to scrape "
+                             "(may be repeated; by default, all of them)")
+    args = parser.parse_args()
+    host_limits = {}
+    for text in args.host_limit:
+        try:
+            host, concurrency, rate = host_scheduler.parse_host_limit(text)
+        except ValueError as error:
+            parser.error(str(error))
+        host_limits[host] = (concurrency, rate if rate is not None
+                             else args.host_rate)
+    asyncio.run(write_csv(
+        args.output,
+        list_sources=name_translations.get_list_sources(args.sources),
+        concurrency=args.concurrency, cache_dir=args.cache_dir,
+        prune=args.prune, check_people=args.check_people,
+        rate=args.host_rate, host_limits=host_limits))
+
+
+if __name__ == "__main__":
+    main()
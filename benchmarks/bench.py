@@ -0,0 +1,341 @@
+#! python3
+# bench.py
+
+"""
+This program runs the whole name_translations.py pipeline on fixture
+    pages repeatedly, keeps the results of every run in a local results
+    file, and compares two versions of the code, so that it can be told
+    whether a change to fetching, parsing, or normalisation helped.
+
+Its commands are:
+
+        run         Run the pipeline --repeats times, each in a new
+                    process, and append each run's metrics to the results
+                    file under a version label (by default, the git
+                    commit, marked "-dirty" if there are uncommitted
+                    changes).
+        compare     Compare the runs of two versions.
+        list        List the versions in the results file.
+
+The metrics of each run are:
+
+        pages_per_second        Person pages scraped per second.
+        seconds                 The run's wall-clock time.
+        peak_rss_mb             The process's peak resident memory.
+        output_bytes            The size of the files written.
+        <stage>.p50_ms, .p95_ms The median and 95th percentile latencies
+                                of each stage (see stage_profiler.py).
+
+compare gives the change in each metric's mean from one version to the
+    other, with a bootstrap confidence interval made by resampling each
+    version's runs, and flags a regression where the whole interval is
+    on the worse side of --min-change. Since an interval resampled from
+    a few runs is far too narrow, changes are only flagged between
+    versions with at least MIN_RUNS runs each. For instance:
+
+    python benchmarks/bench.py run --version before --repeats 10
+    (change the code)
+    python benchmarks/bench.py run --version after --repeats 10
+    python benchmarks/bench.py compare before after
+"""
+
+# Import libraries.
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import fixtures
+
+DEFAULT_RESULTS = os.path.join(fixtures.REPOSITORY, "benchmarks",
+                               "results.jsonl")
+
+# Name the metrics for which a higher value is better. For every other
+#   metric, lower is better.
+HIGHER_IS_BETTER = {"pages_per_second"}
+
+# Set the number of runs of each version below which compare flags no
+#   changes.
+MIN_RUNS = 5
+
+
+def get_version():
+    """
+    Return the short hash of the repository's current commit, followed by
+        "-dirty" if there are uncommitted changes, or "unknown".
+    """
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], check=True,
+            capture_output=True, text=True,
+            cwd=fixtures.REPOSITORY).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def get_peak_rss_mb():
+    """
+    Return the peak resident memory of this process in megabytes, or None
+        where the resource module is not available (on Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS bytes.
+    if sys.platform == "darwin":
+        return peak / 2 ** 20
+    return peak / 2 ** 10
+
+
+def run_once(rows, languages):
+    """
+    Run the pipeline once on fixture pages and return a dictionary of its
+        metrics.
+    """
+    import name_translations
+    import stage_profiler
+
+    fixtures.FixturePages(list_rows=rows, languages=languages).install()
+    with tempfile.TemporaryDirectory() as directory:
+        stage_profiler.start("time")
+        timer = stage_profiler.profiler
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            name_translations.main(["--output-dir", directory])
+        seconds = time.perf_counter() - start
+        stage_profiler.stop(directory)
+        output_bytes = sum(entry.stat().st_size
+                           for entry in os.scandir(directory)
+                           if not entry.name.startswith("profile_"))
+
+    summary = timer.get_summary()
+    pages = summary.get("person_fetch", {}).get("runs", 0)
+    metrics = {
+        "pages_per_second": pages / seconds,
+        "seconds": seconds,
+        "peak_rss_mb": get_peak_rss_mb(),
+        "output_bytes": output_bytes
+        }
+    for name, stage_summary in summary.items():
+        for statistic in ["p50_ms", "p95_ms"]:
+            metrics[f"{name}.{statistic}"] = stage_summary[statistic]
+    return metrics
+
+
+def read_results(path):
+    """
+    Return a list of the runs in a results file, or an empty list if
+        there is no file.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as results_file:
+        return [json.loads(line) for line in results_file if line.strip()]
+
+
+def run(version, repeats, rows, languages, path):
+    """
+    Run the pipeline repeats times, each in a new process so that each
+        run's peak memory is its own, and append the runs to the results
+        file at path.
+    """
+    for repeat in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "run-once",
+             "--rows", str(rows), "--languages", str(languages)],
+            check=True, capture_output=True, text=True)
+        metrics = json.loads(completed.stdout.strip().splitlines()[-1])
+        with open(path, "a", encoding="utf-8") as results_file:
+            results_file.write(json.dumps({
+                "version": version,
+                "time": datetime.datetime.now().isoformat(
+                    timespec="seconds"),
+                "settings": {"rows": rows, "languages": languages},
+                "metrics": metrics
+                }) + "\n")
+        print(f"Run {repeat + 1} of {repeats}: "
+              f"{metrics['pages_per_second']:.0f} pages/s, "
+              f"{metrics['seconds']:.2f} s")
+
+
+def bootstrap_change(base, candidate, confidence, resamples, rng):
+    """
+    Return the relative change from the mean of base to the mean of
+        candidate, and a bootstrap confidence interval for it.
+    """
+    def change(base_sample, candidate_sample):
+        base_mean = statistics.fmean(base_sample)
+        if base_mean == 0:
+            return 0.0
+        return statistics.fmean(candidate_sample) / base_mean - 1
+
+    changes = sorted(
+        change(rng.choices(base, k=len(base)),
+               rng.choices(candidate, k=len(candidate)))
+        for resample in range(resamples))
+    tail = (1 - confidence) / 2
+    low = changes[int(tail * (resamples - 1))]
+    high = changes[int((1 - tail) * (resamples - 1))]
+    return change(base, candidate), low, high
+
+
+def compare(runs, base_version, candidate_version, confidence=0.95,
+            resamples=10000, min_change=0.02, seed=0):
+    """
+    Return a list of (metric, base mean, candidate mean, change, low,
+        high, verdict) tuples comparing the runs of two versions. The
+        verdict is "regression" or "improvement" where the confidence
+        interval lies wholly beyond min_change on one side, and "" where
+        it doesn't or where either version has fewer than MIN_RUNS runs
+        of the metric.
+    """
+    base_runs = [result["metrics"] for result in runs
+                 if result["version"] == base_version]
+    candidate_runs = [result["metrics"] for result in runs
+                      if result["version"] == candidate_version]
+    for version, version_runs in [(base_version, base_runs),
+                                  (candidate_version, candidate_runs)]:
+        if len(version_runs) < 2:
+            raise ValueError(f"{version} needs at least two runs; it has "
+                             f"{len(version_runs)}")
+
+    rng = random.Random(seed)
+    rows = []
+    for metric in [metric for metric in base_runs[0]
+                   if metric in candidate_runs[0]]:
+        base = [metrics[metric] for metrics in base_runs
+                if metrics.get(metric) is not None]
+        candidate = [metrics[metric] for metrics in candidate_runs
+                     if metrics.get(metric) is not None]
+        if len(base) < 2 or len(candidate) < 2:
+            continue
+        change, low, high = bootstrap_change(base, candidate, confidence,
+                                             resamples, rng)
+        # Turn the interval into one of the gain, so that positive is
+        #   better for every metric.
+        sign = 1 if metric in HIGHER_IS_BETTER else -1
+        gain_low, gain_high = sorted([sign * low, sign * high])
+        verdict = ""
+        if min(len(base), len(candidate)) >= MIN_RUNS:
+            if gain_high < -min_change:
+                verdict = "regression"
+            elif gain_low > min_change:
+                verdict = "improvement"
+        rows.append((metric, statistics.fmean(base),
+                     statistics.fmean(candidate), change, low, high,
+                     verdict))
+    return rows
+
+
+def print_comparison(runs, base_version, candidate_version, rows,
+                     confidence):
+    """
+    Print a comparison in a readable form.
+    """
+    settings = {json.dumps(result["settings"], sort_keys=True)
+                for result in runs
+                if result["version"] in [base_version, candidate_version]}
+    if len(settings) > 1:
+        print("Warning: the versions were run with different settings: "
+              + "; ".join(sorted(settings)))
+    counts = {version: sum(result["version"] == version
+                           for result in runs)
+              for version in [base_version, candidate_version]}
+    for version, count in counts.items():
+        if count < MIN_RUNS:
+            print(f"Warning: {version} has only {count} runs, so no "
+                  f"changes are flagged; run each version at least "
+                  f"{MIN_RUNS} times.")
+    print(f"{base_version} ({counts[base_version]} runs) -> "
+          f"{candidate_version} ({counts[candidate_version]} runs), with "
+          f"{confidence:.0%} confidence intervals")
+    print()
+    print(f"{'Metric':<28}{'Base':>12}{'Candidate':>12}{'Change':>9}"
+          f"{'Interval':>20}")
+    for metric, base, candidate, change, low, high, verdict in rows:
+        interval = f"[{low:+.1%}, {high:+.1%}]"
+        print(f"{metric:<28}{base:>12.4g}{candidate:>12.4g}"
+              f"{change:>+9.1%}{interval:>20}  {verdict.upper()}")
+    regressions = [row[0] for row in rows if row[6] == "regression"]
+    print()
+    if regressions:
+        print(f"{len(regressions)} regressions: " + ", ".join(regressions))
+    else:
+        print("No regressions.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Store and compare benchmark runs of the pipeline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="run the pipeline and store the results")
+    run_parser.add_argument("--version",
+                            help="label of the runs (by default, the git "
+                                 "commit)")
+    run_parser.add_argument("--repeats", type=int, default=5,
+                            help="number of runs")
+    run_once_parser = subparsers.add_parser(
+        "run-once", help="run the pipeline once and print its metrics")
+    for subparser in [run_parser, run_once_parser]:
+        subparser.add_argument("--rows", type=int, default=20,
+                               help="rows in the smallest fixture list "
+                                    "page")
+        subparser.add_argument("--languages", type=int, default=40,
+                               help="interlanguage links per person page")
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="compare the runs of two versions")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--confidence", type=float, default=0.95)
+    compare_parser.add_argument("--resamples", type=int, default=10000,
+                                help="number of bootstrap resamples")
+    compare_parser.add_argument("--min-change", type=float, default=0.02,
+                                help="smallest relative change flagged")
+
+    list_parser = subparsers.add_parser(
+        "list", help="list the versions in the results file")
+
+    for subparser in [run_parser, compare_parser, list_parser]:
+        subparser.add_argument("--results", default=DEFAULT_RESULTS,
+                               help="path of the results file")
+    args = parser.parse_args()
+
+    if args.command == "run-once":
+        print(json.dumps(run_once(args.rows, args.languages)))
+    elif args.command == "run":
+        run(args.version or get_version(), args.repeats, args.rows,
+            args.languages, args.results)
+    elif args.command == "compare":
+        runs = read_results(args.results)
+        try:
+            rows = compare(runs, args.base, args.candidate,
+                           args.confidence, args.resamples,
+                           args.min_change)
+        except ValueError as error:
+            parser.error(str(error))
+        print_comparison(runs, args.base, args.candidate, rows,
+                         args.confidence)
+    else:
+        versions = {}
+        for result in read_results(args.results):
+            versions.setdefault(result["version"], []).append(
+                result["time"])
+        for version, times in versions.items():
+            print(f"{version:<24}{len(times):>6} runs, last {times[-1]}")
+
+
+if __name__ == "__main__":
+    main()
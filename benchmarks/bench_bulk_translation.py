@@ -0,0 +1,149 @@
+#! python3
+# bench_bulk_translation.py
+
+"""
+This benchmark measures the bulk translation of bulk_translation.py on a
+    csv written by name_translations.py: how many rows a second it
+    translates, and how much memory it takes beyond the input column,
+    for a column of --rows names (ten million by default), compared with
+    looking each name up in a dictionary in a Python loop.
+
+The column is drawn from the English names in the csv, weighted by their
+    number of rows, with a share of names in other cases or with spaces
+    around them, and a share of names that are not in the table.
+
+By default, it runs on the results in name_translations.zip, without
+    unzipping them. To measure the results of a new crawl instead:
+
+    python benchmarks/bench_bulk_translation.py \
+        --input name_translations.csv
+"""
+
+# Import libraries.
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import fixtures  # noqa: F401 (makes the repository importable)
+import bulk_translation
+
+# Set the shares of the column's names that are changed, and that are not
+#   in the table.
+VARIANT_SHARE = 0.2
+UNKNOWN_SHARE = 0.1
+
+
+def make_column(path, rows, seed=0):
+    """
+    Return a Series of rows English given names drawn from a csv written
+        by name_translations.py.
+    """
+    english = pd.read_csv(path, usecols=["Name (English)"], dtype=str,
+                          keep_default_na=False,
+                          encoding="utf-8-sig")["Name (English)"]
+    counts = english[english != ""].value_counts()
+    pool = counts.index.tolist()
+    pool += [name.upper() for name in pool] + [f" {name.lower()} "
+                                               for name in pool]
+    pool += [f"Unknown{number}" for number in range(len(counts))]
+    weights = np.concatenate([
+        counts.to_numpy() * (1 - VARIANT_SHARE - UNKNOWN_SHARE),
+        counts.to_numpy() * VARIANT_SHARE / 2,
+        counts.to_numpy() * VARIANT_SHARE / 2,
+        np.full(len(counts), counts.sum() * UNKNOWN_SHARE / len(counts))])
+    rng = np.random.default_rng(seed)
+    choices = rng.choice(len(pool), size=rows, p=weights / weights.sum())
+    return pd.Series(np.array(pool, dtype=object)[choices])
+
+
+def measure(function):
+    """
+    Return the result of function, the seconds it takes, and the peak
+        bytes it allocates. It is run twice: once for the time and once,
+        under tracemalloc, for the memory.
+    """
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def translate_in_loop(table, names, language):
+    """
+    Translate names one at a time with a dictionary, as a caller without
+        the bulk API would.
+    """
+    starts, ends = table.get_language_range(language)
+    translations = {}
+    for english_id, key in enumerate(table.english):
+        if starts[english_id + 1] < ends[english_id + 1]:
+            translations[key] = table.names[table.candidate_names[
+                starts[english_id + 1]]]
+    get_key = bulk_translation.get_key
+    return [translations.get(get_key(name.strip())) for name in names]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark bulk translation.")
+    parser.add_argument("--input", default="name_translations.zip",
+                        help="csv written by name_translations.py, "
+                             "possibly zipped")
+    parser.add_argument("--rows", type=int, default=10_000_000,
+                        help="number of names to translate")
+    parser.add_argument("--loop-rows", type=int, default=1_000_000,
+                        help="number of names to translate in a loop")
+    parser.add_argument("--language", default="French")
+    parser.add_argument("-k", type=int, default=3,
+                        help="number of candidates per name")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table.npz")
+        start = time.perf_counter()
+        count = bulk_translation.build_table_from_csv(args.input, path)
+        build_time = time.perf_counter() - start
+        table = bulk_translation.TranslationTable(path)
+    names = make_column(args.input, args.rows)
+
+    print(f"Table:              {count} translations, "
+          f"{table.get_size() / 2 ** 20:.1f} MB, built in "
+          f"{build_time:.2f} s")
+    print(f"Input:              {len(names)} rows")
+    cases = [
+        ("translate", lambda: table.translate(names, args.language),
+         len(names)),
+        (f"candidates (k={args.k})",
+         lambda: table.translate_candidates(names, args.language, args.k),
+         len(names)),
+        ("Python loop", lambda: translate_in_loop(
+            table, names.iloc[:args.loop_rows], args.language),
+         min(args.loop_rows, len(names)))
+        ]
+    try:
+        import pyarrow as pa
+
+        arrow_names = pa.array(names, type=pa.string())
+        cases.insert(1, ("translate (Arrow)", lambda: table.translate(
+            arrow_names, args.language), len(names)))
+    except ImportError:
+        print("pyarrow is not installed; skipping Arrow input.")
+    for label, function, rows in cases:
+        result, seconds, peak = measure(function)
+        print(f"{label + ':':<20}{rows / seconds / 1e6:6.2f} M rows/s, "
+              f"{seconds:6.2f} s, peak {peak / 2 ** 20:7.1f} MB")
+        del result
+
+
+if __name__ == "__main__":
+    main()
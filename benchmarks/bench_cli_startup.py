@@ -0,0 +1,80 @@
+#! python3
+# bench_cli_startup.py
+
+"""
+This benchmark measures how long name_translations_cli.py takes to
+    answer a lookup from a cold start, as a new process, and compares it
+    with how long a process takes just to import pandas and BeautifulSoup
+    or the crawler. The cube is built from fixture rows in a temporary
+    directory.
+
+For instance:
+
+    python benchmarks/bench_cli_startup.py --runs 50
+"""
+
+# Import libraries.
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import fixtures
+import frequency_cube
+
+CLI_PATH = os.path.join(fixtures.REPOSITORY, "name_translations_cli.py")
+
+
+def time_command(command, runs):
+    """
+    Return a list of the wall-clock seconds of runs runs of command.
+    """
+    times = []
+    for run in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL,
+                       cwd=fixtures.REPOSITORY)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the start-up time of the lookup command.")
+    parser.add_argument("--runs", type=int, default=20,
+                        help="number of times to run each command")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cube_path = os.path.join(directory, "cube.sqlite")
+        frequency_cube.build_cube(pd.DataFrame({
+            "Name (English)": ["Henry"] * 3 + ["Mary"] * 2,
+            "Language": ["French", "French", "German", "French", "German"],
+            "Name": ["Henri", "Henri", "Heinrich", "Marie", "Maria"],
+            "Familiar-ish Script": ["Yes"] * 5,
+            "Source": ["List of English monarchs"] * 5,
+            "URL": ["a", "b", "a", "c", "c"]}), cube_path)
+
+        commands = [
+            ("Python alone", [sys.executable, "-c", "pass"]),
+            ("lookup", [sys.executable, CLI_PATH, "lookup", "Henry",
+                        "--lang", "French", "--cube", cube_path]),
+            ("import pandas, bs4", [sys.executable, "-c",
+                                    "import pandas, bs4"]),
+            ("import name_translations", [sys.executable, "-c",
+                                          "import name_translations"])
+            ]
+        print(f"{'Command':<26}{'median':>10}{'min':>10}")
+        for label, command in commands:
+            times = time_command(command, args.runs)
+            print(f"{label:<26}{statistics.median(times) * 1000:>8.0f} ms"
+                  f"{min(times) * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#! python3
+# bench_list_phase.py
+
+"""
+This benchmark measures the peak memory of the list phase of
+    name_translations.py (scraping the Wikipedia lists and extracting
+    their links) on fixture pages, and compares it with the peak memory
+    of parsing and extracting the largest single list page on its own.
+    Since each list page's parse tree is freed as soon as its links are
+    extracted, the two peaks should be close.
+
+The peaks are of the process's resident memory (its peak RSS), since the
+    parse trees are allocated by libxml2, which tracemalloc cannot see.
+    Each measurement runs in a new process, and its peak is the rise in
+    the peak RSS over that of the process once everything is imported.
+
+For instance:
+
+    python benchmarks/bench_list_phase.py --rows 400
+"""
+
+# Import libraries.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from bench import get_peak_rss_mb
+from fixtures import FixturePages
+import name_translations
+
+
+def measure(function):
+    """
+    Return the result of calling function, the rise in this process's
+        peak resident memory in megabytes while it ran, and its run time
+        in seconds.
+    """
+    baseline = get_peak_rss_mb()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    return result, get_peak_rss_mb() - baseline, elapsed
+
+
+def measure_phase(phase, rows):
+    """
+    Run the whole list phase, or, if phase is "largest", the largest list
+        page on its own, with every style under which it is listed, and
+        return a dictionary of the number of links extracted, the peak,
+        and the run time.
+    """
+    pages = FixturePages(list_rows=rows)
+    pages.install()
+    list_sources = name_translations.get_list_sources()
+    if phase == "largest":
+        largest_url = max(pages.list_urls, key=pages.rows_for)
+        list_sources = [list_source for list_source in list_sources
+                        if list_source[0] == largest_url]
+    # Count the links rather than keep them, so that the peak is that of
+    #   the parse trees.
+    links, peak, elapsed = measure(lambda: sum(
+        1 for link in name_translations.get_candidate_links(list_sources)))
+    return {"links": links, "peak": peak, "seconds": elapsed,
+            "pages": len(set(pages.list_urls))}
+
+
+def run_phase(phase, rows):
+    """
+    Measure a phase in a new process, so that its peak is its own.
+    """
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--rows", str(rows),
+         "--phase", phase], check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the memory of the list phase.")
+    parser.add_argument("--rows", type=int, default=200,
+                        help="rows in the smallest fixture list page")
+    parser.add_argument("--phase", choices=["lists", "largest"],
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.phase is not None:
+        print(json.dumps(measure_phase(args.phase, args.rows)))
+        return
+    if get_peak_rss_mb() is None:
+        parser.exit(1, "Peak memory cannot be measured on this platform.\n")
+
+    list_phase = run_phase("lists", args.rows)
+    largest = run_phase("largest", args.rows)
+    print(f"List pages:            {list_phase['pages']}")
+    print(f"Links extracted:       {list_phase['links']}")
+    print(f"List phase:            {list_phase['seconds']:.2f} s, "
+          f"peak {list_phase['peak']:.1f} MiB")
+    print(f"Largest page alone:    {largest['seconds']:.2f} s, "
+          f"peak {largest['peak']:.1f} MiB")
+    print(f"Peak ratio:            "
+          f"{list_phase['peak'] / max(largest['peak'], 0.1):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#! python3
+# bench_prefix_search.py
+
+"""
+This benchmark measures the prefix index of name_prefix_index.py on a
+    csv written by name_translations.py: how long it takes to build, how
+    much memory it takes compared with the csv's rows in a dictionary,
+    and how long prefix queries of one to four characters take, with and
+    without a language.
+
+By default, it runs on the results in name_translations.zip, without
+    unzipping them. To measure the results of a new crawl instead:
+
+    python benchmarks/bench_prefix_search.py --input name_translations.csv
+"""
+
+# Import libraries.
+import argparse
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import fixtures  # noqa: F401 (makes the repository importable)
+import compressed_files
+import name_prefix_index
+
+
+def measure_memory(function):
+    """
+    Return the result of function and the bytes it leaves allocated.
+    """
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def load_dictionary(path):
+    """
+    Return a dictionary from each name in a csv to the rows with it, as a
+        process that doesn't use the index would.
+    """
+    rows_by_name = {}
+    with compressed_files.open_text(path, encoding="utf-8-sig") as file:
+        for row in csv.DictReader(file):
+            rows_by_name.setdefault(row["Name"], []).append(row)
+    return rows_by_name
+
+
+def time_queries(index, prefixes, language=None):
+    """
+    Return a list of the seconds each prefix query takes.
+    """
+    times = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.complete(prefix, 10, language)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the prefix index.")
+    parser.add_argument("--input", default="name_translations.zip",
+                        help="csv written by name_translations.py, "
+                             "possibly zipped")
+    parser.add_argument("--queries", type=int, default=20000,
+                        help="number of queries of each kind")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "prefix.npz")
+        start = time.perf_counter()
+        count = name_prefix_index.build_index_from_csv(args.input, path)
+        build_time = time.perf_counter() - start
+        index, index_size = measure_memory(
+            lambda: name_prefix_index.PrefixIndex(path))
+        file_size = os.path.getsize(path)
+    rows_by_name, dictionary_size = measure_memory(
+        lambda: load_dictionary(args.input))
+
+    random.seed(0)
+    names = [name for name in rows_by_name if name]
+    prefixes = [name[:random.randint(1, 4)]
+                for name in random.choices(names, k=args.queries)]
+
+    print(f"Names:              {count}")
+    print(f"Build:              {build_time:.2f} s")
+    print(f"Index file:         {file_size / 2 ** 20:.2f} MB")
+    print(f"Index in memory:    {index_size / 2 ** 20:.2f} MB")
+    print(f"Csv in a dict:      {dictionary_size / 2 ** 20:.2f} MB")
+    for label, language in [("Any language", None), ("French", "French")]:
+        times = time_queries(index, prefixes, language)
+        times.sort()
+        print(f"{label + ':':<20}median "
+              f"{statistics.median(times) * 1e6:.1f} µs, 99th percentile "
+              f"{times[int(len(times) * 0.99)] * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#! python3
+# bench_script_detection.py
+
+"""
+This benchmark measures how fast script_detection.py labels names by
+    script, in batch and one at a time, on a synthetic series of names
+    in several scripts.
+
+For instance:
+
+    python benchmarks/bench_script_detection.py --rows 2000000
+"""
+
+# Import libraries.
+import argparse
+import time
+
+import pandas as pd
+
+import fixtures  # noqa: F401 (makes the repository importable)
+import script_detection
+
+SAMPLE_NAMES = ["Henri Ier", "Генрих I", "Ερρίκος Α΄",
+                "هنري الأول", "ヘンリー1世", "亨利一世",
+                "Հենրի I", "ჰენრი I", "הנרי הראשון",
+                "Jindřich I.", "I. Henrik", "헨리 1세"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark script detection.")
+    parser.add_argument("--rows", type=int, default=1000000,
+                        help="number of names to label")
+    args = parser.parse_args()
+
+    names = pd.Series(SAMPLE_NAMES * (args.rows // len(SAMPLE_NAMES) + 1))
+    names = names[:args.rows]
+
+    start = time.perf_counter()
+    scripts = script_detection.detect_scripts(names)
+    batch_time = time.perf_counter() - start
+
+    sample = names[:min(args.rows, 200000)]
+    start = time.perf_counter()
+    for name in sample:
+        script_detection.detect_script(name)
+    single_time = (time.perf_counter() - start) * len(names) / len(sample)
+
+    print(f"Rows:          {len(names)}")
+    print(f"Batch:         {batch_time:.2f} s "
+          f"({len(names) / batch_time:,.0f} rows/s)")
+    print(f"One at a time: {single_time:.2f} s (estimated) "
+          f"({len(names) / single_time:,.0f} rows/s)")
+    print(scripts.value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# fixtures.py
+
+"""
+This module builds synthetic Wikipedia pages for the benchmarks, so that
+    they can run without a network connection and give the same results
+    on every run. List pages mimic the four extraction styles used by
+    name_translations.py, and person pages carry interlanguage links in
+    the same markup as Wikipedia's.
+"""
+
+# Import libraries.
+import json
+import os
+import random
+import sys
+
+# Make the programs in the repository importable from the benchmarks.
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from languages import language_tags
+import name_translations
+
+GIVEN_NAMES = ["Henry", "Edward", "Mary", "Elizabeth", "John", "Anne",
+               "Charles", "Margaret", "William", "Catherine", "Louis",
+               "Isabella", "Peter", "Joan", "Gregory", "Matilda"]
+
+# Use the languages whose codes languages.py knows.
+LANGUAGE_CODES = sorted(language_tags)
+
+# Name a few namespaces of the wikis of other languages, by ID, with their
+#   aliases, as in the wikis' site information.
+NAMESPACE_NAMES = {
+    "fr": {6: ["Fichier"], 12: ["Aide"], 14: ["Catégorie"],
+           4: ["Wikipédia", "WP"]},
+    "de": {6: ["Datei", "Bild"], 12: ["Hilfe"], 14: ["Kategorie"],
+           4: ["Wikipedia", "WP"]},
+    "it": {6: ["File", "Immagine"], 12: ["Aiuto"], 14: ["Categoria"],
+           4: ["Wikipedia", "WP"]}
+    }
+CANONICAL_NAMESPACES = {6: "File", 12: "Help", 14: "Category",
+                        4: "Project"}
+
+
+def make_list_page(url, rows):
+    """
+    Return the html of a list page with rows entries, laid out so that
+        every extraction style finds links in it.
+    """
+    rng = random.Random(url)
+    table_rows = []
+    list_items = []
+    for row in range(rows):
+        name = rng.choice(GIVEN_NAMES)
+        href = f"/wiki/{name}_{rng.randrange(rows * 4)}"
+        table_rows.append(
+            f'<tr><td><a href="{href}" title="{name} {row} (king)">'
+            f'{name}</a></td><td>{row}</td>'
+            f'<td><a href="/wiki/Category:Kings" title="Category:Kings">'
+            f'c</a><p>Reigned for {row} years. ' + "Lorem ipsum " * 20 +
+            '</p></td></tr>')
+        list_items.append(
+            f'<li><a href="{href}" title="{name} {row}">{name}</a>, '
+            f'<a href="/wiki/Help:IPA" title="Help:IPA">help</a></li>')
+    return ('<html><body><table class="wikitable">' +
+            "".join(table_rows) + "</table><ul>" + "".join(list_items) +
+            "</ul></body></html>")
+
+
+def make_person_page(url, languages):
+    """
+    Return the html of a person page with interlanguage links in
+        languages languages and a Wikidata item link. Pages on wikis other
+        than the English language one usually link to an English language
+        page, for the same person as the English language lists' page of
+        the same name.
+    """
+    rng = random.Random(url)
+    slug = url.rsplit("/", 1)[-1]
+    name = slug.replace("_", " ")
+    codes = rng.sample(LANGUAGE_CODES, languages)
+    code = name_translations.get_wiki_language(url)
+    if code != "en":
+        codes = [other_code for other_code in codes
+                 if other_code not in (code, "en")]
+        # Whether a person has an English language page depends on the
+        #   person, not on the wiki.
+        if random.Random(slug).random() < 0.75:
+            codes.insert(0, "en")
+    links = []
+    for code in codes:
+        links.append(
+            f'<li><a class="interlanguage-link-target" lang="{code}" '
+            f'hreflang="{code}" '
+            f'href="https://{code}.wikipedia.org/wiki/{slug}"'
+            f' title="{name}, roi – {code}">{code}</a></li>')
+    qid = int.from_bytes(slug.encode("utf-8"), "big") % 10 ** 6
+    return ("<html><body><p>" + "Lorem ipsum dolor sit amet. " * 200 +
+            '</p><ul class="interlanguage">' + "".join(links) +
+            '</ul><ul><li id="t-wikibase"><a href="https://www.wikidata.org'
+            f'/wiki/Special:EntityPage/Q{qid}">Wikidata item</a></li></ul>'
+            "</body></html>")
+
+
+def make_siteinfo(url):
+    """
+    Return the json of the site information of the wiki of url, with the
+        names and aliases of its namespaces.
+    """
+    code = url.split("//", 1)[-1].split(".", 1)[0]
+    namespaces = {"0": {"id": 0, "name": ""}}
+    aliases = []
+    for namespace, names in NAMESPACE_NAMES.get(code, {}).items():
+        namespaces[str(namespace)] = {
+            "id": namespace, "name": names[0],
+            "canonical": CANONICAL_NAMESPACES[namespace]}
+        aliases += [{"id": namespace, "alias": alias}
+                    for alias in names[1:]]
+    return json.dumps({"query": {"namespaces": namespaces,
+                                 "namespacealiases": aliases}})
+
+
+class FixturePages:
+    """
+    Serve fixture pages in place of name_translations.get_page, and
+        record them in an archive if one is given, as it does. List pages
+        have a number of rows that grows with their position in the list
+        of sources, so that one page is clearly the largest. Requests for
+        the URLs in failing raise a ConnectionError.
+
+    translations is a dictionary from the URLs of lists on other wikis to
+        the URLs of English language lists of the same people, whose pages
+        they serve, with list_rows rows. The html in the pages dictionary
+        is served for its URLs in place of a fixture page.
+    """
+
+    def __init__(self, list_rows=200, languages=40, failing=(),
+                 translations=None):
+        self.list_rows = list_rows
+        self.languages = languages
+        self.failing = set(failing)
+        self.translations = translations or {}
+        self.pages = {}
+        self.list_urls = [url for url, name, style in
+                          name_translations.get_list_sources()]
+
+    def rows_for(self, url):
+        return self.list_rows * (1 + self.list_urls.index(url) % 5)
+
+    def get_page(self, url, cache_dir=None, archive=None, metadata=None):
+        if url in self.failing:
+            raise ConnectionError(f"Could not reach {url}")
+        if url in self.pages:
+            data = self.pages[url]
+        elif "/w/api.php?" in url:
+            data = make_siteinfo(url)
+        elif url in self.translations:
+            data = make_list_page(self.translations[url], self.list_rows)
+        elif url in self.list_urls:
+            data = make_list_page(url, self.rows_for(url))
+        else:
+            data = make_person_page(url, self.languages)
+        if archive is not None:
+            archive.record(url, data, {**(metadata or {}), "status": 200,
+                                       "elapsed": 0})
+        return data
+
+    def install(self):
+        """
+        Replace name_translations.get_page with this object's get_page.
+        """
+        name_translations.get_page = self.get_page
@@ -0,0 +1,312 @@
+#! python3
+# bulk_translation.py
+
+"""
+This program translates whole columns of given names at once, such as
+    the first names in millions of customer records, using a table of the
+    results of name_translations.py.
+
+The table holds, for each English given name and language, the names
+    that people with that English name have in that language, most
+    common first, and is saved to an .npz file:
+
+        english     The English names' search keys (as in
+                    name_prefix_index.py: without accents, case-folded),
+                    in sorted order.
+        names       The translated names.
+        languages   The language names.
+        candidates  A row for each (English name, language, name), with
+                    its number of people, sorted by language, English
+                    name, and then number of people, most first. Each
+                    language's rows are one range, given by
+                    language_offsets.
+
+A column is translated as a hash join on the table: its distinct values
+    are found with pandas.factorize, their keys looked up in a hash index
+    of the English keys, and the translations of every row then taken
+    from numpy arrays with one index operation. Columns are translated
+    BATCH_ROWS rows at a time, so that memory stays bounded however long
+    they are. The build command reads the results in
+    name_translations.zip by default, without unzipping them, or the csv
+    of a new crawl with --input. For instance:
+
+    python bulk_translation.py build --input name_translations.csv \
+        --output name_translations_table.npz
+    python bulk_translation.py translate --input customers.csv \
+        --column first_name --language French --output customers_fr.csv
+
+or, from Python:
+
+    table = bulk_translation.TranslationTable(
+        "name_translations_table.npz")
+    table.translate(df["first_name"], "French")
+    table.translate_candidates(df["first_name"], "French", k=3)
+
+Columns can be pandas Series or pyarrow Arrays (or ChunkedArrays), and
+    are returned as the same kind. Only Arrow input needs pyarrow.
+"""
+
+# Import libraries.
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from name_prefix_index import get_key
+
+DEFAULT_PATH = "name_translations_table.npz"
+
+# Set the number of rows translated at a time.
+BATCH_ROWS = 1_000_000
+
+
+def get_candidates(df):
+    """
+    Return a dataframe with a row for each (English key, language, name)
+        in a dataframe of results, with its number of people, sorted for
+        the table.
+    """
+    df = df[(df["Name (English)"].notna()) & (df["Name (English)"] != "")
+            & (df["Name"].notna()) & (df["Name"] != "")]
+    names = pd.DataFrame({"english": df["Name (English)"].map(get_key),
+                          "language": df["Language"], "name": df["Name"],
+                          "url": df["URL"]})
+    candidates = names.groupby(["english", "language", "name"])[
+        "url"].nunique().rename("count").reset_index()
+    return candidates.sort_values(
+        ["language", "english", "count", "name"],
+        ascending=[True, True, False, True], kind="stable",
+        ignore_index=True)
+
+
+def build_table(df, path=DEFAULT_PATH):
+    """
+    Build the translation table from a dataframe of results from
+        name_translations.py and save it to path. Return the number of
+        (English name, language, name) rows.
+    """
+    candidates = get_candidates(df)
+    english, english_ids = np.unique(candidates["english"].to_numpy(str),
+                                     return_inverse=True)
+    names, name_ids = np.unique(candidates["name"].to_numpy(str),
+                                return_inverse=True)
+    languages, language_ids = np.unique(
+        candidates["language"].to_numpy(str), return_inverse=True)
+    language_offsets = np.zeros(len(languages) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(language_ids, minlength=len(languages)),
+              out=language_offsets[1:])
+    np.savez_compressed(
+        path, english=english, names=names, languages=languages,
+        language_offsets=language_offsets,
+        candidate_english=english_ids.astype(np.int32),
+        candidate_names=name_ids.astype(np.int32),
+        candidate_counts=candidates["count"].to_numpy(np.int32))
+    return len(candidates)
+
+
+def build_table_from_csv(input_path, output_path=DEFAULT_PATH):
+    """
+    Build the translation table from a csv written by
+        name_translations.py.
+    """
+    df = pd.read_csv(input_path,
+                     usecols=["URL", "Language", "Name", "Name (English)"],
+                     dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    return build_table(df, output_path)
+
+
+def to_series(names):
+    """
+    Return a column of names as a pandas Series, and whether it was a
+        pyarrow Array or ChunkedArray.
+    """
+    if isinstance(names, pd.Series):
+        return names, False
+    if type(names).__module__.split(".")[0] == "pyarrow":
+        return names.to_pandas(), True
+    return pd.Series(names), False
+
+
+class TranslationTable:
+    """
+    Translate columns of English given names with a table saved by
+        build_table.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        with np.load(path, allow_pickle=False) as arrays:
+            self.english = pd.Index(arrays["english"].astype(object))
+            # Keep the names as Python strings, so that taking them for
+            #   millions of rows only copies pointers.
+            self.names = arrays["names"].astype(object)
+            self.languages = arrays["languages"].tolist()
+            self.language_offsets = arrays["language_offsets"]
+            self.candidate_english = arrays["candidate_english"]
+            self.candidate_names = arrays["candidate_names"]
+            self.candidate_counts = arrays["candidate_counts"]
+        self.language_ranges = {}
+
+    def get_language_range(self, language):
+        """
+        Return two arrays with the start and end of each English name's
+            rows in language, indexed by English name ID plus one, so that
+            the ID -1 (not found) has an empty range.
+        """
+        if language not in self.language_ranges:
+            if language not in self.languages:
+                raise ValueError(f"No translations into {language}")
+            position = self.languages.index(language)
+            low, high = self.language_offsets[position:position + 2]
+            ids = np.arange(-1, len(self.english))
+            english = self.candidate_english[low:high]
+            self.language_ranges[language] = (
+                low + np.searchsorted(english, ids, "left"),
+                low + np.searchsorted(english, ids, "right"))
+        return self.language_ranges[language]
+
+    def get_english_ids(self, names):
+        """
+        Return an array of the English name ID of each row of a Series,
+            or -1 where the name is not in the table. Each distinct name's
+            key is only computed once.
+        """
+        codes, uniques = pd.factorize(names)
+        keys = [get_key(name.strip()) if isinstance(name, str) else ""
+                for name in uniques]
+        unique_ids = self.english.get_indexer(keys)
+        # Map missing values (code -1) to -1 too, through the last item.
+        return np.append(unique_ids, -1)[codes]
+
+    def get_batches(self, names):
+        for start in range(0, len(names), BATCH_ROWS):
+            yield start, names.iloc[start:start + BATCH_ROWS]
+
+    def translate(self, names, language):
+        """
+        Return the most common translation into language of each name in
+            a Series or pyarrow array of English given names (ignoring
+            case, accents, and surrounding spaces), as the same kind of
+            column, with missing values where there is none.
+        """
+        series, is_arrow = to_series(names)
+        starts, ends = self.get_language_range(language)
+        result = np.full(len(series), None, dtype=object)
+        for start, batch in self.get_batches(series):
+            ids = self.get_english_ids(batch) + 1
+            rows = starts[ids]
+            found = np.flatnonzero(rows < ends[ids])
+            result[start + found] = self.names[
+                self.candidate_names[rows[found]]]
+        if is_arrow:
+            import pyarrow as pa
+
+            return pa.array(result, type=pa.string())
+        # Keep the strings as objects, since inferring a string dtype
+        #   would copy the column.
+        return pd.Series(result, index=series.index, name=language,
+                         dtype=object, copy=False)
+
+    def translate_candidates(self, names, language, k=3):
+        """
+        Return up to k translations into language of each name in a
+            Series or pyarrow array of English given names, most common
+            first, as a dataframe (or pyarrow Table) with the columns Row
+            (the name's position in names), Rank (from 1), Translation,
+            and Count (the number of people with the translation).
+        """
+        series, is_arrow = to_series(names)
+        starts, ends = self.get_language_range(language)
+        # Look the names up first, so that the output can be allocated
+        #   once rather than concatenated from batches.
+        ids = np.empty(len(series), dtype=np.int32)
+        for start, batch in self.get_batches(series):
+            ids[start:start + len(batch)] = self.get_english_ids(batch) + 1
+        counts = np.minimum(ends - starts, k).astype(np.int32)
+        stops = np.cumsum(counts[ids], dtype=np.int64)
+        total = int(stops[-1]) if len(stops) else 0
+        rows = np.empty(total, dtype=np.int64)
+        ranks = np.empty(total, dtype=np.int32)
+        translations = np.empty(total, dtype=object)
+        translation_counts = np.empty(total, dtype=np.int32)
+        for start in range(0, len(ids), BATCH_ROWS):
+            batch_ids = ids[start:start + BATCH_ROWS]
+            batch_counts = counts[batch_ids]
+            low = int(stops[start] - batch_counts[0])
+            high = int(stops[start + len(batch_ids) - 1])
+            # Expand each name into its candidates: the rank of each
+            #   output row counts up from 0 within the name.
+            batch_rows = np.repeat(np.arange(len(batch_ids)), batch_counts)
+            batch_ranks = (np.arange(high - low) - np.repeat(
+                stops[start:start + len(batch_ids)] - low - batch_counts,
+                batch_counts))
+            candidates = starts[batch_ids][batch_rows] + batch_ranks
+            rows[low:high] = batch_rows + start
+            ranks[low:high] = batch_ranks + 1
+            translations[low:high] = self.names[
+                self.candidate_names[candidates]]
+            translation_counts[low:high] = self.candidate_counts[candidates]
+        df = pd.DataFrame({
+            "Row": rows, "Rank": ranks,
+            "Translation": pd.Series(translations, dtype=object,
+                                     copy=False),
+            "Count": translation_counts
+            }, copy=False)
+        if is_arrow:
+            import pyarrow as pa
+
+            return pa.Table.from_pandas(df, preserve_index=False)
+        return df
+
+    def get_size(self):
+        """
+        Return the number of bytes the table's arrays take in memory, not
+            counting the Python strings of the names.
+        """
+        return (self.english.nbytes + self.names.nbytes +
+                self.language_offsets.nbytes +
+                self.candidate_english.nbytes +
+                self.candidate_names.nbytes + self.candidate_counts.nbytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a translation table, or translate a column of "
+                    "a csv with it.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="build and save the translation table")
+    build_parser.add_argument("--input", default="name_translations.zip",
+                              help="csv written by name_translations.py, "
+                                   "possibly zipped")
+    build_parser.add_argument("--output", default=DEFAULT_PATH,
+                              help="path of the table to write")
+
+    translate_parser = subparsers.add_parser(
+        "translate", help="add a column of translations to a csv")
+    translate_parser.add_argument("--table", default=DEFAULT_PATH,
+                                  help="table written by the build command")
+    translate_parser.add_argument("--input", required=True,
+                                  help="csv with a column of English given "
+                                       "names")
+    translate_parser.add_argument("--column", required=True,
+                                  help="name of the column to translate")
+    translate_parser.add_argument("--language", required=True,
+                                  help="language, such as French")
+    translate_parser.add_argument("--output", required=True,
+                                  help="path of the csv to write")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        count = build_table_from_csv(args.input, args.output)
+        print(f"Saved {count} translations to {args.output}.")
+    else:
+        table = TranslationTable(args.table)
+        df = pd.read_csv(args.input, dtype=str, keep_default_na=False)
+        df[f"{args.column} ({args.language})"] = table.translate(
+            df[args.column], args.language)
+        df.to_csv(args.output, index=False, encoding="utf-8-sig")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# compressed_files.py
+
+"""
+This module opens text files that are compressed as they are written and
+    decompressed as they are read, so that a compressed csv can be
+    produced or consumed a row at a time, without an uncompressed copy on
+    disk.
+
+Two kinds of compression are supported:
+
+        gzip    With the gzip module. Levels go from 1 to 9 (the default).
+        zstd    Zstandard, which is faster than gzip at a similar size.
+                Levels go from 1 to 22 (the default is 3). This needs the
+                zstandard package, which the rest of the program does not.
+
+For instance:
+
+    with compressed_files.open_text("names.csv.zst", "w", "zstd", 10) as f:
+        f.write("...")
+    for row in compressed_files.read_rows("names.csv.zst"):
+        ...
+
+pandas infers the same compression from the same extensions, so
+    pd.read_csv("names.csv.zst") also works.
+
+A zip archive that holds a single csv, such as name_translations.zip in
+    the repository, can be read as that csv too (but not written), so
+    programs that take a csv can run on the shipped results without
+    unzipping them first.
+"""
+
+# Import libraries.
+import csv
+import gzip
+import io
+import zipfile
+
+# Map each kind of compression to the extension of its files.
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def get_compression(path):
+    """
+    Return the kind of compression of a file from its extension, or None
+        if it is not compressed.
+    """
+    for compression, extension in EXTENSIONS.items():
+        if path.endswith(extension):
+            return compression
+    return None
+
+
+def add_extension(path, compression):
+    """
+    Return path with the extension of compression added, if any.
+    """
+    if compression is None:
+        return path
+    return path + EXTENSIONS[compression]
+
+
+def open_zipped_text(path, mode="r", encoding="utf-8"):
+    """
+    Open the only file in the zip archive at path for reading.
+    """
+    if mode != "r":
+        raise ValueError(f"Zip archives can only be read: {path}")
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        if len(names) != 1:
+            raise ValueError(f"{path} does not hold a single file")
+        # The opened file keeps the archive's file open after it closes.
+        file = archive.open(names[0])
+    return io.TextIOWrapper(file, encoding=encoding, newline="")
+
+
+def open_text(path, mode="r", compression="infer", level=None,
+              encoding="utf-8"):
+    """
+    Open a text file for reading ("r") or writing ("w"), compressing or
+        decompressing it as a stream. With compression="infer", the kind
+        of compression is taken from the file's extension, and a zip
+        archive is read as the file it holds.
+    """
+    if compression == "infer":
+        if path.endswith(".zip"):
+            return open_zipped_text(path, mode, encoding)
+        compression = get_compression(path)
+    if compression is None:
+        return open(path, mode, encoding=encoding, newline="")
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding=encoding, newline="",
+                         compresslevel=9 if level is None else level)
+    if compression == "zstd":
+        import zstandard
+
+        file = open(path, mode + "b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(
+                level=3 if level is None else level).stream_writer(file)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(file)
+        return io.TextIOWrapper(stream, encoding=encoding, newline="")
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def read_rows(path, compression="infer", encoding="utf-8-sig"):
+    """
+    Yield each row of a csv, possibly compressed, as a dictionary of
+        strings.
+    """
+    with open_text(path, "r", compression, encoding=encoding) as file:
+        yield from csv.DictReader(file)
@@ -0,0 +1,272 @@
+# crawl_budget.py
+
+"""
+This module runs a crawl within a budget of person page requests or of
+    seconds, scraping the pages most likely to be useful first, so that a
+    usable table can be had in minutes rather than the full table in
+    twenty-five.
+
+The frontier is ordered by the expected value of each page, which is the
+    sum of:
+
+        - the number of Wikipedia languages that have a page for the
+          person, from the number of their Wikidata item's sitelinks.
+          These are looked up in bulk, fifty pages a request, before any
+          person page is scraped, and cached in a json file. Pages on
+          other wikis, and pages that cannot be looked up, count none.
+        - SOURCE_WEIGHT for each list other than the first on which the
+          person appears.
+        - NAME_WEIGHT if the person's English given name is not yet
+          covered by a page earlier in the order.
+
+Since a page's value can only fall as given names are covered, the
+    order is built greedily from a heap, rescoring a page only when it
+    reaches the top.
+
+The crawl stops before the first request that would go over the budget
+    and saves the pages scraped so far. name_translations.py uses this
+    module when run with --budget-requests or --budget-seconds. For
+    instance:
+
+    python name_translations.py --budget-seconds 120
+"""
+
+# Import libraries.
+import heapq
+import os
+import time
+
+import requests
+
+import derive_names
+import frontier_pruning
+
+# Set how many languages a page is worth for each extra list on which its
+#   person appears, and for a new English given name.
+SOURCE_WEIGHT = 10
+NAME_WEIGHT = 25
+
+# Create a set of the Wikimedia sites whose sitelinks are not language
+#   editions of Wikipedia.
+NON_LANGUAGE_SITES = {
+    "commonswiki", "foundationwiki", "incubatorwiki", "mediawikiwiki",
+    "metawiki", "outreachwiki", "sourceswiki", "specieswiki",
+    "wikidatawiki", "wikifunctionswiki", "wikimaniawiki"
+    }
+
+
+class CrawlBudget:
+    """
+    Keep track of the person page requests made and the seconds passed
+        since the budget was created, out of a budget of either or both.
+    """
+
+    def __init__(self, requests=None, seconds=None):
+        self.requests = requests
+        self.seconds = seconds
+        self.start = time.monotonic()
+        self.used = 0
+
+    def get_elapsed(self):
+        return time.monotonic() - self.start
+
+    def get_stop_reason(self):
+        """
+        Return why no more requests may be made, or None if they may.
+        """
+        if self.requests is not None and self.used >= self.requests:
+            return "request budget"
+        if self.seconds is not None and self.get_elapsed() >= self.seconds:
+            return "time budget"
+        return None
+
+    def spend(self):
+        self.used += 1
+
+
+def get_language_cache_path(cache_dir):
+    """
+    Return the path at which language counts are cached in cache_dir.
+    """
+    if cache_dir is None:
+        return None
+    return os.path.join(cache_dir, "language_counts.json")
+
+
+def count_languages(sitelinks):
+    """
+    Return the number of language editions of Wikipedia in a Wikidata
+        item's sitelinks.
+    """
+    return sum(site.endswith("wiki") and site not in NON_LANGUAGE_SITES
+               for site in sitelinks)
+
+
+def look_up_language_counts(titles, cache_path=None):
+    """
+    Return a dictionary from each English Wikipedia page title in titles
+        to the number of Wikipedia languages with a page for its Wikidata
+        item, or None if it could not be looked up. Only titles that are
+        not already cached in cache_path are looked up. If Wikidata
+        cannot be reached, the remaining titles are not looked up.
+    """
+    language_counts = frontier_pruning.load_cache(cache_path)
+    missing = [title for title in dict.fromkeys(titles)
+               if title not in language_counts]
+    for start in range(0, len(missing), frontier_pruning.BATCH_SIZE):
+        batch = missing[start:start + frontier_pruning.BATCH_SIZE]
+        try:
+            res = requests.get(frontier_pruning.WIKIDATA_API, params={
+                "action": "wbgetentities", "sites": "enwiki",
+                "titles": "|".join(batch), "props": "sitelinks",
+                "format": "json"},
+                headers={"User-Agent": frontier_pruning.USER_AGENT})
+            entities = res.json().get("entities", {})
+        except (requests.RequestException, ValueError):
+            break
+        for title in batch:
+            language_counts[title] = None
+        for entity in entities.values():
+            sitelinks = entity.get("sitelinks", {})
+            if "enwiki" in sitelinks:
+                language_counts[sitelinks["enwiki"]["title"]] = (
+                    count_languages(sitelinks))
+        frontier_pruning.save_cache(language_counts, cache_path)
+    return {title: language_counts.get(title) for title in titles}
+
+
+def count_sources(candidate_links):
+    """
+    Return a dictionary from each href in a list of (list name, href,
+        title) tuples to the number of lists on which it appears.
+    """
+    sources = {}
+    for key, href, title in candidate_links:
+        sources.setdefault(href, set()).add(key)
+    return {href: len(keys) for href, keys in sources.items()}
+
+
+def get_page_values(english_dicts, candidate_links=None, cache_dir=None):
+    """
+    Return a list of (language count, source count, English given name)
+        tuples, one for each dictionary in english_dicts. The language
+        count is 0 if it is not known, and the given name None.
+    """
+    english = [english_dict["Language Code"] == "en"
+               for english_dict in english_dicts]
+    hrefs = [english_dict["URL"][len("https://en.wikipedia.org"):]
+             if is_english else english_dict["URL"]
+             for english_dict, is_english in zip(english_dicts, english)]
+    titles = [frontier_pruning.get_page_title(href) for href in hrefs]
+    language_counts = look_up_language_counts(
+        [title for title, is_english in zip(titles, english)
+         if is_english],
+        get_language_cache_path(cache_dir))
+    source_counts = count_sources(candidate_links or [])
+    english_names = {row["URL"]: row["Name (English)"]
+                     for row in derive_names.derive_rows(
+                         [english_dict for english_dict, is_english
+                          in zip(english_dicts, english) if is_english])}
+    values = []
+    for english_dict, is_english, href, title in zip(
+            english_dicts, english, hrefs, titles):
+        values.append((
+            (language_counts.get(title) or 0) if is_english else 0,
+            source_counts.get(href, 1),
+            english_names.get(english_dict["URL"]) or None))
+    return values
+
+
+def order_frontier(page_values):
+    """
+    Yield the indexes of the pages with the (language count, source
+        count, English given name) tuples in page_values, from the
+        highest expected value to the lowest. Pages of equal value keep
+        their order.
+    """
+    covered_names = set()
+
+    def get_value(index):
+        languages, sources, name = page_values[index]
+        value = languages + SOURCE_WEIGHT * (sources - 1)
+        if name is not None and name not in covered_names:
+            value += NAME_WEIGHT
+        return value
+
+    heap = [(-get_value(index), index) for index in range(len(page_values))]
+    heapq.heapify(heap)
+    while heap:
+        negative_value, index = heapq.heappop(heap)
+        value = get_value(index)
+        if value < -negative_value:
+            heapq.heappush(heap, (-value, index))
+            continue
+        covered_names.add(page_values[index][2])
+        yield index
+
+
+def crawl(english_dicts, page_values, budget, get_translation_dicts):
+    """
+    Scrape the pages of english_dicts in order of expected value until
+        the frontier or the budget runs out, calling
+        get_translation_dicts on each. Return a list of the dictionaries
+        of the pages scraped, a list of each page's translation
+        dictionaries, and a report of the coverage achieved.
+    """
+    scraped = []
+    page_dicts = []
+    stop_reason = None
+    for index in order_frontier(page_values):
+        stop_reason = budget.get_stop_reason()
+        if stop_reason is not None:
+            break
+        page_dicts.append(get_translation_dicts(english_dicts[index]))
+        budget.spend()
+        scraped.append(index)
+    return ([english_dicts[index] for index in scraped], page_dicts,
+            get_coverage([page_values[index] for index in scraped],
+                         page_values, page_dicts, budget,
+                         stop_reason or "end of the frontier"))
+
+
+def get_coverage(scraped_values, page_values, page_dicts, budget,
+                 stop_reason):
+    """
+    Return a dictionary describing how much of the frontier a budgeted
+        crawl covered.
+    """
+    names = {name for languages, sources, name in page_values
+             if name is not None}
+    scraped_names = {name for languages, sources, name in scraped_values
+                     if name is not None}
+    return {
+        "stop_reason": stop_reason,
+        "seconds": round(budget.get_elapsed(), 1),
+        "pages": len(scraped_values),
+        "frontier_pages": len(page_values),
+        "given_names": len(scraped_names),
+        "frontier_given_names": len(names),
+        "expected_languages": sum(value[0] for value in scraped_values),
+        "frontier_expected_languages": sum(value[0]
+                                           for value in page_values),
+        "rows": sum(map(len, page_dicts))
+        }
+
+
+def print_coverage(coverage):
+    """
+    Print the coverage of a budgeted crawl in a readable form.
+    """
+    def share(part, whole):
+        return f"{part} of {whole} ({part / max(whole, 1):.1%})"
+
+    print(f"Stopped at the {coverage['stop_reason']} after "
+          f"{coverage['seconds']} seconds.")
+    print("Pages scraped: " + share(coverage["pages"],
+                                    coverage["frontier_pages"]))
+    print("English given names covered: " +
+          share(coverage["given_names"], coverage["frontier_given_names"]))
+    print("Expected translations covered: " +
+          share(coverage["expected_languages"],
+                coverage["frontier_expected_languages"]))
+    print(f"Translations saved: {coverage['rows']}")
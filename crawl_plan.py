@@ -0,0 +1,212 @@
+#! python3
+# crawl_plan.py
+
+"""
+This program plans a run of name_translations.py without scraping any
+    person pages. It scrapes each Wikipedia list once (even when a list,
+    such as "List of Roman women", is selected with more than one
+    extraction style), resolves the full set of person pages to be
+    scraped, and reports:
+
+        - the number of person pages each list adds to the crawl,
+        - how many person pages the lists have in common,
+        - how many of the pages are already in the page cache, and
+        - with --prune, how many requests pruning saves for each list
+          (see frontier_pruning.py).
+
+The plan is saved as json, and name_translations.py or sharded_crawl.py
+    can run it directly with --plan, without scraping the lists again.
+
+For instance:
+
+    python crawl_plan.py --output plan.json --cache-dir cache
+    python name_translations.py --plan plan.json --cache-dir cache
+"""
+
+# Import libraries.
+import argparse
+import datetime
+import itertools
+import json
+import os
+
+import frontier_pruning
+import name_translations
+
+
+def is_cached(url, cache_dir):
+    """
+    Return whether the page at url is in cache_dir.
+    """
+    if cache_dir is None:
+        return False
+    return os.path.exists(name_translations.get_cache_path(url, cache_dir))
+
+
+def make_plan(cache_dir=None, prune=False, check_people=False):
+    """
+    Scrape the Wikipedia lists and return a plan: a dictionary with the
+        lists to scrape, the frontier of person pages, and a report of
+        the expected cost of the run. If prune is True, links that do not
+        lead to articles (and, if check_people is True, links to articles
+        that are not about people) are dropped from the frontier.
+    """
+    list_sources = name_translations.get_list_sources()
+
+    # Find the distinct list pages, and the lists that are selected with
+    #   more than one extraction style.
+    list_pages = list(dict.fromkeys(url for url, name, style in
+                                    list_sources))
+    styles_by_url = {}
+    for url, name, style in list_sources:
+        styles_by_url.setdefault(url, []).append(style)
+    repeated_lists = {url: styles for url, styles in styles_by_url.items()
+                      if len(styles) > 1}
+
+    # Check the cache before scraping the lists, since scraping them will
+    #   add them to the cache.
+    cached_list_pages = sum(is_cached(url, cache_dir)
+                            for url in list_pages)
+
+    # Collect the links of interest from each list. Keep them in a list
+    #   so that they can be used both to build the frontier and to
+    #   measure the overlap between lists.
+    candidate_links = list(name_translations.get_candidate_links(
+        list_sources, cache_dir))
+    frontier = name_translations.get_english_dicts(candidate_links)
+
+    # Prune the links, and count the requests that pruning saves for
+    #   each list.
+    pruning = None
+    if prune:
+        candidate_links, reasons = frontier_pruning.prune_links(
+            candidate_links, check_people,
+            name_translations.get_entity_cache_path(cache_dir),
+            name_translations.get_wiki_namespaces(candidate_links,
+                                                  cache_dir))
+        pruned_frontier = name_translations.get_english_dicts(
+            candidate_links)
+        pruning = {
+            "dropped_links": reasons,
+            "saved_requests": frontier_pruning.count_saved_fetches(
+                frontier, pruned_frontier)
+            }
+        frontier = pruned_frontier
+
+    # Count, for each list, the links it contains and the person pages it
+    #   adds to the frontier. A list adds only the pages that no earlier
+    #   list has already added.
+    sources = {}
+    for url, name, style in list_sources:
+        sources.setdefault(name, {"url": url, "styles": [], "links": 0,
+                                  "pages": set(), "requests": 0})
+        sources[name]["styles"].append(style)
+    for key, href, title in candidate_links:
+        if title is not None:
+            sources[key]["links"] += 1
+            sources[key]["pages"].add(href)
+    for english_dict in frontier:
+        sources[english_dict["Source"]]["requests"] += 1
+
+    # Count the person pages that each pair of lists have in common.
+    overlaps = []
+    for name_a, name_b in itertools.combinations(sources, 2):
+        shared = len(sources[name_a]["pages"] & sources[name_b]["pages"])
+        if shared > 0:
+            overlaps.append({"sources": [name_a, name_b],
+                             "shared_pages": shared})
+    overlaps.sort(key=lambda overlap: -overlap["shared_pages"])
+
+    cached_person_pages = sum(is_cached(english_dict["URL"], cache_dir)
+                              for english_dict in frontier)
+
+    report = {
+        "list_sources": len(list_sources),
+        "list_pages": len(list_pages),
+        "repeated_lists": repeated_lists,
+        "person_pages": len(frontier),
+        "sources": [
+            {"name": name, "url": source["url"],
+             "styles": source["styles"], "links": source["links"],
+             "distinct_pages": len(source["pages"]),
+             "requests": source["requests"]}
+            for name, source in sources.items()],
+        "overlaps": overlaps,
+        "pruning": pruning,
+        "cache": {
+            "list_pages_cached": cached_list_pages,
+            "person_pages_cached": cached_person_pages,
+            "hit_rate": ((cached_list_pages + cached_person_pages) /
+                         max(len(list_pages) + len(frontier), 1))
+            },
+        "expected_requests": (len(list_pages) - cached_list_pages +
+                              len(frontier) - cached_person_pages)
+        }
+
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "list_sources": [list(list_source) for list_source in
+                         list_sources],
+        "frontier": frontier,
+        "report": report
+        }
+
+
+def print_report(report):
+    """
+    Print a plan's report in a readable form.
+    """
+    print(f"{report['list_sources']} lists on "
+          f"{report['list_pages']} distinct pages")
+    for url, styles in report["repeated_lists"].items():
+        print(f"    {url} is selected with {len(styles)} styles: "
+              + ", ".join(styles))
+    print(f"{report['person_pages']} person pages to scrape")
+    print()
+    print(f"{'Source':<52}{'Links':>8}{'Pages':>8}{'Requests':>10}")
+    for source in report["sources"]:
+        print(f"{source['name']:<52}{source['links']:>8}"
+              f"{source['distinct_pages']:>8}{source['requests']:>10}")
+    print()
+    print("Person pages shared between lists:")
+    if not report["overlaps"]:
+        print("    none")
+    for overlap in report["overlaps"]:
+        print(f"    {overlap['shared_pages']:>6}  "
+              + " / ".join(overlap["sources"]))
+    print()
+    if report["pruning"] is not None:
+        frontier_pruning.print_pruning(report["pruning"]["dropped_links"],
+                                       report["pruning"]["saved_requests"])
+        print()
+    cache = report["cache"]
+    print(f"Cached: {cache['list_pages_cached']} list pages, "
+          f"{cache['person_pages_cached']} person pages "
+          f"({cache['hit_rate']:.1%} hit rate)")
+    print(f"Expected requests: {report['expected_requests']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Plan a name translations crawl without scraping "
+                    "person pages.")
+    parser.add_argument("--output", default="plan.json",
+                        help="path of the plan to write")
+    parser.add_argument("--cache-dir",
+                        help="directory in which scraped pages are cached")
+    parser.add_argument("--prune", action="store_true",
+                        help="skip links that do not lead to articles")
+    parser.add_argument("--check-people", action="store_true",
+                        help="with --prune, also skip articles whose "
+                             "Wikidata items are not people")
+    args = parser.parse_args()
+
+    plan = make_plan(args.cache_dir, args.prune, args.check_people)
+    with open(args.output, "w", encoding="utf-8") as plan_file:
+        json.dump(plan, plan_file, ensure_ascii=False, indent=1)
+    print_report(plan["report"])
+    print(f"Saved the plan to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
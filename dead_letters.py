@@ -0,0 +1,100 @@
+# dead_letters.py
+
+"""
+This module records the pages that a crawl failed to scrape, so that
+    only those pages have to be scraped again.
+
+Each failure is a line of JSON in a dead-letter file (by default,
+    name_translations_failed.jsonl in the output directory) with these
+    keys:
+
+        url         The URL of the page.
+        stage       "list" for a Wikipedia list, "fetch" for a person page
+                    that could not be downloaded, or "parse" for one that
+                    could not be parsed.
+        error       The type of the exception, such as "ConnectionError".
+        message     The exception's message.
+        entry       The list source or the English language dictionary
+                    of the page, from which it can be scraped again.
+        time        When the failure happened.
+
+name_translations.py --retry-failed scrapes the pages in the file again
+    and merges their rows into the existing results.
+"""
+
+# Import libraries.
+import datetime
+import json
+import os
+
+FILE_NAME = "name_translations_failed.jsonl"
+
+
+def make_failure(url, stage, error, entry):
+    """
+    Return the dictionary of a failure to scrape the page at url, which
+        raised error at stage.
+    """
+    return {
+        "url": url,
+        "stage": stage,
+        "error": type(error).__name__,
+        "message": str(error),
+        "entry": entry,
+        "time": datetime.datetime.now(datetime.timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ")
+        }
+
+
+class DeadLetters:
+    """
+    Append failures to a dead-letter file. The file is only created when
+        the first failure is recorded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.count = 0
+
+    def record(self, url, stage, error, entry):
+        """
+        Record a failure and return its dictionary.
+        """
+        failure = make_failure(url, stage, error, entry)
+        self.write(failure)
+        return failure
+
+    def write(self, failure):
+        """
+        Record the dictionary of a failure, such as one read from another
+            dead-letter file or from a page archive.
+        """
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write(json.dumps(failure, ensure_ascii=False) + "\n")
+        # Keep the file current, so that a crawl that is stopped partway
+        #   loses no failures.
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_dead_letters(path):
+    """
+    Return a list of the failures in a dead-letter file, or an empty list
+        if there is no file.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
@@ -0,0 +1,212 @@
+#! python3
+# dedupe_rows.py
+
+"""
+This program removes duplicate rows from the results of
+    name_translations.py and sorts them, within a fixed memory budget, so
+    that results far larger than memory can be combined on small
+    machines.
+
+Two rows are duplicates if they are for the same person, in the same
+    language, with the same full name. A person is identified by the
+    canonical form of their URL (see page_urls.py), so differently
+    encoded links to the same page count as one person. Alias language
+    codes (such as "nb" and "no", or "cz" and "cs") are already merged,
+    since rows are compared by language name rather than by code. (Links
+    that reach the same person through a redirect have different URLs and
+    are not merged.)
+
+A person who is on several Wikipedia lists keeps every list, separated
+    by "; " in the "Source" column of each of their rows, rather than only
+    the list on which they were found first.
+
+The rows are sorted by an external merge sort: they are read in runs
+    that fit in --memory-mb megabytes, each run is sorted and spilled to
+    a temporary file, and the runs are merged with heapq.merge, which
+    only holds one row per run in memory. The output is sorted by person,
+    then language, then full name.
+
+For instance:
+
+    python dedupe_rows.py name_translations.csv other_run.csv.zst \
+        --output name_translations_deduped.csv --memory-mb 64
+"""
+
+# Import libraries.
+import argparse
+import csv
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+
+import compressed_files
+import output_writers
+from page_urls import canonical_url
+
+SOURCE_SEPARATOR = "; "
+
+# Set the greatest number of runs merged at once, to stay well below the
+#   limit on open files.
+MERGE_WIDTH = 64
+
+
+def get_key(row):
+    """
+    Return the sort key of a row: its person, language, and full name.
+    """
+    return canonical_url(row["URL"]), row["Language"], row["Full Name"]
+
+
+def get_row_size(row):
+    """
+    Return roughly how many bytes a row takes up in memory.
+    """
+    return sys.getsizeof(row) + sum(map(sys.getsizeof, row.values()))
+
+
+def read_rows(paths, columns):
+    """
+    Yield the rows of each csv in paths as dictionaries of columns,
+        leaving out the index column.
+    """
+    for path in paths:
+        for row in compressed_files.read_rows(path):
+            yield {column: row[column] for column in columns}
+
+
+def write_run(rows, columns, temp_dir):
+    """
+    Write rows to a new temporary csv in temp_dir and return its path.
+    """
+    file_descriptor, path = tempfile.mkstemp(suffix=".csv", dir=temp_dir)
+    with open(file_descriptor, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def read_run(path):
+    with open(path, encoding="utf-8", newline="") as file:
+        yield from csv.DictReader(file)
+
+
+def write_runs(rows, columns, memory_budget, temp_dir):
+    """
+    Split rows into runs of at most memory_budget bytes, sort each run,
+        and return a list of the paths of the runs.
+    """
+    paths = []
+    run = []
+    size = 0
+    for row in rows:
+        run.append(row)
+        size += get_row_size(row)
+        if size >= memory_budget:
+            run.sort(key=get_key)
+            paths.append(write_run(run, columns, temp_dir))
+            run = []
+            size = 0
+    if run:
+        run.sort(key=get_key)
+        paths.append(write_run(run, columns, temp_dir))
+    return paths
+
+
+def merge_runs(paths, columns, temp_dir):
+    """
+    Return an iterator over the rows of the sorted runs at paths, in
+        order. If there are more than MERGE_WIDTH runs, they are first
+        merged into fewer, longer runs.
+    """
+    while len(paths) > MERGE_WIDTH:
+        merged_path = write_run(
+            heapq.merge(*map(read_run, paths[:MERGE_WIDTH]), key=get_key),
+            columns, temp_dir)
+        for path in paths[:MERGE_WIDTH]:
+            os.remove(path)
+        paths = paths[MERGE_WIDTH:] + [merged_path]
+    return heapq.merge(*map(read_run, paths), key=get_key)
+
+
+def dedupe_sorted(rows):
+    """
+    Yield the rows of an iterator of sorted rows without duplicates, with
+        the sources of each person joined.
+    """
+    for person, person_rows in itertools.groupby(
+            rows, key=lambda row: get_key(row)[0]):
+        person_rows = list(person_rows)
+        # Split sources joined by an earlier run, so that results can be
+        #   deduplicated again after more are added.
+        sources = SOURCE_SEPARATOR.join(sorted(
+            {source for row in person_rows
+             for source in row["Source"].split(SOURCE_SEPARATOR)}))
+        for key, duplicates in itertools.groupby(person_rows, key=get_key):
+            row = next(duplicates)
+            row["Source"] = sources
+            yield row
+
+
+def dedupe(input_paths, output_path, memory_mb=256, temp_dir=None,
+           compression="infer", level=None):
+    """
+    Remove duplicate rows from the csvs at input_paths, sort them, and
+        save them to output_path using about memory_mb megabytes. Return
+        the numbers of rows read and written.
+    """
+    with compressed_files.open_text(input_paths[0],
+                                    encoding="utf-8-sig") as file:
+        columns = [column for column in next(csv.reader(file))
+                   if column not in ["", "ID"]]
+    if compression == "infer":
+        compression = compressed_files.get_compression(output_path)
+
+    with tempfile.TemporaryDirectory(dir=temp_dir) as run_dir:
+        read_count = 0
+
+        def count_rows(rows):
+            nonlocal read_count
+            for row in rows:
+                read_count += 1
+                yield row
+
+        paths = write_runs(count_rows(read_rows(input_paths, columns)),
+                           columns, memory_mb * 2 ** 20, run_dir)
+        sink = output_writers.CsvSink(
+            "derived", columns, output_path, index=True,
+            encoding="utf-8-sig", compression=compression, level=level)
+        for row in dedupe_sorted(merge_runs(paths, columns, run_dir)):
+            sink.add([row])
+        sink.close()
+    return read_count, sink.count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Remove duplicate rows from the results and sort "
+                    "them within a memory budget.")
+    parser.add_argument("inputs", nargs="+",
+                        help="csvs written by name_translations.py")
+    parser.add_argument("--output", default="name_translations_deduped.csv",
+                        help="path of the csv to write")
+    parser.add_argument("--memory-mb", type=float, default=256,
+                        help="memory for each sorted run, in megabytes")
+    parser.add_argument("--temp-dir",
+                        help="directory in which to spill sorted runs")
+    parser.add_argument("--compression-level", type=int,
+                        help="level of compression, if the output's name "
+                             "ends in .gz or .zst")
+    args = parser.parse_args()
+
+    read_count, written_count = dedupe(
+        args.inputs, args.output, args.memory_mb, args.temp_dir,
+        level=args.compression_level)
+    print(f"Read {read_count} rows and saved {written_count} to "
+          f"{args.output}.")
+
+
+if __name__ == "__main__":
+    main()
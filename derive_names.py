@@ -0,0 +1,199 @@
+#! python3
+# derive_names.py
+
+"""
+This program derives the names in name_translations.csv from the raw
+    results of a crawl, so that changes to the rules for cleaning names
+    can be applied without scraping Wikipedia again.
+
+The raw results (name_translations_raw.csv) have one row per page and
+    language, with these columns:
+
+        URL             The URL of the English language page.
+        Language Code   The Wikipedia language code of the title ("en"
+                        for the English language page itself).
+        Title           The title of the page in that language, as
+                        scraped.
+        Source          The Wikipedia list on which the page was found.
+
+The derivation cleans each title and picks out the given name in one
+    vectorised pass over the whole table. In languages in which a
+    person's given name usually comes after their surname ("gnf" is "No"
+    in languages.py), such as Hungarian or Turkish, the given name is
+    taken to be the last word of the title rather than the first.
+
+Each full name is also labelled with the script it is actually written
+    in (see script_detection.py), and "Familiar-ish Script" is "Yes" when
+    that script is Latin, Cyrillic, Greek, or Arabic. Only names with no
+    letters at all fall back on the language's "fs" flag. Rows whose
+    language codes are not in languages.py are kept, with the code as
+    the language and "idk" for the given name's position.
+
+For instance:
+
+    python derive_names.py --raw name_translations_raw.csv \
+        --output name_translations.csv
+"""
+
+# Import libraries.
+import argparse
+
+import pandas as pd
+
+from languages import language_tags
+import script_detection
+import stage_profiler
+
+# Name the columns of the raw results.
+RAW_COLUMNS = ["URL", "Language Code", "Title", "Source"]
+
+# Name the columns of the derived results.
+DERIVED_COLUMNS = [
+    "Name (English)", "Full Name (English)", "URL", "Language", "Name",
+    "Full Name", "Script", "Familiar-ish Script",
+    "Given Name Usually First", "Source"
+    ]
+
+# Create a dataframe of languages indexed by language code.
+LANGUAGES = pd.DataFrame.from_dict(language_tags, orient="index")
+
+
+def clean_titles(titles):
+    """
+    Return a series of titles with en dashes, parenthetical text, and
+        commas, along with any text following them, removed. A character
+        at the very start of a title is never treated as a separator.
+    """
+    # Remove en dashes and following text from titles, along with the
+    #   character before the en dash. For instance, if the title is
+    #   "Alfred le Grand – French", change it to "Alfred le Grand".
+    titles = titles.str.replace(r"^(?!–)(.*?).–.*$", r"\1", regex=True)
+    # Remove parenthetical text from titles. For instance, if the title
+    #   is "Henri Ier (roi d'Angleterre)", change it to "Henri Ier".
+    titles = titles.str.replace(r"^(?!\()(.*?).\(.*$", r"\1", regex=True)
+    # Remove commas and following text from titles. For instance, if the
+    #   title is "Vilim I, kralj Engleske", change it to "Vilim I".
+    titles = titles.str.replace(r"^(?!,)(.*?),.*$", r"\1", regex=True)
+    return titles
+
+
+def first_words(titles):
+    """
+    Return a series of the first word of each title.
+    """
+    return titles.str.replace(r"^(?! )(.*?) .*$", r"\1", regex=True)
+
+
+def last_words(titles):
+    """
+    Return a series of the last word of each title.
+    """
+    return titles.str.replace(r"^.* ([^ ]+)$", r"\1", regex=True)
+
+
+def get_english_names(english):
+    """
+    Return a dataframe of the English name and full name of each URL,
+        indexed by URL, from a dataframe of raw English language rows.
+    """
+    full_names = clean_titles(english["Title"])
+    english_names = pd.DataFrame({
+        "Name (English)": first_words(full_names).values,
+        "Full Name (English)": full_names.values
+        }, index=english["URL"].values)
+    return english_names[~english_names.index.duplicated(keep="first")]
+
+
+def derive_frame(raw, english=None):
+    """
+    Return a dataframe of derived names from a dataframe of raw results.
+        Rows without language codes are dropped. The rows keep the order
+        of the raw results.
+
+    The English names are taken from the English language rows of raw,
+        unless a separate dataframe of raw English language rows is given,
+        so that a crawl can derive each batch of pages as it goes.
+    """
+    raw = raw[raw["Language Code"] != ""].reset_index(drop=True)
+    if english is None:
+        english = raw[raw["Language Code"] == "en"]
+    languages = LANGUAGES.reindex(raw["Language Code"])
+    languages.index = raw.index
+    # Describe languages that are not in languages.py by their codes.
+    languages["name"] = languages["name"].fillna(raw["Language Code"])
+    languages["gnf"] = languages["gnf"].fillna("idk")
+
+    full_names = clean_titles(raw["Title"])
+    # Take the given name from the end of the title in languages in
+    #   which it usually comes after the surname, and from the start
+    #   otherwise.
+    names = first_words(full_names).where(languages["gnf"] != "No",
+                                          last_words(full_names))
+
+    # Label each full name with its script.
+    scripts = script_detection.detect_scripts(full_names)
+    familiar = scripts.isin(script_detection.FAMILIAR_SCRIPTS).map(
+        {True: "Yes", False: "No"})
+    familiar = familiar.where(scripts != script_detection.COMMON,
+                              languages["fs"].fillna("No"))
+
+    # Get the English names from the English language page of each URL.
+    english_names = get_english_names(english).reindex(raw["URL"])
+    english_names.index = raw.index
+
+    df = pd.DataFrame({
+        "Name (English)": english_names["Name (English)"],
+        "Full Name (English)": english_names["Full Name (English)"],
+        "URL": raw["URL"],
+        "Language": languages["name"],
+        "Name": names,
+        "Full Name": full_names,
+        "Script": scripts,
+        "Familiar-ish Script": familiar,
+        "Given Name Usually First": languages["gnf"],
+        "Source": raw["Source"]
+        }, columns=DERIVED_COLUMNS)
+    return df.reset_index(drop=True)
+
+
+def derive_rows(raw_dicts, english_dicts=None):
+    """
+    Return a list of dictionaries of derived names from a list of raw
+        dictionaries. The raw dictionaries must include the English
+        language page of each URL, unless those are given separately.
+    """
+    with stage_profiler.stage("row_building"):
+        raw = pd.DataFrame(raw_dicts, columns=RAW_COLUMNS)
+        if english_dicts is not None:
+            english_dicts = pd.DataFrame(english_dicts,
+                                         columns=RAW_COLUMNS)
+    with stage_profiler.stage("normalisation"):
+        derived = derive_frame(raw, english_dicts)
+    with stage_profiler.stage("row_building"):
+        return derived.to_dict("records")
+
+
+def read_raw(path):
+    """
+    Read a csv of raw results, keeping every value as a string.
+    """
+    return pd.read_csv(path, dtype=str, keep_default_na=False,
+                       encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Derive names from the raw results of a crawl.")
+    parser.add_argument("--raw", default="name_translations_raw.csv",
+                        help="path of the raw results")
+    parser.add_argument("--output", default="name_translations.csv",
+                        help="path of the csv to write")
+    args = parser.parse_args()
+
+    df = derive_frame(read_raw(args.raw))
+    df.to_csv(args.output, encoding="utf-8-sig")
+    print(f"Saved {len(df)} rows to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
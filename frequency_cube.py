@@ -0,0 +1,280 @@
+#! python3
+# frequency_cube.py
+
+"""
+This module precomputes translation counts from the results of
+    name_translations.py and answers common questions about them without
+    reading the row-level csv again.
+
+The counts are grouped by English name, language, name, familiar-ish
+    script, and source, and saved to an indexed SQLite database
+    (name_translations_cube.sqlite) with these tables:
+
+        english_names   id, name
+        names           id, name
+        languages       id, language
+        sources         id, source
+        cube            english_id, language_id, name_id, familiar,
+                        source_id, count
+        translations    english_id, language_id, name_id, count
+                        (the cube summed over scripts and sources)
+        coverage        language_id, familiar, count, persons
+        language_persons
+                        language_id, persons
+                        (the persons of coverage over both kinds of
+                        script, each counted once)
+        meta            key, value
+
+name_translations.py writes the database after each crawl. It can also
+    be built from an existing csv:
+
+    python frequency_cube.py build --input name_translations.csv
+
+and queried:
+
+    python frequency_cube.py top Henry --language French
+    python frequency_cube.py sources
+    python frequency_cube.py coverage
+
+Queries only need sqlite3, so they don't import pandas.
+"""
+
+# Import libraries.
+import argparse
+import sqlite3
+
+DEFAULT_PATH = "name_translations_cube.sqlite"
+
+# Name the columns of the results that the cube groups by.
+DIMENSIONS = ["Name (English)", "Language", "Name", "Familiar-ish Script",
+              "Source"]
+
+SCHEMA = """
+CREATE TABLE english_names (id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+CREATE TABLE names (id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE languages (id INTEGER PRIMARY KEY, language TEXT UNIQUE);
+CREATE TABLE sources (id INTEGER PRIMARY KEY, source TEXT UNIQUE);
+CREATE TABLE cube (english_id INTEGER, language_id INTEGER,
+                   name_id INTEGER, familiar INTEGER, source_id INTEGER,
+                   count INTEGER);
+CREATE TABLE translations (english_id INTEGER, language_id INTEGER,
+                           name_id INTEGER, count INTEGER);
+CREATE TABLE coverage (language_id INTEGER, familiar INTEGER,
+                       count INTEGER, persons INTEGER);
+CREATE TABLE language_persons (language_id INTEGER, persons INTEGER);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+"""
+
+INDEXES = """
+CREATE INDEX translations_by_english ON translations
+    (english_id, language_id, count DESC);
+CREATE INDEX cube_by_english ON cube (english_id, language_id, name_id);
+CREATE INDEX cube_by_source ON cube (source_id);
+CREATE INDEX names_by_name ON names (name);
+"""
+
+
+def build_cube(df, path=DEFAULT_PATH):
+    """
+    Group a dataframe of results from name_translations.py and save the
+        counts to a new database at path, replacing any database there.
+    """
+    import os
+
+    import pandas as pd
+
+    df = df[DIMENSIONS + ["URL"]]
+    # Encode each dimension as integer IDs.
+    english_ids, english_names = pd.factorize(df["Name (English)"])
+    language_ids, languages = pd.factorize(df["Language"])
+    name_ids, names = pd.factorize(df["Name"])
+    source_ids, sources = pd.factorize(df["Source"])
+    codes = pd.DataFrame({
+        "english_id": english_ids, "language_id": language_ids,
+        "name_id": name_ids,
+        "familiar": (df["Familiar-ish Script"] == "Yes").astype(int).values,
+        "source_id": source_ids, "url": df["URL"].values})
+
+    cube = codes.groupby(["english_id", "language_id", "name_id",
+                          "familiar", "source_id"]).size().rename(
+        "count").reset_index()
+    translations = cube.groupby(["english_id", "language_id",
+                                 "name_id"])["count"].sum().reset_index()
+    coverage = codes.groupby(["language_id", "familiar"]).agg(
+        count=("url", "size"), persons=("url", "nunique")).reset_index()
+    # A person may have names in both kinds of script, so count the
+    #   persons of each language again rather than summing coverage.
+    language_persons = codes.groupby("language_id")["url"].nunique().rename(
+        "persons").reset_index()
+
+    if os.path.exists(path):
+        os.remove(path)
+    with sqlite3.connect(path) as connection:
+        connection.executescript(SCHEMA)
+        for table, column, values in [
+                ("english_names", "name", english_names),
+                ("languages", "language", languages),
+                ("names", "name", names),
+                ("sources", "source", sources)]:
+            connection.executemany(
+                f"INSERT INTO {table} (id, {column}) VALUES (?, ?)",
+                enumerate(values.tolist()))
+        for table, frame in [("cube", cube),
+                             ("translations", translations),
+                             ("coverage", coverage),
+                             ("language_persons", language_persons)]:
+            connection.executemany(
+                f"INSERT INTO {table} VALUES "
+                f"({', '.join('?' * len(frame.columns))})",
+                frame.itertuples(index=False, name=None))
+        connection.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("rows", len(df)), ("persons", int(df["URL"].nunique()))])
+        connection.executescript(INDEXES)
+    connection.close()
+
+
+def connect(path=DEFAULT_PATH):
+    """
+    Open a database written by build_cube for reading.
+    """
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def top_translations(connection, english_name, language=None, k=10):
+    """
+    Return a list of up to k (language, name, count) tuples for the most
+        common translations of english_name, in one language or in all
+        of them.
+    """
+    query = """
+        SELECT languages.language, names.name, translations.count
+        FROM translations
+        JOIN english_names ON english_names.id = translations.english_id
+        JOIN languages ON languages.id = translations.language_id
+        JOIN names ON names.id = translations.name_id
+        WHERE english_names.name = ?"""
+    parameters = [english_name]
+    if language is not None:
+        query += " AND languages.language = ?"
+        parameters.append(language)
+    query += " ORDER BY translations.count DESC, names.name LIMIT ?"
+    parameters.append(k)
+    return connection.execute(query, parameters).fetchall()
+
+
+def counts_per_source(connection, english_name=None, language=None,
+                      name=None):
+    """
+    Return a list of (source, count) tuples, optionally only for rows
+        with the given English name, language, and name.
+    """
+    query = """
+        SELECT sources.source, SUM(cube.count) AS total
+        FROM cube
+        JOIN sources ON sources.id = cube.source_id"""
+    conditions = []
+    parameters = []
+    if english_name is not None:
+        conditions.append("cube.english_id = (SELECT id FROM english_names "
+                          "WHERE name = ?)")
+        parameters.append(english_name)
+    if language is not None:
+        conditions.append("cube.language_id = (SELECT id FROM languages "
+                          "WHERE language = ?)")
+        parameters.append(language)
+    if name is not None:
+        conditions.append("cube.name_id IN (SELECT id FROM names "
+                          "WHERE name = ?)")
+        parameters.append(name)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " GROUP BY sources.source ORDER BY total DESC"
+    return connection.execute(query, parameters).fetchall()
+
+
+def language_coverage(connection, familiar_only=True):
+    """
+    Return a list of (language, rows, persons, share of all persons)
+        tuples, optionally counting only rows in a familiar-ish script.
+    """
+    persons = connection.execute(
+        "SELECT value FROM meta WHERE key = 'persons'").fetchone()[0]
+    if familiar_only:
+        query = """
+            SELECT languages.language, coverage.count, coverage.persons
+            FROM coverage
+            JOIN languages ON languages.id = coverage.language_id
+            WHERE coverage.familiar = 1"""
+    else:
+        query = """
+            SELECT languages.language, SUM(coverage.count),
+                   language_persons.persons
+            FROM coverage
+            JOIN languages ON languages.id = coverage.language_id
+            JOIN language_persons
+                ON language_persons.language_id = coverage.language_id
+            GROUP BY languages.language"""
+    query += " ORDER BY 2 DESC"
+    return [(language, rows, language_persons, language_persons / persons)
+            for language, rows, language_persons in
+            connection.execute(query).fetchall()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or query the translation frequency cube.")
+    parser.add_argument("--cube", default=DEFAULT_PATH,
+                        help="path of the database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="build the database from a csv")
+    build_parser.add_argument("--input", default="name_translations.csv",
+                              help="csv written by name_translations.py")
+
+    top_parser = subparsers.add_parser(
+        "top", help="list the top translations of an English name")
+    top_parser.add_argument("english_name")
+    top_parser.add_argument("--language")
+    top_parser.add_argument("-k", type=int, default=10)
+
+    sources_parser = subparsers.add_parser(
+        "sources", help="count rows per source")
+    sources_parser.add_argument("--english-name")
+    sources_parser.add_argument("--language")
+    sources_parser.add_argument("--name")
+
+    coverage_parser = subparsers.add_parser(
+        "coverage", help="count rows and people per language")
+    coverage_parser.add_argument("--all-scripts", action="store_true",
+                                 help="include rows in unfamiliar scripts")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        import pandas as pd
+
+        df = pd.read_csv(args.input, dtype=str, keep_default_na=False,
+                         encoding="utf-8-sig")
+        build_cube(df, args.cube)
+        print(f"Saved the cube for {len(df)} rows to {args.cube}.")
+        return
+
+    connection = connect(args.cube)
+    if args.command == "top":
+        for language, name, count in top_translations(
+                connection, args.english_name, args.language, args.k):
+            print(f"{count:>8}  {name} ({language})")
+    elif args.command == "sources":
+        for source, count in counts_per_source(
+                connection, args.english_name, args.language, args.name):
+            print(f"{count:>8}  {source}")
+    else:
+        for language, rows, persons, share in language_coverage(
+                connection, not args.all_scripts):
+            print(f"{rows:>8}  {persons:>8}  {share:6.1%}  {language}")
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#! python3
+# frontier_pruning.py
+
+"""
+This module drops links that are unlikely to lead to a person's page
+    before any person page is scraped. Links are pruned in two ways:
+
+        - By namespace. Links to pages such as "Category:Popes",
+          "Help:IPA", "Special:BookSources" or "Template:English
+          monarchs" are never person pages. Links from lists on other
+          wikis are also pruned by the names and aliases of their own
+          wikis' namespaces (such as "Catégorie" or "Kategorie"), read
+          from the wikis' site information.
+        - Optionally, by entity type. The linked pages are looked up in
+          bulk on Wikidata, fifty at a time, and pages whose items are
+          not instances of a human (or of a fictional, legendary, or
+          biblical person) are dropped. Pages that cannot be looked up
+          are kept. Results are cached in a json file, so each page is
+          only looked up once.
+
+name_translations.py and crawl_plan.py use this module when run with
+    --prune.
+"""
+
+# Import libraries.
+import json
+import os
+from urllib.parse import unquote, urlsplit
+
+import requests
+
+# Create a set of namespace prefixes used on the English Wikipedia,
+#   including aliases and talk namespaces. Links to pages in any of these
+#   namespaces are not links to articles.
+NAMESPACES = {
+    "book", "book talk", "cat", "category", "category talk", "draft",
+    "draft talk", "education program", "education program talk", "file",
+    "file talk", "gadget", "gadget talk", "gadget definition",
+    "gadget definition talk", "h", "help", "help talk", "image",
+    "image talk", "media", "mediawiki", "mediawiki talk", "module",
+    "module talk", "mos", "p", "portal", "portal talk", "project",
+    "project talk", "special", "t", "talk", "template", "template talk",
+    "timedtext", "timedtext talk", "topic", "user", "user talk", "wp",
+    "wt", "wikipedia", "wikipedia talk"
+    }
+
+# Number the namespace of files, whose links are never extracted.
+FILE_NAMESPACE = 6
+
+# Create a set of Wikidata classes whose instances are treated as
+#   people: humans, fictional humans, human biblical figures, mythical
+#   characters, mythological Greek characters, and fictional characters.
+#   Biblical and folkloric figures are often not instances of "human".
+PERSON_CLASSES = {
+    "Q5", "Q15632617", "Q20643955", "Q4271324", "Q22988604", "Q95074"
+    }
+
+WIKIDATA_API = "https://www.wikidata.org/w/api.php"
+USER_AGENT = ("name_translations "
+              "(https://github.com/crowtherln/name_translations)")
+
+# Wikidata accepts up to fifty titles per request.
+BATCH_SIZE = 50
+
+
+def get_page_title(href):
+    """
+    Return the title of the page that an href such as
+        "/wiki/Henry_I_of_England#Reign" (or, for a list on another wiki,
+        "https://fr.wikipedia.org/wiki/Henri_Ier") links to.
+    """
+    title = href.split("/wiki/", 1)[-1].split("#")[0]
+    return unquote(title).replace("_", " ")
+
+
+def parse_siteinfo(data):
+    """
+    Parse the json of a wiki's site information (its namespaces and
+        namespace aliases, in the API's format version 2) and return a
+        dictionary from the lowercased names, canonical names, and aliases
+        of its namespaces other than that of articles to their IDs.
+    """
+    query = json.loads(data)["query"]
+    namespaces = {}
+    for namespace in query["namespaces"].values():
+        if namespace["id"] != 0:
+            for name in [namespace["name"], namespace.get("canonical")]:
+                if name:
+                    namespaces[name.lower()] = namespace["id"]
+    for alias in query.get("namespacealiases", []):
+        namespaces[alias["alias"].lower()] = alias["id"]
+    return namespaces
+
+
+def get_namespace(title, namespaces=None):
+    """
+    Return the prefix of a page title that names a namespace, such as
+        "Catégorie" in "Catégorie:Rois de France", or None if the title is
+        of an article. namespaces is a dictionary from the lowercased
+        names of a wiki's namespaces to their IDs (see parse_siteinfo).
+        The English Wikipedia's names, which every wiki accepts, are
+        always recognised.
+    """
+    colon = title.find(":")
+    if colon <= 0:
+        return None
+    prefix = title[:colon].strip()
+    if prefix.lower() in NAMESPACES or prefix.lower() in (namespaces or {}):
+        return prefix
+    return None
+
+
+def classify_link(href, namespaces=None):
+    """
+    Return "article" if href links to a Wikipedia article, or a reason
+        for dropping the link otherwise. namespaces is a dictionary from
+        the host of each wiki other than the English language one to the
+        names of its namespaces (see get_namespace).
+    """
+    title = get_page_title(href)
+    if title == "" or title == "Main Page":
+        return "main page"
+    prefix = get_namespace(title, (namespaces or {}).get(
+        urlsplit(href).netloc.lower()))
+    if prefix is not None:
+        return "namespace " + prefix.capitalize()
+    if title.startswith("List of ") or title.startswith("Lists of "):
+        return "list"
+    return "article"
+
+
+def load_cache(cache_path):
+    """
+    Return the cached results of earlier Wikidata lookups saved to
+        cache_path, a dictionary from page title to result, or an empty
+        dictionary if there are none. The entity type cache maps each
+        title to True (a person), False (not a person), or None (could
+        not be looked up).
+    """
+    if cache_path is None or not os.path.exists(cache_path):
+        return {}
+    with open(cache_path, encoding="utf-8") as cache_file:
+        return json.load(cache_file)
+
+
+def save_cache(cache, cache_path):
+    """
+    Save the results of Wikidata lookups to cache_path, unless it is
+        None.
+    """
+    if cache_path is None:
+        return
+    directory = os.path.dirname(cache_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(cache_path, "w", encoding="utf-8") as cache_file:
+        json.dump(cache, cache_file, ensure_ascii=False)
+
+
+def look_up_people(titles, cache_path=None):
+    """
+    Return a dictionary from each English Wikipedia page title in titles
+        to whether its Wikidata item is a person, or None if it could not
+        be looked up, looking up only the titles that are not already
+        cached in cache_path. If Wikidata cannot be reached, the
+        remaining titles are not looked up, so they are kept.
+    """
+    entity_types = load_cache(cache_path)
+    missing = [title for title in dict.fromkeys(titles)
+               if title not in entity_types]
+    for start in range(0, len(missing), BATCH_SIZE):
+        batch = missing[start:start + BATCH_SIZE]
+        try:
+            res = requests.get(WIKIDATA_API, params={
+                "action": "wbgetentities", "sites": "enwiki",
+                "titles": "|".join(batch), "props": "claims|sitelinks",
+                "sitefilter": "enwiki", "format": "json"},
+                headers={"User-Agent": USER_AGENT})
+            entities = res.json().get("entities", {})
+        except (requests.RequestException, ValueError):
+            break
+        for title in batch:
+            entity_types[title] = None
+        for entity in entities.values():
+            sitelink = entity.get("sitelinks", {}).get("enwiki")
+            if sitelink is None:
+                continue
+            classes = {
+                claim["mainsnak"].get("datavalue", {}).get(
+                    "value", {}).get("id")
+                for claim in entity.get("claims", {}).get("P31", [])}
+            entity_types[sitelink["title"]] = bool(classes &
+                                                   PERSON_CLASSES)
+        save_cache(entity_types, cache_path)
+    return {title: entity_types.get(title) for title in titles}
+
+
+def prune_links(candidate_links, check_people=False, cache_path=None,
+                namespaces=None):
+    """
+    Return the (list name, href, title) tuples in candidate_links that
+        may lead to a person's page, and a dictionary from each dropped
+        link's reason for being dropped to its number of occurrences.
+        namespaces gives the namespaces of the other wikis that the links
+        lead to (see classify_link).
+    """
+    candidate_links = list(candidate_links)
+    kept_links = []
+    reasons = {}
+    for link in candidate_links:
+        reason = classify_link(link[1], namespaces)
+        if reason == "article":
+            kept_links.append(link)
+        else:
+            reasons[reason] = reasons.get(reason, 0) + 1
+    if check_people:
+        # Only look up English language pages, since the lookups are by
+        #   English Wikipedia title. Links from lists on other wikis are
+        #   kept.
+        people = look_up_people(
+            [get_page_title(href) for key, href, title in kept_links
+             if href.startswith("/wiki/")],
+            cache_path)
+        checked_links = []
+        for link in kept_links:
+            if (link[1].startswith("/wiki/") and
+                    people[get_page_title(link[1])] is False):
+                reasons["not a person"] = reasons.get("not a person",
+                                                      0) + 1
+            else:
+                checked_links.append(link)
+        kept_links = checked_links
+    return kept_links, reasons
+
+
+def count_saved_fetches(frontier, pruned_frontier):
+    """
+    Return a dictionary from each list name to the number of person
+        page requests that pruning saves for that list.
+    """
+    saved = {}
+    for english_dict in frontier:
+        saved[english_dict["Source"]] = saved.get(
+            english_dict["Source"], 0) + 1
+    for english_dict in pruned_frontier:
+        saved[english_dict["Source"]] -= 1
+    return saved
+
+
+def print_pruning(reasons, saved_requests):
+    """
+    Print the number of links that pruning dropped for each reason, and
+        the number of person page requests it saved for each list.
+    """
+    print("Links dropped by pruning:")
+    for reason, count in reasons.items():
+        print(f"    {count:>6}  {reason}")
+    print("Requests saved by pruning:")
+    for name, saved in saved_requests.items():
+        if saved > 0:
+            print(f"    {saved:>6}  {name}")
@@ -0,0 +1,140 @@
+# host_scheduler.py
+
+"""
+This module schedules the requests of async_crawler.py per host, so that
+    crawling lists and pages on many wikis at once uses the full
+    allowance of each host without a slow host holding up the others.
+
+Each host (such as fr.wikipedia.org) has its own:
+
+        connection pool     An aiohttp session whose connector holds at
+                            most as many connections as the host's
+                            concurrency.
+        concurrency limit   A semaphore bounding the host's requests in
+                            flight.
+        rate budget         The most requests per second started on the
+                            host, if any. Requests are given evenly spaced
+                            start times, so a burst of requests is spread
+                            out rather than sent at once.
+
+Hosts get the default concurrency and rate unless they are given their
+    own, and are set up when they are first requested. For instance:
+
+    scheduler = HostScheduler(concurrency=10, rate=5, host_limits={
+        "de.wikipedia.org": (4, 2)})
+    data = await scheduler.fetch("https://de.wikipedia.org/wiki/Otto_I.")
+    await scheduler.close()
+"""
+
+# Import libraries.
+import asyncio
+from urllib.parse import urlsplit
+
+# Set the default number of requests in flight at once on each host.
+DEFAULT_CONCURRENCY = 20
+
+
+def parse_host_limit(text):
+    """
+    Return a (host, concurrency, rate) tuple from a string such as
+        "de.wikipedia.org=4" or "de.wikipedia.org=4:2.5". The rate is
+        None if it is not given.
+    """
+    host, separator, limits = text.partition("=")
+    if not separator or not host:
+        raise ValueError(f"Expected HOST=CONCURRENCY[:RATE], got {text!r}")
+    concurrency, separator, rate = limits.partition(":")
+    return (host.strip().lower(), int(concurrency),
+            float(rate) if rate else None)
+
+
+class HostQueue:
+    """
+    The connection pool, concurrency limit, and rate budget of one host.
+    """
+
+    def __init__(self, session, concurrency, rate, owns_session):
+        self.session = session
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = 0
+        self.owns_session = owns_session
+        self.count = 0
+
+    async def wait_for_slot(self):
+        """
+        Wait until the next start time in the host's rate budget.
+        """
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class HostScheduler:
+    """
+    Fetch pages through a separate queue for each host. If session (an
+        aiohttp.ClientSession) is given, every host shares it and it is
+        not closed; the hosts still have their own concurrency limits and
+        rate budgets.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, rate=None,
+                 host_limits=None, session=None):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.host_limits = {host.lower(): limits for host, limits in
+                            (host_limits or {}).items()}
+        self.session = session
+        self.hosts = {}
+
+    def get_host(self, host):
+        """
+        Return the queue of host, setting it up if it is new.
+        """
+        if host not in self.hosts:
+            import aiohttp
+
+            concurrency, rate = self.host_limits.get(
+                host, (self.concurrency, self.rate))
+            session = self.session
+            if session is None:
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=concurrency))
+            self.hosts[host] = HostQueue(session, concurrency, rate,
+                                         self.session is None)
+        return self.hosts[host]
+
+    async def fetch(self, url):
+        """
+        Return the text of the page at url, once its host has a free
+            slot.
+        """
+        host = self.get_host(urlsplit(url).netloc.lower())
+        async with host.semaphore:
+            await host.wait_for_slot()
+            async with host.session.get(url) as res:
+                data = await res.text()
+        host.count += 1
+        return data
+
+    def get_counts(self):
+        """
+        Return a dictionary from each host to its number of requests.
+        """
+        return {host: queue.count for host, queue in self.hosts.items()}
+
+    async def close(self):
+        for queue in self.hosts.values():
+            if queue.owns_session:
+                await queue.session.close()
+        self.hosts = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
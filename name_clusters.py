@@ -0,0 +1,184 @@
+#! python3
+# name_clusters.py
+
+"""
+This program groups given names that are equivalent across languages
+    (for instance, Henry, Henri, Enrique, Heinrich, and Enrico) using the
+    results of name_translations.py.
+
+It builds a bipartite graph with English names on one side and names in
+    other languages on the other, where an edge's weight is the number of
+    rows in which the English name ("Name (English)") was translated as
+    the other name ("Name"). Weak edges are dropped, and the connected
+    components of what remains (found with a vectorised union-find over
+    integer IDs) are the clusters.
+
+An edge is kept only if its weight is at least --min-count and it makes
+    up at least --min-share of the other name's weight. The second test
+    keeps words that appear in the titles of many different people, such
+    as "Saint" or "Pope", from joining unrelated clusters. Those words
+    still form clusters of their own, since the English names are the
+    first words of the English titles.
+
+For instance:
+
+    python name_clusters.py --input name_translations.csv \
+        --output name_clusters.csv
+
+The cluster table has one row per name, with these columns:
+
+        Cluster         The cluster's ID, numbered from the cluster with
+                        the highest total count.
+        Side            "English" for English names, "Other" otherwise.
+        Name            The name.
+        Count           The weight of the name's kept edges.
+        Cluster Size    The number of names in the cluster.
+"""
+
+# Import libraries.
+import argparse
+
+import numpy as np
+import pandas as pd
+
+
+def read_pairs(path):
+    """
+    Read the English and other names from a csv written by
+        name_translations.py, leaving out the English language rows.
+    """
+    df = pd.read_csv(path, usecols=["Name (English)", "Language", "Name"],
+                     dtype=str, keep_default_na=False,
+                     encoding="utf-8-sig")
+    df = df[(df["Language"] != "English") & (df["Name (English)"] != "") &
+            (df["Name"] != "")]
+    return df["Name (English)"].to_numpy(), df["Name"].to_numpy()
+
+
+def get_edges(english_names, other_names):
+    """
+    Return the distinct English names, the distinct other names, and
+        three arrays for the edges between them: the English name IDs,
+        the other name IDs, and the weights.
+    """
+    english_ids, english_index = pd.factorize(english_names)
+    other_ids, other_index = pd.factorize(other_names)
+    # Count each distinct pair by packing it into one integer.
+    keys = english_ids.astype(np.int64) * len(other_index) + other_ids
+    keys, weights = np.unique(keys, return_counts=True)
+    return (np.asarray(english_index), np.asarray(other_index),
+            keys // len(other_index), keys % len(other_index), weights)
+
+
+def prune_edges(edge_english, edge_other, weights, other_count,
+                min_count=2, min_share=0.5):
+    """
+    Return a boolean array of the edges to keep: those with at least
+        min_count weight that make up at least min_share of the weight of
+        their other name.
+    """
+    other_totals = np.bincount(edge_other, weights=weights,
+                               minlength=other_count)
+    return ((weights >= min_count) &
+            (weights >= min_share * other_totals[edge_other]))
+
+
+def find_components(node_count, sources, targets):
+    """
+    Return an array giving, for each node, the smallest node ID in its
+        connected component. Each round hooks the root of every edge's
+        larger label onto its smaller label and then compresses paths by
+        pointer jumping, as in union-find, but over whole arrays at a
+        time.
+    """
+    labels = np.arange(node_count)
+    while True:
+        source_labels = labels[sources]
+        target_labels = labels[targets]
+        unmerged = source_labels != target_labels
+        if not unmerged.any():
+            return labels
+        smaller = np.minimum(source_labels, target_labels)[unmerged]
+        np.minimum.at(labels, source_labels[unmerged], smaller)
+        np.minimum.at(labels, target_labels[unmerged], smaller)
+        # Compress paths until every node points at its root.
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def cluster_names(english_names, other_names, min_count=2, min_share=0.5):
+    """
+    Return a dataframe of name clusters from arrays of English names and
+        the names they were translated as.
+    """
+    (english_index, other_index, edge_english, edge_other,
+     weights) = get_edges(english_names, other_names)
+    keep = prune_edges(edge_english, edge_other, weights, len(other_index),
+                       min_count, min_share)
+    edge_english = edge_english[keep]
+    edge_other = edge_other[keep]
+    weights = weights[keep]
+
+    # Number the nodes with the English names first and the other names
+    #   after them.
+    english_count = len(english_index)
+    node_count = english_count + len(other_index)
+    edge_other_nodes = edge_other + english_count
+    labels = find_components(node_count, edge_english, edge_other_nodes)
+    counts = (np.bincount(edge_english, weights=weights,
+                          minlength=node_count) +
+              np.bincount(edge_other_nodes, weights=weights,
+                          minlength=node_count)).astype(np.int64)
+
+    # Leave out names that have no kept edges.
+    nodes = np.flatnonzero(counts > 0)
+    labels = labels[nodes]
+    # Number the clusters from the one with the largest total count.
+    cluster_labels, cluster_ids = np.unique(labels, return_inverse=True)
+    cluster_totals = np.bincount(cluster_ids, weights=counts[nodes])
+    rank = np.empty(len(cluster_labels), dtype=np.int64)
+    rank[np.argsort(-cluster_totals, kind="stable")] = np.arange(
+        len(cluster_labels))
+    clusters = rank[cluster_ids]
+    sizes = np.bincount(clusters)
+
+    names = np.concatenate([english_index, other_index])
+    df = pd.DataFrame({
+        "Cluster": clusters,
+        "Side": np.where(nodes < english_count, "English", "Other"),
+        "Name": names[nodes],
+        "Count": counts[nodes],
+        "Cluster Size": sizes[clusters]
+        })
+    return df.sort_values(["Cluster", "Side", "Count"],
+                          ascending=[True, True, False],
+                          kind="stable").reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Group equivalent given names across languages.")
+    parser.add_argument("--input", default="name_translations.csv",
+                        help="csv written by name_translations.py")
+    parser.add_argument("--output", default="name_clusters.csv",
+                        help="path of the cluster table to write")
+    parser.add_argument("--min-count", type=int, default=2,
+                        help="minimum weight of an edge")
+    parser.add_argument("--min-share", type=float, default=0.5,
+                        help="minimum share of the other name's weight "
+                             "that an edge must have")
+    args = parser.parse_args()
+
+    english_names, other_names = read_pairs(args.input)
+    df = cluster_names(english_names, other_names, args.min_count,
+                       args.min_share)
+    df.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"Saved {df['Cluster'].nunique()} clusters of {len(df)} names "
+          f"to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
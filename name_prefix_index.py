@@ -0,0 +1,320 @@
+#! python3
+# name_prefix_index.py
+
+"""
+This program exports every given name in the results of
+    name_translations.py (both the "Name" column, in each language, and
+    the "Name (English)" column) to a compact, read-only index for
+    type-ahead, and answers prefix queries from it with the most frequent
+    completions.
+
+The index is a handful of arrays saved to an .npz file:
+
+        keys        The names' search keys, concatenated as UTF-8 in
+                    sorted order, with an array of their offsets. A key is
+                    the name without accents, case-folded, so "eri"
+                    completes "Éric". Since UTF-8 sorts like the
+                    characters it encodes, a prefix's completions are one
+                    range of keys, found by binary search.
+        names       The names as they are written, in the same order.
+        counts      The number of people with each name.
+        languages   A bitset for each name of the languages it is used in,
+                    with the list of language names.
+        prefixes    Every prefix with more than SCAN_LIMIT completions,
+                    with its TOP_K most frequent completions, so that short
+                    prefixes need not scan their whole range. Other
+                    prefixes scan at most SCAN_LIMIT names.
+
+It takes a small fraction of the memory that the csv takes in a
+    dictionary, and queries take microseconds. For instance:
+
+    python name_prefix_index.py build --input name_translations.csv \
+        --output name_translations_prefix.npz
+    python name_prefix_index.py query Hen --language French
+
+or, from Python:
+
+    index = name_prefix_index.PrefixIndex("name_translations_prefix.npz")
+    index.complete("Hen", k=5)
+
+name_translations.py can also write the index after each crawl, with
+    --format prefix. Queries only need numpy.
+"""
+
+# Import libraries.
+import argparse
+import bisect
+import unicodedata
+
+import numpy as np
+
+DEFAULT_PATH = "name_translations_prefix.npz"
+
+# Set the number of completions kept for each common prefix, and the
+#   greatest number of names a prefix may complete without them.
+TOP_K = 20
+SCAN_LIMIT = 256
+
+# No UTF-8 string contains this byte, so a prefix followed by it sorts
+#   after every key that starts with the prefix.
+END_BYTE = b"\xff"
+
+
+def get_key(name):
+    """
+    Return the search key of a name: the name without combining marks
+        (accents), case-folded.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(character for character in decomposed
+                   if not unicodedata.combining(character)).casefold()
+
+
+def make_pool(strings):
+    """
+    Return a uint8 array of the UTF-8 encodings of strings, concatenated,
+        and an int32 array of each string's start and end offsets.
+    """
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def get_entries(df):
+    """
+    Return a dataframe with a row for each distinct name in a dataframe
+        of results: its name, key, number of people, and languages, sorted
+        by key and then name.
+    """
+    import pandas as pd
+
+    names = pd.concat([
+        pd.DataFrame({"name": df["Name"], "language": df["Language"],
+                      "url": df["URL"]}),
+        pd.DataFrame({"name": df["Name (English)"], "language": "English",
+                      "url": df["URL"]})])
+    names = names[names["name"].notna() & (names["name"] != "")]
+    grouped = names.groupby("name", sort=False)
+    entries = pd.DataFrame({
+        "count": grouped["url"].nunique(),
+        "languages": grouped["language"].agg(lambda languages:
+                                             sorted(set(languages)))
+        }).reset_index()
+    entries["key"] = entries["name"].map(get_key)
+    return entries.sort_values(["key", "name"], kind="stable",
+                               ignore_index=True)
+
+
+def get_common_prefixes(keys, counts):
+    """
+    Return a sorted list of the prefixes that complete more than
+        SCAN_LIMIT of the sorted keys, and an array with the indexes of
+        each one's TOP_K most frequent completions (-1 where there are
+        fewer).
+    """
+    ranges = {}
+    pending = []
+    if len(keys) > SCAN_LIMIT:
+        ranges[""] = (0, len(keys))
+        pending.append((0, len(keys), 0))
+    # Split each common prefix's range by the next character, and keep the
+    #   parts that are still too long to scan.
+    while pending:
+        low, high, length = pending.pop()
+        start = low
+        for index in range(low + 1, high + 1):
+            prefix = keys[start][:length + 1]
+            if index < high and keys[index][:length + 1] == prefix:
+                continue
+            if index - start > SCAN_LIMIT and len(prefix) == length + 1:
+                ranges[prefix] = (start, index)
+                pending.append((start, index, length + 1))
+            start = index
+
+    prefixes = sorted(ranges, key=lambda prefix: prefix.encode("utf-8"))
+    top = np.full((len(prefixes), TOP_K), -1, dtype=np.int32)
+    for position, prefix in enumerate(prefixes):
+        low, high = ranges[prefix]
+        best = low + np.argsort(-counts[low:high], kind="stable")[:TOP_K]
+        top[position, :len(best)] = best
+    return prefixes, top
+
+
+def build_index(df, path=DEFAULT_PATH):
+    """
+    Build the prefix index from a dataframe of results from
+        name_translations.py and save it to path. Return the number of
+        names.
+    """
+    entries = get_entries(df)
+    languages = sorted({language for entry_languages in entries["languages"]
+                        for language in entry_languages})
+    language_ids = {language: position for position, language in
+                    enumerate(languages)}
+    bitsets = np.zeros((len(entries), (len(languages) + 63) // 64),
+                       dtype=np.uint64)
+    for position, entry_languages in enumerate(entries["languages"]):
+        for language in entry_languages:
+            word, bit = divmod(language_ids[language], 64)
+            bitsets[position, word] |= np.uint64(1) << np.uint64(bit)
+
+    counts = entries["count"].to_numpy(dtype=np.int32)
+    keys = entries["key"].tolist()
+    prefixes, top = get_common_prefixes(keys, counts)
+    key_pool, key_offsets = make_pool(keys)
+    name_pool, name_offsets = make_pool(entries["name"])
+    prefix_pool, prefix_offsets = make_pool(prefixes)
+    np.savez_compressed(
+        path, key_pool=key_pool, key_offsets=key_offsets,
+        name_pool=name_pool, name_offsets=name_offsets, counts=counts,
+        bitsets=bitsets, languages=np.array(languages, dtype=str),
+        prefix_pool=prefix_pool, prefix_offsets=prefix_offsets, top=top)
+    return len(entries)
+
+
+def build_index_from_csv(input_path, output_path=DEFAULT_PATH):
+    """
+    Build the prefix index from a csv written by name_translations.py.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(input_path,
+                     usecols=["URL", "Language", "Name", "Name (English)"],
+                     dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    return build_index(df, output_path)
+
+
+class Pool:
+    """
+    A read-only sequence of the strings in a pool, as UTF-8 bytes, which
+        bisect can search.
+    """
+
+    def __init__(self, pool, offsets):
+        self.data = pool.tobytes()
+        # Index the offsets through a memoryview, which gives Python ints
+        #   without keeping a Python object for each.
+        self.offsets = memoryview(offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        return self.data[self.offsets[position]:self.offsets[position + 1]]
+
+
+class PrefixIndex:
+    """
+    Answer prefix queries from an index saved by build_index.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        with np.load(path, allow_pickle=False) as arrays:
+            self.keys = Pool(arrays["key_pool"], arrays["key_offsets"])
+            self.names = Pool(arrays["name_pool"], arrays["name_offsets"])
+            self.prefixes = Pool(arrays["prefix_pool"],
+                                 arrays["prefix_offsets"])
+            self.counts = arrays["counts"]
+            self.bitsets = arrays["bitsets"]
+            self.languages = arrays["languages"].tolist()
+            self.top = arrays["top"]
+        self.language_ids = {language: position for position, language in
+                             enumerate(self.languages)}
+
+    def get_range(self, key):
+        """
+        Return the range of positions of the keys that start with key.
+        """
+        low = bisect.bisect_left(self.keys, key)
+        return low, bisect.bisect_left(self.keys, key + END_BYTE, low)
+
+    def get_entry(self, position):
+        """
+        Return the (name, number of people, languages) of a position.
+        """
+        languages = []
+        for word_index, word in enumerate(self.bitsets[position].tolist()):
+            while word:
+                lowest = word & -word
+                languages.append(self.languages[
+                    64 * word_index + lowest.bit_length() - 1])
+                word ^= lowest
+        return (self.names[position].decode("utf-8"),
+                int(self.counts[position]), languages)
+
+    def complete(self, prefix, k=10, language=None):
+        """
+        Return a list of up to k (name, number of people, languages)
+            tuples for the most frequent names that start with prefix
+            (ignoring case and accents), and, if language is given, are
+            used in language.
+        """
+        key = get_key(prefix).encode("utf-8")
+        positions = None
+        if language is None and k <= self.top.shape[1]:
+            found = bisect.bisect_left(self.prefixes, key)
+            if found < len(self.prefixes) and self.prefixes[found] == key:
+                positions = [position for position in self.top[found][:k]
+                             if position >= 0]
+        if positions is None:
+            low, high = self.get_range(key)
+            positions = np.arange(low, high)
+            if language is not None:
+                if language not in self.language_ids:
+                    return []
+                word, bit = divmod(self.language_ids[language], 64)
+                positions = positions[(self.bitsets[low:high, word] >>
+                                       np.uint64(bit)) & np.uint64(1) == 1]
+            order = np.argsort(-self.counts[positions], kind="stable")[:k]
+            positions = positions[order]
+        return [self.get_entry(position) for position in positions]
+
+    def get_size(self):
+        """
+        Return the number of bytes the index takes in memory, not counting
+            the small Python objects around the arrays.
+        """
+        return (len(self.keys.data) + len(self.names.data) +
+                len(self.prefixes.data) + self.counts.nbytes +
+                self.bitsets.nbytes + self.top.nbytes +
+                self.keys.offsets.nbytes + self.names.offsets.nbytes +
+                self.prefixes.offsets.nbytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or query a prefix index of given names.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="build and save the prefix index")
+    build_parser.add_argument("--input", default="name_translations.csv",
+                              help="csv written by name_translations.py")
+    build_parser.add_argument("--output", default=DEFAULT_PATH,
+                              help="path of the index to write")
+
+    query_parser = subparsers.add_parser(
+        "query", help="list the most frequent names with a prefix")
+    query_parser.add_argument("--index", default=DEFAULT_PATH,
+                              help="index written by the build command")
+    query_parser.add_argument("-k", type=int, default=10,
+                              help="number of names to list")
+    query_parser.add_argument("--language",
+                              help="only list names used in a language, "
+                                   "such as French")
+    query_parser.add_argument("prefix")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        count = build_index_from_csv(args.input, args.output)
+        print(f"Saved {count} names to {args.output}.")
+    else:
+        index = PrefixIndex(args.index)
+        for name, count, languages in index.complete(
+                args.prefix, args.k, args.language):
+            print(f"{count:>8}  {name} ({', '.join(languages)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#! python3
+# name_similarity.py
+
+"""
+This program scores how equivalent two names are, using the results of
+    name_translations.py. Where name_clusters.py puts each name in one
+    group, this gives a number for any pair of names.
+
+It builds a sparse (CSR) matrix with a row for each person (each English
+    URL) and a column for each (language, name) pair, holding 1 where the
+    person's page has that name in that language. Multiplying the matrix
+    by its transpose gives the number of people whose pages have both of
+    two names, from which two scores are computed:
+
+        cosine  The co-occurrence count divided by the geometric mean of
+                the two names' counts, from 0 to 1.
+        pmi     The pointwise mutual information of the two names: how
+                much more often they appear together than they would by
+                chance, in nats.
+
+The co-occurrence matrix and the top-k most similar names for every name
+    under both scores are saved to an .npz file, so that queries only
+    look results up:
+
+    python name_similarity.py build --input name_translations.csv \
+        --output name_similarity.npz
+    python name_similarity.py query --index name_similarity.npz \
+        English Henry
+
+or, from Python:
+
+    similarity = name_similarity.NameSimilarity("name_similarity.npz")
+    similarity.similar("English", "Henry", k=10)
+    similarity.score(("English", "Henry"), ("French", "Henri"))
+
+This program needs scipy, which name_translations.py does not.
+"""
+
+# Import libraries.
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Separate the language and the name in a column key. The unit separator
+#   does not appear in Wikipedia titles.
+SEPARATOR = "\x1f"
+
+MEASURES = ["cosine", "pmi"]
+
+
+def build_matrix(path, min_count=2):
+    """
+    Read a csv written by name_translations.py and return the column keys
+        (language and name joined by SEPARATOR) and a persons × names CSR
+        matrix. Names held by fewer than min_count people are left out.
+    """
+    import scipy.sparse
+
+    df = pd.read_csv(path, usecols=["URL", "Language", "Name"], dtype=str,
+                     keep_default_na=False, encoding="utf-8-sig")
+    df = df[df["Name"] != ""]
+    person_ids, persons = pd.factorize(df["URL"])
+    name_ids, keys = pd.factorize(df["Language"] + SEPARATOR + df["Name"])
+    matrix = scipy.sparse.csr_matrix(
+        (np.ones(len(df), dtype=np.float32), (person_ids, name_ids)),
+        shape=(len(persons), len(keys)))
+    # Count a name once per person, even if the page lists it twice.
+    matrix.data[:] = 1
+    counts = np.asarray(matrix.sum(axis=0)).ravel()
+    kept = np.flatnonzero(counts >= min_count)
+    return np.asarray(keys)[kept], matrix[:, kept].tocsr()
+
+
+def get_cooccurrence(matrix):
+    """
+    Return a names × names CSR matrix of the number of people who have
+        both names, without the diagonal, and an array of the number of
+        people who have each name.
+    """
+    cooccurrence = (matrix.T @ matrix).tocsr()
+    counts = cooccurrence.diagonal().astype(np.int64)
+    cooccurrence.setdiag(0)
+    cooccurrence.eliminate_zeros()
+    cooccurrence.data = cooccurrence.data.astype(np.int32)
+    return cooccurrence, counts
+
+
+def get_scores(cooccurrence, counts, person_count, measure):
+    """
+    Return an array of scores under measure for the stored entries of a
+        co-occurrence matrix, in the same order as its data.
+    """
+    rows = np.repeat(np.arange(cooccurrence.shape[0]),
+                     np.diff(cooccurrence.indptr))
+    columns = cooccurrence.indices
+    together = cooccurrence.data.astype(np.float64)
+    if measure == "cosine":
+        return together / np.sqrt(counts[rows] * counts[columns].astype(
+            np.float64))
+    if measure == "pmi":
+        return np.log(together * person_count /
+                      (counts[rows] * counts[columns].astype(np.float64)))
+    raise ValueError(f"Unknown measure: {measure}")
+
+
+def get_top_k(cooccurrence, scores, k):
+    """
+    Return two names × k arrays: the column indices of each name's k
+        highest-scoring names (-1 where a name has fewer than k), and their
+        scores. Ties are broken by co-occurrence count.
+    """
+    row_count = cooccurrence.shape[0]
+    rows = np.repeat(np.arange(row_count), np.diff(cooccurrence.indptr))
+    # Sort the entries by row, then by descending score, then by
+    #   descending count.
+    order = np.lexsort((-cooccurrence.data, -scores, rows))
+    rank = np.arange(len(order)) - cooccurrence.indptr[rows[order]]
+    top = order[rank < k]
+    top_rows = rows[top]
+    top_ranks = rank[rank < k]
+    indices = np.full((row_count, k), -1, dtype=np.int32)
+    values = np.full((row_count, k), np.nan, dtype=np.float32)
+    indices[top_rows, top_ranks] = cooccurrence.indices[top]
+    values[top_rows, top_ranks] = scores[top]
+    return indices, values
+
+
+def build_index(input_path, output_path, k=20, min_count=2):
+    """
+    Build the co-occurrence matrix and the top-k lists from a csv written
+        by name_translations.py and save them to output_path.
+    """
+    keys, matrix = build_matrix(input_path, min_count)
+    cooccurrence, counts = get_cooccurrence(matrix)
+    arrays = {
+        "keys": keys.astype(str),
+        "counts": counts,
+        "person_count": np.array(matrix.shape[0]),
+        "indptr": cooccurrence.indptr,
+        "indices": cooccurrence.indices,
+        "data": cooccurrence.data
+        }
+    for measure in MEASURES:
+        scores = get_scores(cooccurrence, counts, matrix.shape[0], measure)
+        arrays[measure + "_indices"], arrays[measure + "_values"] = \
+            get_top_k(cooccurrence, scores, k)
+    np.savez_compressed(output_path, **arrays)
+    return len(keys), cooccurrence.nnz
+
+
+class NameSimilarity:
+    """
+    Answer similarity queries from an index saved by build_index. Names
+        are given as (language, name) pairs, such as ("French",
+        "Henri").
+    """
+
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as arrays:
+            self.arrays = {key: arrays[key] for key in arrays.files}
+        self.keys = self.arrays["keys"]
+        self.positions = {key: position for position, key in
+                          enumerate(self.keys.tolist())}
+
+    def position(self, language, name):
+        return self.positions.get(language + SEPARATOR + name)
+
+    def similar(self, language, name, k=10, measure="cosine"):
+        """
+        Return a list of up to k ((language, name), score) pairs for the
+            names most similar to name in language.
+        """
+        position = self.position(language, name)
+        if position is None:
+            return []
+        indices = self.arrays[measure + "_indices"][position][:k]
+        values = self.arrays[measure + "_values"][position][:k]
+        return [(tuple(self.keys[index].split(SEPARATOR, 1)), float(value))
+                for index, value in zip(indices, values) if index >= 0]
+
+    def score(self, name_a, name_b, measure="cosine"):
+        """
+        Return the similarity of two (language, name) pairs under
+            measure, or None if they never appear together.
+        """
+        a = self.position(*name_a)
+        b = self.position(*name_b)
+        if a is None or b is None:
+            return None
+        start, end = self.arrays["indptr"][a], self.arrays["indptr"][a + 1]
+        columns = self.arrays["indices"][start:end]
+        found = np.flatnonzero(columns == b)
+        if len(found) == 0:
+            return None
+        together = float(self.arrays["data"][start + found[0]])
+        count_a = float(self.arrays["counts"][a])
+        count_b = float(self.arrays["counts"][b])
+        if measure == "cosine":
+            return together / np.sqrt(count_a * count_b)
+        return float(np.log(together * int(self.arrays["person_count"]) /
+                            (count_a * count_b)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score how equivalent names are.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build", help="build and save the similarity index")
+    build_parser.add_argument("--input", default="name_translations.csv",
+                              help="csv written by name_translations.py")
+    build_parser.add_argument("--output", default="name_similarity.npz",
+                              help="path of the index to write")
+    build_parser.add_argument("-k", type=int, default=20,
+                              help="number of similar names to keep")
+    build_parser.add_argument("--min-count", type=int, default=2,
+                              help="minimum number of people with a name")
+
+    query_parser = subparsers.add_parser(
+        "query", help="list the names most similar to a name")
+    query_parser.add_argument("--index", default="name_similarity.npz",
+                              help="index written by the build command")
+    query_parser.add_argument("-k", type=int, default=10,
+                              help="number of similar names to list")
+    query_parser.add_argument("--measure", choices=MEASURES,
+                              default="cosine")
+    query_parser.add_argument("language")
+    query_parser.add_argument("name")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        names, pairs = build_index(args.input, args.output, args.k,
+                                   args.min_count)
+        print(f"Saved {names} names and {pairs} co-occurring pairs to "
+              f"{args.output}.")
+    else:
+        similarity = NameSimilarity(args.index)
+        for (language, name), value in similarity.similar(
+                args.language, args.name, args.k, args.measure):
+            print(f"{value:8.3f}  {name} ({language})")
+
+
+if __name__ == "__main__":
+    main()
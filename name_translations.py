@@ -6,7 +6,8 @@ This program produces a csv with translations of people's names. It
     scrapes Wikipedia lists that tend to include people who lived in
     ancient, medieval, or early modern times, since their names are more
     likely to be translated than are names of contemporary people. It
-    includes names from the following lists:
+    includes names from the following lists, which are configured in
+    sources.json:
 
         List of Belgian monarchs
         List of Catholic saints
@@ -40,657 +41,792 @@ This program produces a csv with translations of people's names. It
 The program returns some entries for nonhuman entities, but most entries
     are for humans.
 
-This program takes about 25 minutes to run.
+This program takes about 25 minutes to run. To scrape only some of the
+    lists, name them with --source:
+
+    python name_translations.py --source "List of English monarchs"
+
+To get a partial table quickly, give it a budget of person pages or of
+    seconds; the most useful pages are scraped first (see
+    crawl_budget.py):
+
+    python name_translations.py --budget-seconds 120
 """
 
 # Import libraries.
+import argparse
+import hashlib
+import itertools
+import json
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import os
-import pandas as pd
-
-# Create a list of Wikipedia lists in which most links of interest
-#   appear in the first columns of tables.
-urls_first_columns = {
-    "https://en.wikipedia.org/wiki/List_of_Belgian_monarchs":
-        "List of Belgian monarchs",
-    "https://en.wikipedia.org/wiki/List_of_Catholic_saints":
-        "List of Catholic saints",
-    "https://en.wikipedia.org/wiki/List_of_Danish_monarchs":
-        "List of Danish monarchs",
-    "https://en.wikipedia.org/wiki/List_of_English_monarchs":
-        "List of English monarchs",
-    "https://en.wikipedia.org/wiki/List_of_monarchs_of_Georgia":
-        "List of monarchs of Georgia",
-    "https://en.wikipedia.org/wiki/List_of_Norwegian_monarchs":
-        "List of Norwegian monarchs",
-    "https://en.wikipedia.org/wiki/List_of_Portuguese_monarchs":
-        "List of Portuguese monarchs",
-    "https://en.wikipedia.org/wiki/List_of_Roman_women":
-        "List of Roman women",
-    "https://en.wikipedia.org/wiki/List_of_rulers_of_Iceland":
-        "List of rulers of Iceland",
-    "https://en.wikipedia.org/wiki/List_of_rulers_of_Monaco":
-        "List of rulers of Monaco",
-    "https://en.wikipedia.org/wiki/List_of_saints":
-        "List of saints",
-    "https://en.wikipedia.org/wiki/List_of_Spanish_monarchs":
-        "List of Spanish monarchs",
-    "https://en.wikipedia.org/wiki/List_of_sultans_of_the_Ottoman_Empire":
-        "List of sultans of the Ottoman Empire"
-    }
-
-# Create a list of Wikipedia lists in which most links of interest
-#   appear in wikitables, but not consistently in any particular column.
-urls_all_table_links = {
-    "https://en.wikipedia.org/wiki/" +
-        "List_of_Coptic_Orthodox_popes_of_Alexandria":
-        "List of Coptic Orthodox popes of Alexandria",
-    "https://en.wikipedia.org/wiki/List_of_French_monarchs":
-        "List of French monarchs",
-    "https://en.wikipedia.org/wiki/List_of_German_monarchs":
-        "List of German monarchs",
-    "https://en.wikipedia.org/wiki/List_of_popes":
-        "List of popes"
-    }
-
-# Create a list of Wikipedia lists in which most links of interest
-#   appear as the first link in a list item.
-urls_first_li_links = {
-    "https://en.wikipedia.org/wiki/List_of_female_hereditary_rulers":
-        "List of female hereditary rulers",
-    "https://en.wikipedia.org/wiki/List_of_female_mystics":
-        "List of female mystics",
-    "https://en.wikipedia.org/wiki/" +
-        "List_of_female_scientists_before_the_20th_century":
-        "List of female scientists before the 20th century",
-    "https://en.wikipedia.org/wiki/List_of_prostitutes_and_courtesans":
-        "List of prostitutes and courtesans",
-    "https://en.wikipedia.org/wiki/List_of_women_in_the_Bible":
-        "List of women in the Bible",
-    "https://en.wikipedia.org/wiki/List_of_Roman_women":
-        "List of Roman women",
-    "https://en.wikipedia.org/wiki/List_of_Scottish_royal_mistresses":
-        "List of Scottish royal mistresses",
-    "https://en.wikipedia.org/wiki/List_of_Swedish_royal_mistresses":
-        "List of Swedish royal mistresses",
-    "https://en.wikipedia.org/wiki/List_of_women_warriors_in_folklore":
-        "List of women warriors in folklore",
-    "https://en.wikipedia.org/wiki/" +
-        "List_of_women_who_led_a_revolt_or_rebellion":
-        "List of women who led a revolt or rebellion",
-    "https://en.wikipedia.org/wiki/Women_as_theological_figures":
-        "Women as theological figures"
-    }
-
-# Create a list of Wikipedia lists for which it is necessary to get all
-#   links to get items of interest.
-urls_all_links = {
-    "https://en.wikipedia.org/wiki/List_of_major_biblical_figures":
-        "List of major biblical figures"
-    }
-
-
-# Create a list to which to add dictionaries for the English language
-#   pages for all selected list items. The dictionary keys will be the
-#   URLs that will later be scraped for name translations.
-english_dicts = []
-
-# Create a list to which to add dictionaries for pages in any language
-#   for all selected list items. This is what will eventually be written
-#   to a csv file.
-all_dicts = []
-
-# Create a list to which to add hrefs for the English language pages of
-#   all selected list items. Hrefs will serve as unique identifiers for
-#   the list items. This list will be used to avoid duplicate entries.
-#   I'll provide two examples of duplicate entries that this list will
-#   avoid: Æthelred the Unready was a monarch who had two reigns and
-#   thus is listed twice on Wikipedia's "List of English monarchs".
-#   Sweyn Forkbeard was a Danish monarch who controlled England for a
-#   time, and thus is listed both on Wikipedia's "List of English
-#   monarchs" and on its "List of Danish monarchs".
-hrefs = []
-
-# Create a list to which to add dictionaries that include links of
-#   interest and BeautifulSoup result sets for each of the pages listed
-#   above.
-result_sets = []
-
-# Scrape each of the URLs listed in first_column_urls.
-for url_fc in urls_first_columns:
-    url = url_fc
-    res = requests.get(url)
-    data = res.text
-    soup = BeautifulSoup(data, "lxml")
-    # Create a dictionary with the name of the scraped page as the key
-    #   and, as the value, a BeautifulSoup result set created from the
-    #   first columns of the pages tables.
-    result_sets.append({urls_first_columns[url_fc]:
-                            soup.select("table tr td:nth-of-type(1)")})
-
-# Scrape each of the URLs listed in urls_all_table_links.
-for url_tl in urls_all_table_links:
-    url = url_tl
-    res = requests.get(url)
-    data = res.text
-    soup = BeautifulSoup(data, "lxml")
-    # Create a dictionary with the name of the scraped page as the key
-    #   and, as the value, a BeautifulSoup result set of all the page's
-    #   wikitables.
-    result_sets.append({urls_all_table_links[url_tl]:
-                            soup.find_all("table",
-                                          {"class": "wikitable"})})
-
-# Scrape each of the URLs listed in urls_first_li_links.
-for url_li in urls_first_li_links:
-    url = url_li
-    res = requests.get(url)
-    data = res.text
-    soup = BeautifulSoup(data, "lxml")
-    # Create a dictionary with the name of the scraped page as the key
-    #   and, as the value, a BeautifulSoup result set from all first
-    #   links in the page's list items.
-    result_sets.append({urls_first_li_links[url_li]:
-                            soup.select("li a:nth-of-type(1)")})
-
-# Scrape each of the URLs listed in urls_all_links.
-for url_al in urls_all_links:
-    url = url_al
-    res = requests.get(url)
-    data = res.text
-    soup = BeautifulSoup(data, "lxml")
-    # Create a dictionary with the name of the scraped page as the key
-    #   and, as the value, a BeautifulSoup result set from all links on
-    #   the page.
-    result_sets.append({urls_all_links[url_al]:
-                            soup.find_all("a")})
-
-# Get all <a> tags from the result sets in result_sets. For each <a>
-#   tag, add the link and title to a dictionary for the monarch.
-for dict in result_sets:
-    for key in dict:
-        for item in dict[key]:
-            tags = item.find_all("a")
-            for tag in tags:
-                href = tag.get("href")
-                if href not in hrefs:
-                    if href is not None:
-                        if href.startswith("/wiki/"):
-                            if not href.startswith("/wiki/File"):
-                                hrefs.append(href)
-                                title = tag.get("title")
-                                if title is not None:
-                                    # Remove en dashes and following
-                                    #   text from titles. For instance,
-                                    #   if the title is "Alfred le Grand
-                                    #   - French", change it to "Alfred
-                                    #   le Grand".
-                                    en_dash = title.find("–")
-                                    if en_dash > 0:
-                                        title = title[:en_dash-1]
-                                    # Remove parenthetical text from
-                                    #   titles. For instance, if the
-                                    #   title is "Henry Ier (roi
-                                    #   d'Angleterre)", change it to
-                                    #   "Henri Ier".
-                                    paren = title.find("(")
-                                    if paren > 0:
-                                        title = title[:paren-1]
-                                    # Remove commas and following text
-                                    #   from titles. For instance, if
-                                    #   the title is "Vilim I, kralj
-                                    #   Engleske", change it to "Vilim
-                                    #   I".
-                                    comma = title.find(",")
-                                    if comma > 0:
-                                        title = title[:comma]
-                                    # Get the first word of the title.
-                                    space = title.find(" ")
-                                    if space > 0:
-                                        title_first_word = title[:space]
-                                    else:
-                                        title_first_word = title
-                                    # Create a dictionary for the page.
-                                    href = {
-                                        "Name (English)": title_first_word,
-                                        "Full Name (English)": title,
-                                        "URL": "https://en.wikipedia.org" +
-                                            href,
-                                        "Language": "English",
-                                        "Name": title_first_word,
-                                        "Full Name": title,
-                                        "Familiar-ish Script": "Yes",
-                                        "Given Name Usually First": "Yes",
-                                        "Source": key
-                                        }
-                                    # Add the newly-created dictionary
-                                    #   to the lists.
-                                    english_dicts.append(href)
-                                    all_dicts.append(href)
-
-
-
-
-# Create a dictionary of Wikipedia languages. Language codes and names
-#   are taken from https://en.wikipedia.org/wiki/List_of_Wikipedias. For
-#   each language, I have also noted whether the language is written in
-#   a script that I can at least partially make sense of ("fs" for
-#   "familiar script"), and if so, whether, in that language, a person's
-#   given name tends to appear before their surname ("gnf" for "given
-#   name first") in the title of their Wikipedia entry.
-language_tags = {
-    "ab": {"name": "Abkhazian", "fs": "Yes", "gnf": "Yes"},
-    "ace": {"name": "Acehnese", "fs": "Yes", "gnf": "Yes"},
-    "ady": {"name": "Adyghe", "fs": "Yes", "gnf": "Yes"},
-    "af": {"name": "Afrikaans", "fs": "Yes", "gnf": "Yes"},
-    "ak": {"name": "Akan", "fs": "Yes", "gnf": "Yes"},
-    # "als" may not remain the code for Alemannic, as it is the ISO
-    #   639-3 code for Tosk Albanian. "gsw" is in consideration as an
-    #   alternative.
-    "als": {"name": "Alemannic", "fs": "Yes", "gnf": "Yes"},
-    "am": {"name": "Amharic", "fs": "No", "gnf": "idk"},
-    "an": {"name": "Aragonese", "fs": "Yes", "gnf": "Yes"},
-    "ang": {"name": "Anglo-Saxon", "fs": "Yes", "gnf": "Yes"},
-    "ar": {"name": "Arabic", "fs": "Yes", "gnf": "Yes"},
-    "arc": {"name": "Syriac", "fs": "No", "gnf": "idk"},
-    "arz": {"name": "Egyptian Arabic", "fs": "Yes", "gnf": "Yes"},
-    "as": {"name": "Assamese", "fs": "No", "gnf": "idk"},
-    "ast": {"name": "Asturian", "fs": "Yes", "gnf": "Yes"},
-    "atj": {"name": "Atikamekw", "fs": "Yes", "gnf": "Yes"},
-    "av": {"name": "Avar", "fs": "Yes", "gnf": "Yes"},
-    "awa": {"name": "Awadhi", "fs": "No", "gnf": "idk"},
-    "ay": {"name": "Aymara", "fs": "Yes", "gnf": "Yes"},
-    "az": {"name": "Azerbaijani", "fs": "Yes", "gnf": "No"},
-    "azb": {"name": "Southern Azerbaijani", "fs": "Yes", "gnf": "No"},
-    "ba": {"name": "Bashkir", "fs": "Yes", "gnf": "No"},
-    "ban": {"name": "Balinese", "fs": "Yes", "gnf": "Yes"},
-    "bar": {"name": "Bavarian", "fs": "Yes", "gnf": "Yes"},
-    # "bat-smg" is a nonstandard variant of "sgs".
-    "bat-smg": {"name": "Samogitian", "fs": "Yes", "gnf": "Yes"},
-    "bcl": {"name": "Central_Bicolano", "fs": "Yes", "gnf": "No"},
-    "be": {"name": "Belarusian", "fs": "Yes", "gnf": "Yes"},
-    "be-tarask": {
-        "name": "Belarusian (Taraškievica)", "fs": "Yes", "gnf": "Yes"},
-    # "be-x-old" is a nonstandard variant of "be-tarask".
-    "be-x-old": {
-        "name": "Belarusian (Taraškievica)", "fs": "Yes", "gnf": "Yes"},
-    "bg": {"name": "Bulgarian", "fs": "Yes", "gnf": "Yes"},
-    "bh": {"name": "Bhojpuri", "fs": "No", "gnf": "idk"},
-    "bi": {"name": "Bislama", "fs": "Yes", "gnf": "Yes"},
-    "bjn": {"name": "Banjar", "fs": "Yes", "gnf": "Yes"},
-    "bm": {"name": "Bambara", "fs": "Yes", "gnf": "Yes"},
-    "bn": {"name": "Bengali", "fs": "No", "gnf": "idk"},
-    "bo": {"name": "Tibetan", "fs": "No", "gnf": "idk"},
-    "bpy": {"name": "Bishnupriya Manipuri", "fs": "No", "gnf": "idk"},
-    "br": {"name": "Breton", "fs": "Yes", "gnf": "Yes"},
-    "bs": {"name": "Bosnian", "fs": "Yes", "gnf": "Yes"},
-    "bug": {"name": "Buginese", "fs": "Yes", "gnf": "Yes"},
-    "bxr": {"name": "Buryat (Russia)", "fs": "Yes", "gnf": "No"},
-    "ca": {"name": "Catalan", "fs": "Yes", "gnf": "Yes"},
-    # cbk is a nonstandardized code.
-    "cbk": {"name": "Zamboanga Chavacano", "fs": "Yes", "gnf": "Yes"},
-    # "cbk-zam" is a nonstandardized code.
-    "cbk-zam": {"name": "Zamboanga Chavacano", "fs": "Yes", "gnf": "Yes"},
-    "cdo": {"name": "Min Dong", "fs": "Yes", "gnf": "Yes"},
-    "ce": {"name": "Chechen", "fs": "Yes", "gnf": "Yes"},
-    "ceb": {"name": "Cebuano", "fs": "Yes", "gnf": "Yes"},
-    "ch": {"name": "Chamorro", "fs": "Yes", "gnf": "Yes"},
-    "chr": {"name": "Cherokee", "fs": "No", "gnf": "idk"},
-    "chy": {"name": "Cheyenne", "fs": "Yes", "gnf": "Yes"},
-    "ckb": {"name": "Sorani Kurdish", "fs": "Yes", "gnf": "Yes"},
-    "co": {"name": "Corsican", "fs": "Yes", "gnf": "Yes"},
-    "cr": {"name": "Cree", "fs": "Yes", "gnf": "Yes"},
-    "crh": {"name": "Crimean Tatar", "fs": "Yes", "gnf": "No"},
-    "cs": {"name": "Czech", "fs": "Yes", "gnf": "Yes"},
-    "csb": {"name": "Kashubian", "fs": "Yes", "gnf": "Yes"},
-    "cu": {"name": "Old Church Slavonic", "fs": "Yes", "gnf": "Yes"},
-    "cv": {"name": "Chuvash", "fs": "Yes", "gnf": "Yes"},
-    "cy": {"name": "Welsh", "fs": "Yes", "gnf": "Yes"},
-    # "cz" is a nonstandard variant of "cs".
-    "cz": {"name": "Czech", "fs": "Yes", "gnf": "Yes"},
-    "da": {"name": "Danish", "fs": "Yes", "gnf": "Yes"},
-    "de": {"name": "German", "fs": "Yes", "gnf": "Yes"},
-    "din": {"name": "Dinka", "fs": "Yes", "gnf": "Yes"},
-    "diq": {"name": "Zazaki", "fs": "Yes", "gnf": "Yes"},
-    # "dk" is a nonstandard variant of "da".
-    "dk": {"name": "Danish", "fs": "Yes", "gnf": "Yes"},
-    "dsb": {"name": "Lower Sorbian", "fs": "Yes", "gnf": "Yes"},
-    "dty": {"name": "Doteli", "fs": "No", "gnf": "idk"},
-    "dv": {"name": "Divehi", "fs": "No", "gnf": "idk"},
-    "dz": {"name": "Dzongkha", "fs": "No", "gnf": "idk"},
-    "ee": {"name": "Ewe", "fs": "Yes", "gnf": "Yes"},
-    "el": {"name": "Greek", "fs": "Yes", "gnf": "Yes"},
-    "eml": {"name": "Emilian-Romagnol", "fs": "Yes", "gnf": "Yes"},
-    "en": {"name": "English", "fs": "Yes", "gnf": "Yes"},
-    "en-simple": {"name": "Simple English", "fs": "Yes", "gnf": "Yes"},
-    "eo": {"name": "Esperanto", "fs": "Yes", "gnf": "Yes"},
-    "es": {"name": "Spanish", "fs": "Yes", "gnf": "Yes"},
-    "et": {"name": "Estonian", "fs": "Yes", "gnf": "Yes"},
-    "eu": {"name": "Basque", "fs": "Yes", "gnf": "Yes"},
-    "ext": {"name": "Extremaduran", "fs": "Yes", "gnf": "Yes"},
-    "fa": {"name": "Persian", "fs": "Yes", "gnf": "Yes"},
-    "ff": {"name": "Fula", "fs": "Yes", "gnf": "Yes"},
-    "fi": {"name": "Finnish", "fs": "Yes", "gnf": "Yes"},
-    # "fiu" is a nonstandard variant of "vro".
-    "fiu": {"name": "Võro", "fs": "Yes", "gnf": "Yes"},
-    # "fiu-vro" is a nonstandard variant of "vro".
-    "fiu-vro": {"name": "Võro", "fs": "Yes", "gnf": "Yes"},
-    "fj": {"name": "Fijian", "fs": "Yes", "gnf": "Yes"},
-    "fo": {"name": "Faroese", "fs": "Yes", "gnf": "Yes"},
-    "fr": {"name": "French", "fs": "Yes", "gnf": "Yes"},
-    "frp": {"name": "Franco-Provençal/Arpitan", "fs": "Yes", "gnf": "Yes"},
-    "frr": {"name": "North Frisian", "fs": "Yes", "gnf": "Yes"},
-    "fur": {"name": "Friulian", "fs": "Yes", "gnf": "No"},
-    "fy": {"name": "West Frisian", "fs": "Yes", "gnf": "Yes"},
-    "ga": {"name": "Irish", "fs": "Yes", "gnf": "Yes"},
-    "gag": {"name": "Gagauz", "fs": "Yes", "gnf": "Yes"},
-    "gan": {"name": "Gan Chinese", "fs": "No", "gnf": "idk"},
-    "gcr": {"name": "Guianan Creole", "fs": "Yes", "gnf": "Yes"},
-    "gd": {"name": "Scottish Gaelic", "fs": "Yes", "gnf": "Yes"},
-    "gl": {"name": "Galician", "fs": "Yes", "gnf": "Yes"},
-    "glk": {"name": "Gilaki", "fs": "Yes", "gnf": "Yes"},
-    "gn": {"name": "Guarani", "fs": "Yes", "gnf": "Yes"},
-    "gom": {"name": "Konkani", "fs": "Yes", "gnf": "No"},
-    "gor": {"name": "Gorontalo", "fs": "Yes", "gnf": "Yes"},
-    "got": {"name": "Gothic", "fs": "No", "gnf": "idk"},
-    # "gsw" is not the official code for Alemannic, but it is in
-    #   consideration to replace the currently used "als", since "als"
-    #   is the ISO 639-3 code for Tosk Albanian.
-    "gsw": {"name": "Alemannic", "fs": "Yes", "gnf": "Yes"},
-    "gu": {"name": "Gujarati", "fs": "No", "gnf": "idk"},
-    "gu": {"name": "Gujarati", "fs": "No", "gnf": "idk"},
-    "gv": {"name": "Manx", "fs": "Yes", "gnf": "Yes"},
-    "ha": {"name": "Hausa", "fs": "Yes", "gnf": "Yes"},
-    "hak": {"name": "Hakka", "fs": "Yes", "gnf": "Yes"},
-    "haw": {"name": "Hawaiian", "fs": "Yes", "gnf": "Yes"},
-    "he": {"name": "Hebrew", "fs": "No", "gnf": "idk"},
-    "hi": {"name": "Hindi", "fs": "No", "gnf": "idk"},
-    "hif": {"name": "Fiji Hindi", "fs": "Yes", "gnf": "Yes"},
-    "hr": {"name": "Croatian", "fs": "Yes", "gnf": "Yes"},
-    "hsb": {"name": "Upper Sorbian", "fs": "Yes", "gnf": "Yes"},
-    "ht": {"name": "Haitian", "fs": "Yes", "gnf": "Yes"},
-    "hu": {"name": "Hungarian", "fs": "Yes", "gnf": "No"},
-    "hy": {"name": "Armenian", "fs": "No", "gnf": "idk"},
-    "hyw": {"name": "Western Armenian", "fs": "No", "gnf": "idk"},
-    "ia": {"name": "Interlingua", "fs": "Yes", "gnf": "Yes"},
-    "id": {"name": "Indonesian", "fs": "Yes", "gnf": "Yes"},
-    "ie": {"name": "Interlingue", "fs": "Yes", "gnf": "Yes"},
-    "ig": {"name": "Igbo", "fs": "Yes", "gnf": "Yes"},
-    "ik": {"name": "Inupiak", "fs": "Yes", "gnf": "Yes"},
-    "ilo": {"name": "Ilokano", "fs": "Yes", "gnf": "Yes"},
-    "inh": {"name": "Ingush", "fs": "Yes", "gnf": "No"},
-    "io": {"name": "Ido", "fs": "Yes", "gnf": "Yes"},
-    "is": {"name": "Icelandic", "fs": "Yes", "gnf": "Yes"},
-    "it": {"name": "Italian", "fs": "Yes", "gnf": "Yes"},
-    "iu": {"name": "Inuktitut", "fs": "No", "gnf": "idk"},
-    "ja": {"name": "Japanese", "fs": "No", "gnf": "idk"},
-    "jam": {"name": "Jamaican", "fs": "Yes", "gnf": "Yes"},
-    "jbo": {"name": "Lojban", "fs": "Yes", "gnf": "No"},
-    "jv": {"name": "Javanese", "fs": "Yes", "gnf": "Yes"},
-    "ka": {"name": "Georgian", "fs": "No", "gnf": "idk"},
-    "kaa": {"name": "Karakalpak", "fs": "Yes", "gnf": "Yes"},
-    "kab": {"name": "Kabyle", "fs": "Yes", "gnf": "Yes"},
-    "kbd": {"name": "Kabardian", "fs": "Yes", "gnf": "Yes"},
-    "kbp": {"name": "Kabiye", "fs": "Yes", "gnf": "Yes"},
-    "kg": {"name": "Kongo", "fs": "Yes", "gnf": "Yes"},
-    "ki": {"name": "Kikuyu", "fs": "Yes", "gnf": "Yes"},
-    "kk": {"name": "Kazakh", "fs": "Yes", "gnf": "No"},
-    "kl": {"name": "Greenlandic", "fs": "Yes", "gnf": "Yes"},
-    "km": {"name": "Khmer", "fs": "No", "gnf": "idk"},
-    "kn": {"name": "Kannada language", "fs": "No", "gnf": "idk"},
-    "ko": {"name": "Korean", "fs": "No", "gnf": "idk"},
-    "koi": {"name": "Komi-Permyak", "fs": "Yes", "gnf": "No"},
-    "krc": {"name": "Karachay-Balkar", "fs": "Yes", "gnf": "Yes"},
-    "ks": {"name": "Kashmiri", "fs": "No", "gnf": "idk"},
-    # There may be some issue with the code "ksh".
-    "ksh": {"name": "Ripuarian", "fs": "Yes", "gnf": "Yes"},
-    "ku": {"name": "Kurdish (Kurmanji)", "fs": "Yes", "gnf": "Yes"},
-    "kv": {"name": "Komi", "fs": "Yes", "gnf": "No"},
-    "kw": {"name": "Cornish", "fs": "Yes", "gnf": "Yes"},
-    "ky": {"name": "Kyrgyz", "fs": "Yes", "gnf": "Yes"},
-    "la": {"name": "Latin", "fs": "Yes", "gnf": "Yes"},
-    "lad": {"name": "Ladino", "fs": "Yes", "gnf": "Yes"},
-    "lb": {"name": "Luxembourgish", "fs": "Yes", "gnf": "Yes"},
-    "lbe": {"name": "Lak", "fs": "Yes", "gnf": "Yes"},
-    "lez": {"name": "Lezgian", "fs": "Yes", "gnf": "No"},
-    "lfn": {"name": "Lingua Franca Nova", "fs": "Yes", "gnf": "Yes"},
-    "lg": {"name": "Luganda", "fs": "Yes", "gnf": "Yes"},
-    "li": {"name": "Limburgish", "fs": "Yes", "gnf": "Yes"},
-    "lij": {"name": "Ligurian", "fs": "Yes", "gnf": "Yes"},
-    "lmo": {"name": "Lombard", "fs": "Yes", "gnf": "Yes"},
-    "ln": {"name": "Lingala", "fs": "Yes", "gnf": "Yes"},
-    "lo": {"name": "Lao", "fs": "No", "gnf": "idk"},
-    "lrc": {"name": "Northern Luri", "fs": "Yes", "gnf": "Yes"},
-    "lt": {"name": "Lithuanian", "fs": "Yes", "gnf": "Yes"},
-    "ltg": {"name": "Latgalian", "fs": "Yes", "gnf": "Yes"},
-    "lv": {"name": "Latvian", "fs": "Yes", "gnf": "Yes"},
-    "lzh": {"name": "Classical Chinese", "fs": "No", "gnf": "idk"},
-    "mai": {"name": "Maithili", "fs": "No", "gnf": "idk"},
-    # "map" is a nonstandardized code.
-    "map": {"name": "Banyumasan", "fs": "Yes", "gnf": "Yes"},
-    # "map-bms" is a nonstandardized code.
-    "map-bms": {"name": "Banyumasan", "fs": "Yes", "gnf": "Yes"},
-    "mdf": {"name": "Moksha", "fs": "Yes", "gnf": "No"},
-    "mg": {"name": "Malagasy", "fs": "Yes", "gnf": "Yes"},
-    "mhr": {"name": "Meadow Mari", "fs": "Yes", "gnf": "No"},
-    "mi": {"name": "Māori", "fs": "Yes", "gnf": "Yes"},
-    "min": {"name": "Minangkabau", "fs": "Yes", "gnf": "Yes"},
-    "mk": {"name": "Macedonian", "fs": "Yes", "gnf": "Yes"},
-    "ml": {"name": "Malayalam", "fs": "No", "gnf": "idk"},
-    "mn": {"name": "Mongolian", "fs": "Yes", "gnf": "No"},
-    "mnw": {"name": "Mon", "fs": "No", "gnf": "idk"},
-    # "mo" is a nonstandard variant of "ro".
-    "mo": {"name": "Romanian", "fs": "Yes", "gnf": "Yes"},
-    "mr": {"name": "Marathi", "fs": "No", "gnf": "idk"},
-    "mrj": {"name": "Hill Mari", "fs": "Yes", "gnf": "No"},
-    "ms": {"name": "Malay", "fs": "Yes", "gnf": "Yes"},
-    "mt": {"name": "Maltese", "fs": "Yes", "gnf": "Yes"},
-    "mwl": {"name": "Mirandese", "fs": "Yes", "gnf": "Yes"},
-    "my": {"name": "Burmese", "fs": "No", "gnf": "idk"},
-    "myv": {"name": "Erzya", "fs": "Yes", "gnf": "No"},
-    "mzn": {"name": "Mazandarani", "fs": "Yes", "gnf": "Yes"},
-    "na": {"name": "Nauruan", "fs": "Yes", "gnf": "Yes"},
-    "nah": {"name": "Nāhuatl", "fs": "Yes", "gnf": "No"},
-    "nan": {"name": "Min Nan", "fs": "Yes", "gnf": "Yes"},
-    "nap": {"name": "Neapolitan", "fs": "Yes", "gnf": "Yes"},
-    # "nb" is a nonstandard variant of "no".
-    "nb": {"name": "Norwegian (Bokmål)", "fs": "Yes", "gnf": "Yes"},
-    # "nds" is sometimes incorrectly used to refer to Dutch Low Saxon
-    #   ("nds-NL").
-    "nds": {"name": "Low Saxon", "fs": "Yes", "gnf": "Yes"},
-    # "nds-nl" and "nds-NL" refer to the same language.
-    "nds-nl": {"name": "Dutch Low Saxon", "fs": "Yes", "gnf": "Yes"},
-    "nds-NL": {"name": "Dutch Low Saxon", "fs": "Yes", "gnf": "Yes"},
-    "ne": {"name": "Nepali", "fs": "No", "gnf": "idk"},
-    "new": {"name": "Newar / Nepal Bhasa", "fs": "No", "gnf": "idk"},
-    "nl": {"name": "Dutch", "fs": "Yes", "gnf": "Yes"},
-    "nn": {"name": "Norwegian (Nynorsk)", "fs": "Yes", "gnf": "Yes"},
-    "no": {"name": "Norwegian (Bokmål)", "fs": "Yes", "gnf": "Yes"},
-    "nov": {"name": "Novial", "fs": "Yes", "gnf": "Yes"},
-    "nqo": {"name": "N'Ko", "fs": "No", "gnf": "idk"},
-    "nrf": {"name": "Norman", "fs": "Yes", "gnf": "Yes"},
-    # "nrm" is a nonstandard variant of "nrf".
-    "nrm": {"name": "Norman", "fs": "Yes", "gnf": "Yes"},
-    "nso": {"name": "Northern Sotho", "fs": "Yes", "gnf": "Yes"},
-    "nv": {"name": "Navajo", "fs": "Yes", "gnf": "No"},
-    "ny": {"name": "Chichewa", "fs": "Yes", "gnf": "Yes"},
-    "oc": {"name": "Occitan", "fs": "Yes", "gnf": "Yes"},
-    "olo": {"name": "Livvi-Karelian", "fs": "Yes", "gnf": "Yes"},
-    "om": {"name": "Oromo", "fs": "Yes", "gnf": "Yes"},
-    "or": {"name": "Odia", "fs": "No", "gnf": "idk"},
-    "os": {"name": "Ossetian", "fs": "Yes", "gnf": "Yes"},
-    "pa": {"name": "Eastern Punjabi", "fs": "No", "gnf": "idk"},
-    "pag": {"name": "Pangasinan", "fs": "Yes", "gnf": "Yes"},
-    "pam": {"name": "Kapampangan", "fs": "Yes", "gnf": "Yes"},
-    "pap": {"name": "Papiamentu", "fs": "Yes", "gnf": "Yes"},
-    "pcd": {"name": "Picard", "fs": "Yes", "gnf": "No"},
-    "pdc": {"name": "Pennsylvania German", "fs": "Yes", "gnf": "Yes"},
-    "pfl": {"name": "Palatine German", "fs": "Yes", "gnf": "Yes"},
-    "pi": {"name": "Pali", "fs": "No", "gnf": "idk"},
-    "pih": {"name": "Norfolk", "fs": "Yes", "gnf": "Yes"},
-    "pl": {"name": "Polish", "fs": "Yes", "gnf": "Yes"},
-    "pms": {"name": "Piedmontese", "fs": "Yes", "gnf": "Yes"},
-    "pnb": {"name": "Western Punjabi", "fs": "Yes", "gnf": "Yes"},
-    "pnt": {"name": "Pontic", "fs": "Yes", "gnf": "Yes"},
-    "ps": {"name": "Pashto", "fs": "Yes", "gnf": "No"},
-    "pt": {"name": "Portuguese", "fs": "Yes", "gnf": "Yes"},
-    "qu": {"name": "Quechua", "fs": "Yes", "gnf": "Yes"},
-    "rm": {"name": "Romansh", "fs": "Yes", "gnf": "Yes"},
-    "rmy": {"name": "Vlax Romani", "fs": "Yes", "gnf": "Yes"},
-    "rn": {"name": "Kirundi", "fs": "Yes", "gnf": "Yes"},
-    "ro": {"name": "Romanian", "fs": "Yes", "gnf": "Yes"},
-    # "roa" is a nonstandard variant of "rup".
-    "roa": {"name": "Aromanian", "fs": "Yes", "gnf": "Yes"},
-    # "roa-rup" is a nonstandard variant of "rup".
-    "roa-rup": {"name": "Aromanian", "fs": "Yes", "gnf": "Yes"},
-    # "roa-tara" is a nonstandardized code.
-    "roa-tara": {"name": "Tarantino", "fs": "Yes", "gnf": "Yes"},
-    "ru": {"name": "Russian", "fs": "Yes", "gnf": "Yes"},
-    "rue": {"name": "Rusyn", "fs": "Yes", "gnf": "Yes"},
-    "rup": {"name": "Aromanian", "fs": "Yes", "gnf": "Yes"},
-    "rw": {"name": "Kinyarwanda", "fs": "Yes", "gnf": "Yes"},
-    "sa": {"name": "Sanskrit", "fs": "No", "gnf": "idk"},
-    "sah": {"name": "Sakha", "fs": "Yes", "gnf": "No"},
-    "sat": {"name": "Santali", "fs": "No", "gnf": "idk"},
-    "sc": {"name": "Sardinian", "fs": "Yes", "gnf": "Yes"},
-    "scn": {"name": "Sicilian", "fs": "Yes", "gnf": "Yes"},
-    "sco": {"name": "Scots", "fs": "Yes", "gnf": "Yes"},
-    "sd": {"name": "Sindhi", "fs": "Yes", "gnf": "Yes"},
-    "se": {"name": "Northern Sami", "fs": "Yes", "gnf": "Yes"},
-    "sg": {"name": "Sango", "fs": "Yes", "gnf": "Yes"},
-    "sgs": {"name": "Samogitian", "fs": "Yes", "gnf": "Yes"},
-    "sh": {"name": "Serbo-Croatian", "fs": "Yes", "gnf": "Yes"},
-    "shn": {"name": "Shan", "fs": "No", "gnf": "idk"},
-    "si": {"name": "Sinhalese", "fs": "No", "gnf": "idk"},
-    # "simple" is a nonstandard variant of "en-simple".
-    "simple": {"name": "Simple English", "fs": "Yes", "gnf": "Yes"},
-    "sk": {"name": "Slovak", "fs": "Yes", "gnf": "Yes"},
-    "sl": {"name": "Slovene", "fs": "Yes", "gnf": "Yes"},
-    "sm": {"name": "Samoan", "fs": "Yes", "gnf": "Yes"},
-    "sn": {"name": "Shona", "fs": "Yes", "gnf": "Yes"},
-    "so": {"name": "Somali", "fs": "Yes", "gnf": "Yes"},
-    "sq": {"name": "Albanian", "fs": "Yes", "gnf": "Yes"},
-    "sr": {"name": "Serbian", "fs": "Yes", "gnf": "Yes"},
-    "srn": {"name": "Sranan Tongo", "fs": "Yes", "gnf": "Yes"},
-    "ss": {"name": "Swati", "fs": "Yes", "gnf": "No"},
-    "st": {"name": "Sesotho", "fs": "Yes", "gnf": "Yes"},
-    "stq": {"name": "Saterland Frisian", "fs": "Yes", "gnf": "Yes"},
-    "su": {"name": "Sundanese", "fs": "Yes", "gnf": "Yes"},
-    "sv": {"name": "Swedish", "fs": "Yes", "gnf": "Yes"},
-    "sw": {"name": "Swahili", "fs": "Yes", "gnf": "Yes"},
-    "szl": {"name": "Silesian", "fs": "Yes", "gnf": "Yes"},
-    "szy": {"name": "Sakizaya", "fs": "Yes", "gnf": "Yes"},
-    "ta": {"name": "Tamil", "fs": "No", "gnf": "idk"},
-    "tcy": {"name": "Tulu", "fs": "No", "gnf": "idk"},
-    "te": {"name": "Telugu language", "fs": "No", "gnf": "idk"},
-    "tet": {"name": "Tetum", "fs": "Yes", "gnf": "Yes"},
-    "tg": {"name": "Tajik", "fs": "Yes", "gnf": "Yes"},
-    "th": {"name": "Thai", "fs": "No", "gnf": "idk"},
-    "ti": {"name": "Tigrinya", "fs": "No", "gnf": "idk"},
-    "tk": {"name": "Turkmen", "fs": "Yes", "gnf": "Yes"},
-    "tl": {"name": "Tagalog", "fs": "Yes", "gnf": "Yes"},
-    "tn": {"name": "Tswana", "fs": "Yes", "gnf": "Yes"},
-    "to": {"name": "Tongan", "fs": "Yes", "gnf": "Yes"},
-    "tpi": {"name": "Tok Pisin", "fs": "Yes", "gnf": "Yes"},
-    "tr": {"name": "Turkish", "fs": "Yes", "gnf": "No"},
-    "ts": {"name": "Tsonga", "fs": "Yes", "gnf": "Yes"},
-    "tt": {"name": "Tatar", "fs": "Yes", "gnf": "No"},
-    "tum": {"name": "Tumbuka", "fs": "Yes", "gnf": "Yes"},
-    "tw": {"name": "Twi", "fs": "Yes", "gnf": "Yes"},
-    "ty": {"name": "Tahitian", "fs": "Yes", "gnf": "Yes"},
-    "tyv": {"name": "Tuvan", "fs": "Yes", "gnf": "Yes"},
-    "udm": {"name": "Udmurt", "fs": "Yes", "gnf": "No"},
-    "ug": {"name": "Uyghur", "fs": "Yes", "gnf": "Yes"},
-    "uk": {"name": "Ukrainian", "fs": "Yes", "gnf": "Yes"},
-    "ur": {"name": "Urdu", "fs": "Yes", "gnf": "Yes"},
-    "uz": {"name": "Uzbek", "fs": "Yes", "gnf": "No"},
-    "ve": {"name": "Venda", "fs": "Yes", "gnf": "Yes"},
-    "vec": {"name": "Venetian", "fs": "Yes", "gnf": "Yes"},
-    "vep": {"name": "Veps", "fs": "Yes", "gnf": "Yes"},
-    "vi": {"name": "Vietnamese", "fs": "Yes", "gnf": "Yes"},
-    "vls": {"name": "West Flemish", "fs": "Yes", "gnf": "Yes"},
-    "vo": {"name": "Volapük", "fs": "Yes", "gnf": "Yes"},
-    "vro": {"name": "Võro", "fs": "Yes", "gnf": "Yes"},
-    "wa": {"name": "Walloon", "fs": "Yes", "gnf": "Yes"},
-    "war": {"name": "Waray", "fs": "Yes", "gnf": "Yes"},
-    "wo": {"name": "Wolof", "fs": "Yes", "gnf": "Yes"},
-    "wuu": {"name": "Wu", "fs": "No", "gnf": "idk"},
-    "xal": {"name": "Kalmyk", "fs": "Yes", "gnf": "No"},
-    "xh": {"name": "Xhosa", "fs": "Yes", "gnf": "Yes"},
-    "xmf": {"name": "Mingrelian", "fs": "No", "gnf": "idk"},
-    "yi": {"name": "Yiddish", "fs": "No", "gnf": "idk"},
-    "yo": {"name": "Yoruba", "fs": "Yes", "gnf": "Yes"},
-    "yue": {"name": "Cantonese", "fs": "No", "gnf": "idk"},
-    "za": {"name": "Zhuang", "fs": "Yes", "gnf": "Yes"},
-    "zea": {"name": "Zealandic", "fs": "Yes", "gnf": "Yes"},
-    "zh": {"name": "Chinese", "fs": "No", "gnf": "idk"},
-    # "zh-classical" is a nonstandard variant of "lzh".
-    "zh-classical": {"name": "Classical Chinese", "fs": "No",
-                     "gnf": "idk"},
-    # "zh-min-nan" is a nonstandard variant of "nan".
-    "zh-min-nan": {"name": "Min Nan", "fs": "Yes", "gnf": "Yes"},
-    # "zh-yue" is a nonstandard variant of "yue".
-    "zh-yue": {"name": "Cantonese", "fs": "No", "gnf": "idk"},
-    "zu": {"name": "Zulu", "fs": "Yes", "gnf": "Yes"}
-    }
-
-for english_dict in english_dicts:
-    # Scrape each URL added above.
-    url = english_dict["URL"]
-    res = requests.get(url)
-    data = res.text
-    soup = BeautifulSoup(data, "lxml")
-    # Find all <a> tags for interlanguage links.
-    tags = soup.find_all("a", {"class": "interlanguage-link-target"})
+from urllib.parse import urlsplit
+
+import compressed_files
+import dead_letters
+import derive_names
+import frontier_pruning
+import output_writers
+import source_registry
+import stage_profiler
+from page_urls import canonical_url
+
+# Read the Wikipedia lists to scrape, and the ways in which links of
+#   interest are selected from them ("extraction styles"), from
+#   sources.json.
+extraction_styles, list_sources = source_registry.load_config()
+
+ENGLISH_HOST = "en.wikipedia.org"
+
+# Compile the XPath expressions that find the interlanguage links and the
+#   Wikidata item link on a person page.
+INTERLANGUAGE_LINKS = etree.XPath(
+    "//a[contains(concat(' ', normalize-space(@class), ' '), "
+    "' interlanguage-link-target ')]")
+WIKIDATA_LINKS = etree.XPath("//li[@id='t-wikibase']//a/@href")
+
+# Set the address of a wiki's site information, with the names and aliases
+#   of its namespaces.
+SITEINFO_URL = ("https://{host}/w/api.php?action=query&meta=siteinfo"
+                "&siprop=namespaces%7Cnamespacealiases&format=json"
+                "&formatversion=2")
+
+# Set the number of person pages whose names are derived at a time.
+DERIVE_BATCH_SIZE = 100
+
+
+def get_list_sources(names=None):
+    """
+    Return a list of (URL, name, extraction style) tuples for the
+        Wikipedia lists in sources.json (or only those with the given
+        names), in the order in which they are scraped.
+    """
+    if names:
+        return source_registry.select_sources(list_sources, names)
+    return list(list_sources)
+
+
+def get_cache_path(url, cache_dir):
+    """
+    Return the path at which the page at url is cached in cache_dir.
+    """
+    return os.path.join(cache_dir,
+                        hashlib.sha1(url.encode("utf-8")).hexdigest() +
+                        ".html")
+
+
+def get_page(url, cache_dir=None, archive=None, metadata=None):
+    """
+    Return the text of the page at url. If cache_dir is given, the page
+        is read from the cache if it has been scraped before, and saved
+        to the cache otherwise. If archive (a page_archive.PageArchive)
+        is given, the page is recorded in it along with a dictionary of
+        metadata.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = get_cache_path(url, cache_dir)
+    if cache_path is not None and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as cache_file:
+            data = cache_file.read()
+        status, elapsed = "cache", 0
+    else:
+        response = requests.get(url)
+        data = response.text
+        status = response.status_code
+        elapsed = response.elapsed.total_seconds()
+        if cache_path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as cache_file:
+                cache_file.write(data)
+    if archive is not None:
+        archive.record(url, data, {**(metadata or {}), "status": status,
+                                   "elapsed": elapsed})
+    return data
+
+
+def is_file_link(href, namespaces=None):
+    """
+    Return whether an href links to a file, such as "/wiki/File:Seal.svg"
+        or, on a wiki whose namespaces (see frontier_pruning.py) are
+        given, "/wiki/Fichier:Blason.svg".
+    """
+    if href.startswith("/wiki/File"):
+        return True
+    if not namespaces:
+        return False
+    prefix = frontier_pruning.get_namespace(
+        frontier_pruning.get_page_title(href), namespaces)
+    return (prefix is not None and namespaces.get(prefix.lower()) ==
+            frontier_pruning.FILE_NAMESPACE)
+
+
+def extract_links(tags, namespaces=None):
+    """
+    Return a list of (href, title) tuples for the <a> tags in a list of
+        lxml elements that link to other Wikipedia articles, leaving out
+        links to files in any of namespaces, the namespaces of the page's
+        wiki. The tuples hold plain strings, so they keep no reference to
+        the page's parse tree.
+    """
+    links = []
     for tag in tags:
-        try:
-            title = tag["title"]
-            if title is not None:
-                # Remove en dashes and following text from titles. For
-                #   instance, if the title is "Alfred le Grand –
-                #   French", change it to "Alfred le Grand".
-                en_dash = title.find("–")
-                if en_dash > 0:
-                    title = title[:en_dash-1]
-                # Remove parenthetical text from titles. For instance,
-                #   if the title is "Henri Ier (roi d'Angleterre)",
-                #   change it to "Henri Ier".
-                paren = title.find("(")
-                if paren > 0:
-                    title = title[:paren-1]
-                # Remove commas and following text from titles. For
-                #   instance, if the title is "Vilim I, kralj Engleske",
-                #   change it to "Vilim I".
-                comma = title.find(",")
-                if comma > 0:
-                    title = title[:comma]
-                # Get the first word of the title.
-                space = title.find(" ")
-                if space > 0:
-                    first_word = title[:space]
-                else:
-                    first_word = title
-                all_dicts.append({
-                    "Name (English)": english_dict["Name (English)"],
-                    "Full Name (English)": english_dict[
-                        "Full Name (English)"],
-                    "URL": english_dict["URL"],
-                    "Language": language_tags[tag["lang"]]["name"],
-                    "Name": first_word,
-                    "Full Name": title,
-                    "Familiar-ish Script": language_tags[
-                        tag["lang"]]["fs"],
-                    "Given Name Usually First": language_tags[
-                        tag["lang"]]["gnf"],
-                    "Source": english_dict["Source"]
+        href = tag.get("href")
+        if href is not None:
+            if href.startswith("/wiki/"):
+                if not is_file_link(href, namespaces):
+                    title = tag.get("title")
+                    if title is not None:
+                        title = str(title)
+                    links.append((str(href), title))
+    return links
+
+
+def extract_list_links(data, styles, namespaces=None):
+    """
+    Parse the html of a list page and return a dictionary from each
+        extraction style in styles to a list of (href, title) tuples for
+        the links of interest that the style selects. namespaces are the
+        namespaces of the page's wiki (see get_namespaces).
+    """
+    # Parse with lxml alone, which builds the tree in C. The tree is
+    #   freed as soon as it goes out of scope.
+    root = lxml.html.document_fromstring(data)
+    links = {}
+    for style in styles:
+        links[style] = extract_links(extraction_styles[style](root),
+                                     namespaces)
+    return links
+
+
+def get_list_styles(list_sources):
+    """
+    Return a dictionary from the URL of each list in list_sources to a
+        list of the extraction styles under which it is listed, in the
+        order in which the lists are first given.
+    """
+    list_styles = {}
+    for url, name, style in list_sources:
+        list_styles.setdefault(url, []).append(style)
+    return list_styles
+
+
+def get_wiki_language(url):
+    """
+    Return the language code of the wiki of a URL, such as "fr" for
+        "https://fr.wikipedia.org/wiki/Henri_IV".
+    """
+    return urlsplit(url).netloc.split(".")[0].lower()
+
+
+def get_siteinfo_url(url):
+    """
+    Return the address of the site information of the wiki of url, or
+        None for the English language wiki, whose namespaces
+        frontier_pruning.py knows.
+    """
+    host = urlsplit(url).netloc.lower()
+    if host == ENGLISH_HOST:
+        return None
+    return SITEINFO_URL.format(host=host)
+
+
+def get_namespaces(url, cache_dir=None, archive=None):
+    """
+    Return a dictionary from the lowercased names and aliases of the
+        namespaces of the wiki of url to their IDs, read from the wiki's
+        site information (see frontier_pruning.parse_siteinfo). It is
+        empty for the English language wiki, or if the site information
+        cannot be read, in which case only the English names, which
+        every wiki accepts, are recognised.
+    """
+    siteinfo_url = get_siteinfo_url(url)
+    if siteinfo_url is None:
+        return {}
+    try:
+        return frontier_pruning.parse_siteinfo(get_page(
+            siteinfo_url, cache_dir, archive, {"kind": "siteinfo"}))
+    except Exception:
+        # Fall back on the English names rather than fail the list, for
+        #   instance when the wiki cannot be reached or when replaying an
+        #   archive recorded without its site information.
+        return {}
+
+
+def get_wiki_namespaces(candidate_links, cache_dir=None, archive=None):
+    """
+    Return a dictionary from the host of each wiki other than the English
+        language one that a (list name, href, title) tuple in
+        candidate_links links to, to its namespaces (see get_namespaces),
+        for frontier_pruning.prune_links.
+    """
+    namespaces = {}
+    for key, href, title in candidate_links:
+        host = urlsplit(href).netloc.lower()
+        if host and host not in namespaces:
+            namespaces[host] = get_namespaces(href, cache_dir, archive)
+    return namespaces
+
+
+def resolve_links(list_url, links):
+    """
+    Return a list's (href, title) tuples with the hrefs of lists on wikis
+        other than the English language one made absolute, so that they
+        can be told apart from English language hrefs.
+    """
+    host = urlsplit(list_url).netloc.lower()
+    if host == ENGLISH_HOST:
+        return links
+    return [("https://" + host + href, title) for href, title in links]
+
+
+def get_candidate_links(list_sources=None, cache_dir=None, archive=None,
+                        letters=None):
+    """
+    Scrape each of the Wikipedia lists in list_sources (by default, all
+        of the lists above) and yield a (list name, href, title) tuple
+        for each link of interest, in the order in which the lists are
+        given.
+
+    Each page is parsed, its links are extracted for every extraction
+        style under which it is listed, and its parse tree is freed
+        before the next page is scraped, so only one page's parse tree is
+        in memory at a time. A list that appears under more than one
+        extraction style (for instance, "List of Roman women") is only
+        scraped once. The links to files on lists on other wikis are
+        recognised by the names of those wikis' namespaces.
+
+    If letters (a dead_letters.DeadLetters) is given, a list that
+        cannot be scraped is recorded there (and in archive, if it is
+        given) and skipped. Otherwise, the error is raised.
+    """
+    if list_sources is None:
+        list_sources = get_list_sources()
+    list_styles = get_list_styles(list_sources)
+    # Create a dictionary to which to add the links extracted for lists
+    #   that appear again later in list_sources under another style.
+    pending_links = {}
+    for url, name, style in list_sources:
+        if (url, style) not in pending_links:
+            try:
+                with stage_profiler.stage("list_fetch"):
+                    data = get_page(url, cache_dir, archive,
+                                    {"kind": "list", "source": name})
+                    namespaces = get_namespaces(url, cache_dir, archive)
+                with stage_profiler.stage("link_extraction"):
+                    url_links = extract_list_links(data, list_styles[url],
+                                                   namespaces)
+            except Exception as error:
+                if letters is None:
+                    raise
+                failure = letters.record(url, "list", error,
+                                         {"URL": url, "Source": name})
+                if archive is not None:
+                    archive.record_failure(failure)
+                url_links = {other_style: [] for other_style in
+                             list_styles[url]}
+            for other_style, links in url_links.items():
+                pending_links[(url, other_style)] = resolve_links(url,
+                                                                  links)
+        for href, title in pending_links.pop((url, style)):
+            yield name, href, title
+
+
+def get_english_dicts(candidate_links):
+    """
+    Return a list of raw dictionaries for the English language pages of
+        all (list name, href, title) tuples in candidate_links. The
+        dictionaries' "URL" values are the URLs that will later be
+        scraped for name translations.
+
+    Links from lists on other wikis (whose hrefs are absolute URLs) give
+        dictionaries for the pages on those wikis instead, with their
+        wikis' language codes. Their English language pages are found
+        when they are scraped.
+    """
+    english_dicts = []
+
+    # Create a set to which to add hrefs for the English language pages
+    #   of all selected list items. Hrefs will serve as unique
+    #   identifiers for the list items. This set will be used to avoid
+    #   duplicate entries. I'll provide two examples of duplicate entries
+    #   that this set will avoid: Æthelred the Unready was a monarch who
+    #   had two reigns and thus is listed twice on Wikipedia's "List of
+    #   English monarchs". Sweyn Forkbeard was a Danish monarch who
+    #   controlled England for a time, and thus is listed both on
+    #   Wikipedia's "List of English monarchs" and on its "List of Danish
+    #   monarchs".
+    hrefs = set()
+
+    # For each link, add the link and title to a dictionary for the
+    #   page.
+    for key, href, title in candidate_links:
+        if href not in hrefs:
+            hrefs.add(href)
+            if title is not None and href.startswith("/wiki/"):
+                english_dicts.append({
+                    "URL": "https://" + ENGLISH_HOST + href,
+                    "Language Code": "en",
+                    "Title": title,
+                    "Source": key
+                    })
+            elif title is not None:
+                english_dicts.append({
+                    "URL": href,
+                    "Language Code": get_wiki_language(href),
+                    "Title": title,
+                    "Source": key
                     })
-        except:
-            continue
-
-# Change to the directory in which to save the csv.
-os.chdir("C:/Users/username//Documents")
-# Create a dataframe out of dicts.
-df = pd.DataFrame(all_dicts)
-# Write the dataframe to csv.
-df.to_csv("name_translations.csv", encoding="utf-8-sig")
+
+    return english_dicts
+
+
+def get_entity_cache_path(cache_dir):
+    """
+    Return the path at which entity type lookups are cached in cache_dir.
+    """
+    if cache_dir is None:
+        return None
+    return os.path.join(cache_dir, "entity_types.json")
+
+
+def get_frontier_links(cache_dir=None, prune=False, check_people=False,
+                       archive=None, letters=None, list_sources=None):
+    """
+    Scrape the Wikipedia lists in list_sources (by default, all of them)
+        and return an iterable of (list name, href, title) tuples for the
+        links of interest. If prune is True, links that do not lead to
+        articles (and, if check_people is True, links to articles that
+        are not about people) are dropped.
+    """
+    candidate_links = get_candidate_links(list_sources, cache_dir, archive,
+                                          letters)
+    if prune:
+        candidate_links = list(candidate_links)
+        candidate_links, reasons = frontier_pruning.prune_links(
+            candidate_links, check_people,
+            get_entity_cache_path(cache_dir),
+            get_wiki_namespaces(candidate_links, cache_dir, archive))
+    return candidate_links
+
+
+def get_frontier(cache_dir=None, prune=False, check_people=False,
+                 archive=None, letters=None, list_sources=None):
+    """
+    Scrape the Wikipedia lists in list_sources (by default, all of them)
+        and return a list of dictionaries for the English language pages
+        of all selected list items. If prune is True, links that do not
+        lead to articles (and, if check_people is True, links to articles
+        that are not about people) are dropped first.
+    """
+    return get_english_dicts(get_frontier_links(
+        cache_dir, prune, check_people, archive, letters, list_sources))
+
+
+def get_translation_dicts(english_dict, cache_dir=None, archive=None,
+                          letters=None):
+    """
+    Scrape the page at english_dict["URL"] and return a list of
+        dictionaries for the page's interlanguage links. If letters (a
+        dead_letters.DeadLetters) is given, a page that cannot be scraped
+        or parsed is recorded there (and in archive, if it is given) and
+        has no dictionaries. Otherwise, the error is raised.
+    """
+    stage = "fetch"
+    try:
+        with stage_profiler.stage("person_fetch"):
+            data = get_page(english_dict["URL"], cache_dir, archive,
+                            {"kind": "person",
+                             "source": english_dict["Source"]})
+        stage = "parse"
+        with stage_profiler.stage("person_parse"):
+            return parse_translation_dicts(english_dict, data)
+    except Exception as error:
+        if letters is None:
+            raise
+        failure = letters.record(english_dict["URL"], stage, error,
+                                 english_dict)
+        if archive is not None:
+            archive.record_failure(failure)
+        return []
+
+
+def parse_person_page(data):
+    """
+    Parse the html of a person page and return the page's Wikidata ID
+        (such as "Q1234"), or None if it has none, and a list of (language
+        code, title, href) tuples for its interlanguage links.
+    """
+    root = lxml.html.document_fromstring(data)
+    wikidata_hrefs = WIKIDATA_LINKS(root)
+    qid = None
+    if wikidata_hrefs:
+        qid = str(wikidata_hrefs[0]).rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+    links = []
+    for tag in INTERLANGUAGE_LINKS(root):
+        title = tag.get("title")
+        if title is not None:
+            links.append((str(tag.get("lang", "")), str(title),
+                          str(tag.get("href", ""))))
+    return qid, links
+
+
+def parse_translation_dicts(english_dict, data):
+    """
+    Parse the html of the page for english_dict and return a list of raw
+        dictionaries for the page's interlanguage links. If the page was
+        found on a list on another wiki, the dictionaries are for the
+        person's entity (see get_entity_url), and include the page's own
+        title and its English language title first.
+    """
+    qid, links = parse_person_page(data)
+    url = english_dict["URL"]
+    if english_dict["Language Code"] != "en":
+        url = get_entity_url(english_dict, qid, links)
+        # Put the English language title first, since it supplies the
+        #   English names, and then the page's own title.
+        links = ([link for link in links if link[0] == "en"] +
+                 [(english_dict["Language Code"], english_dict["Title"],
+                   english_dict["URL"])] +
+                 [link for link in links if link[0] != "en"])
+    return [{"URL": url,
+             "Language Code": code,
+             "Title": title,
+             "Source": english_dict["Source"]}
+            for code, title, href in links]
+
+
+def get_entity_url(seed_dict, qid, links):
+    """
+    Return the URL by which the results identify the person whose page
+        on another wiki seed_dict is for: the URL of their English
+        language page, if they have one, or else of their Wikidata item,
+        or else of the page itself. Pages for the same person on
+        different wikis get the same URL.
+    """
+    for code, title, href in links:
+        if code == "en" and href:
+            return href
+    if qid is not None:
+        return "https://www.wikidata.org/wiki/" + qid
+    return seed_dict["URL"]
+
+
+def resolve_page_dicts(english_dicts, page_dicts):
+    """
+    Yield, for each page in english_dicts, the raw dictionaries of its
+        interlanguage links to save and the raw dictionaries from which
+        its English names are derived. page_dicts yields the list of
+        dictionaries for each page in turn, as it is scraped.
+
+    Pages on other wikis, found on lists there, get the dictionaries of
+        their English language interlanguage links to derive from. They
+        get no dictionaries at all if they are for a person who has
+        already been seen, such as one who is also on an English
+        language list, since the results identify people by the
+        canonical form of their URLs.
+    """
+    # Create a set of the people seen so far, starting with the English
+    #   language pages.
+    seen_urls = {canonical_url(english_dict["URL"])
+                 for english_dict in english_dicts
+                 if english_dict["Language Code"] == "en"}
+    page_dicts = iter(page_dicts)
+    for english_dict in english_dicts:
+        dicts = next(page_dicts)
+        if english_dict["Language Code"] == "en":
+            yield dicts, [english_dict]
+        elif not dicts:
+            yield [], []
+        else:
+            url = canonical_url(dicts[0]["URL"])
+            if url in seen_urls:
+                yield [], []
+            else:
+                seen_urls.add(url)
+                yield dicts, [page_dict for page_dict in dicts
+                              if page_dict["Language Code"] == "en"]
+
+
+def save_results(english_dicts, page_dicts, output_dir, formats,
+                 compression=None, level=None):
+    """
+    Save the raw dictionaries of the English language pages and of each
+        page's interlanguage links, and the names derived from them, to
+        output_dir in each format. page_dicts yields the list of
+        dictionaries for each English language page in turn, as it is
+        scraped.
+
+    english_dicts may also include pages on other wikis, found on lists
+        there (see resolve_page_dicts). english_dicts is also saved, as
+        the frontier of a plan (see crawl_plan.py), so that the pages
+        that failed can be retried later.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, output_writers.FRONTIER_NAME), "w",
+              encoding="utf-8") as frontier_file:
+        json.dump({"frontier": english_dicts}, frontier_file,
+                  ensure_ascii=False)
+
+    # Write the raw dictionaries, so that the names can be derived again
+    #   without scraping, and the names derived from them, to every
+    #   output as they are produced.
+    with output_writers.FanOutWriter(
+            output_writers.make_sinks(output_dir, formats, compression,
+                                      level),
+            threaded=not stage_profiler.is_profiling()) as writer:
+        frontier_dicts = [english_dict for english_dict in english_dicts
+                          if english_dict["Language Code"] == "en"]
+        writer.write("raw", frontier_dicts)
+        writer.write("derived", derive_names.derive_rows(frontier_dicts))
+
+        # Derive the names a batch of pages at a time.
+        resolved_dicts = resolve_page_dicts(english_dicts, page_dicts)
+        for start in range(0, len(english_dicts), DERIVE_BATCH_SIZE):
+            batch_dicts = []
+            translation_dicts = []
+            for dicts, derive_dicts in itertools.islice(resolved_dicts,
+                                                        DERIVE_BATCH_SIZE):
+                writer.write("raw", dicts)
+                batch_dicts.extend(derive_dicts)
+                translation_dicts.extend(dicts)
+            writer.write("derived", derive_names.derive_rows(
+                translation_dicts, batch_dicts))
+
+
+def split_saved_dicts(raw, frontier_path):
+    """
+    Split the raw dictionaries saved by save_results (a dataframe) into
+        the dictionaries of the pages scraped, read from the frontier
+        saved at frontier_path, and a dictionary from each page's URL to
+        the dictionaries of its interlanguage links.
+
+    The rows of a page found on a list on another wiki are under its
+        person's URL, so they are found by the row of the page's own
+        title. Results saved without a frontier are taken to be of
+        English language pages only.
+    """
+    # Group the rows by URL. The first row of each English language page
+    #   is the page's own, written before any interlanguage links.
+    url_dicts = {url: rows.to_dict("records") for url, rows in
+                 raw.groupby("URL", sort=False)}
+    if os.path.exists(frontier_path):
+        with open(frontier_path, encoding="utf-8") as frontier_file:
+            english_dicts = json.load(frontier_file)["frontier"]
+    else:
+        english_dicts = [dicts[0] for dicts in url_dicts.values()
+                         if dicts[0]["Language Code"] == "en"]
+    english_urls = {english_dict["URL"] for english_dict in english_dicts
+                    if english_dict["Language Code"] == "en"}
+    entity_urls = {}
+    for url, dicts in url_dicts.items():
+        if url not in english_urls:
+            for page_dict in dicts:
+                entity_urls.setdefault(
+                    (page_dict["Language Code"], page_dict["Title"]), url)
+
+    page_dicts = {}
+    for english_dict in english_dicts:
+        url = english_dict["URL"]
+        if english_dict["Language Code"] == "en":
+            page_dicts[url] = url_dicts.get(url, [])[1:]
+        else:
+            entity_url = entity_urls.get((english_dict["Language Code"],
+                                          english_dict["Title"]))
+            page_dicts[url] = url_dicts.get(entity_url, [])
+    return english_dicts, page_dicts
+
+
+def retry_failed(output_dir, formats, compression=None, level=None,
+                 cache_dir=None, archive=None):
+    """
+    Scrape the pages in the dead-letter file in output_dir again and
+        merge their rows into the results saved there, rewriting every
+        output. Pages that fail again are kept in the dead-letter file.
+        Pages newly found on a list that failed before are added after
+        the others. Return the numbers of failures retried and of those
+        that failed again.
+    """
+    failures_path = os.path.join(output_dir, dead_letters.FILE_NAME)
+    failures = dead_letters.read_dead_letters(failures_path)
+    raw = derive_names.read_raw(os.path.join(
+        output_dir, compressed_files.add_extension(
+            output_writers.RAW_NAME + ".csv", compression)))
+    english_dicts, page_dicts = split_saved_dicts(
+        raw, os.path.join(output_dir, output_writers.FRONTIER_NAME))
+    urls = {english_dict["URL"] for english_dict in english_dicts}
+
+    retried_path = failures_path + ".retry"
+    with dead_letters.DeadLetters(retried_path) as letters:
+        retry_dicts = []
+        for failure in failures:
+            if failure["stage"] == "list":
+                list_sources = [list_source for list_source in
+                                get_list_sources()
+                                if list_source[0] == failure["url"]]
+                candidate_links = list(get_candidate_links(
+                    list_sources, cache_dir, archive, letters))
+                if archive is not None:
+                    archive.record_crawl(list_sources, candidate_links)
+                new_dicts = get_english_dicts(candidate_links)
+            else:
+                new_dicts = [failure["entry"]]
+            for english_dict in new_dicts:
+                if english_dict["URL"] not in urls:
+                    urls.add(english_dict["URL"])
+                    english_dicts.append(english_dict)
+                retry_dicts.append(english_dict)
+        for english_dict in retry_dicts:
+            page_dicts[english_dict["URL"]] = get_translation_dicts(
+                english_dict, cache_dir, archive, letters)
+
+    save_results(english_dicts,
+                 (page_dicts.get(english_dict["URL"], [])
+                  for english_dict in english_dicts),
+                 output_dir, formats, compression, level)
+    if letters.count > 0:
+        os.replace(retried_path, failures_path)
+    elif os.path.exists(failures_path):
+        os.remove(failures_path)
+    return len(failures), letters.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scrape translations of people's names.")
+    parser.add_argument("--source", action="append", dest="sources",
+                        help="name of a list in sources.json to scrape "
+                             "(may be repeated; by default, all of them)")
+    parser.add_argument("--plan",
+                        help="run the frontier of a plan saved by "
+                             "crawl_plan.py instead of scraping the lists")
+    parser.add_argument("--cache-dir",
+                        help="directory in which to cache scraped pages")
+    parser.add_argument("--prune", action="store_true",
+                        help="skip links that do not lead to articles")
+    parser.add_argument("--check-people", action="store_true",
+                        help="with --prune, also skip articles whose "
+                             "Wikidata items are not people")
+    parser.add_argument("--archive",
+                        help="archive in which to record every scraped "
+                             "page (see page_archive.py)")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="only scrape the pages that failed in the "
+                             "last crawl and merge them into its results")
+    parser.add_argument("--budget-requests", type=int,
+                        help="scrape at most this many person pages, "
+                             "most useful first (see crawl_budget.py)")
+    parser.add_argument("--budget-seconds", type=float,
+                        help="stop scraping person pages after this many "
+                             "seconds, most useful first")
+    parser.add_argument("--profile", choices=stage_profiler.MODES,
+                        help="profile the functions, memory, or latencies "
+                             "of each stage and save reports to the output "
+                             "directory (see stage_profiler.py)")
+    output_writers.add_arguments(parser)
+    args = parser.parse_args(argv)
+    formats = args.formats or output_writers.DEFAULT_FORMATS
+    try:
+        list_sources = get_list_sources(args.sources)
+    except ValueError as error:
+        parser.error(str(error))
+
+    budget = None
+    if args.budget_requests is not None or args.budget_seconds is not None:
+        import crawl_budget
+
+        budget = crawl_budget.CrawlBudget(args.budget_requests,
+                                          args.budget_seconds)
+
+    archive = None
+    if args.archive is not None:
+        import page_archive
+
+        archive = page_archive.PageArchive(args.archive)
+
+    if args.profile is not None:
+        stage_profiler.start(args.profile)
+
+    def save_profile():
+        if stage_profiler.stop(args.output_dir):
+            print(f"Saved {args.profile} profile reports to "
+                  f"{args.output_dir}.")
+
+    if args.retry_failed:
+        retried, failed = retry_failed(args.output_dir, formats,
+                                       args.compression,
+                                       args.compression_level,
+                                       args.cache_dir, archive)
+        print(f"Retried {retried} failed pages; {failed} failed again.")
+        if archive is not None:
+            archive.close()
+        save_profile()
+        return
+
+    # Record the pages that fail in a new dead-letter file.
+    os.makedirs(args.output_dir, exist_ok=True)
+    failures_path = os.path.join(args.output_dir, dead_letters.FILE_NAME)
+    if os.path.exists(failures_path):
+        os.remove(failures_path)
+    letters = dead_letters.DeadLetters(failures_path)
+
+    # Create a list of dictionaries for the English language pages for
+    #   all selected list items. Keep the links, to count the lists on
+    #   which each person is and to record the crawl in the archive.
+    candidate_links = None
+    if args.plan is not None:
+        with open(args.plan, encoding="utf-8") as plan_file:
+            english_dicts = json.load(plan_file)["frontier"]
+        if archive is not None:
+            archive.record_crawl([], [], english_dicts)
+    else:
+        candidate_links = list(get_candidate_links(
+            list_sources, args.cache_dir, archive, letters))
+        english_dicts = get_english_dicts(candidate_links)
+        if args.prune:
+            # Prune the links here, rather than with get_frontier_links,
+            #   to report what pruning dropped and saved.
+            candidate_links, reasons = frontier_pruning.prune_links(
+                candidate_links, args.check_people,
+                get_entity_cache_path(args.cache_dir),
+                get_wiki_namespaces(candidate_links, args.cache_dir,
+                                    archive))
+            frontier = english_dicts
+            english_dicts = get_english_dicts(candidate_links)
+            frontier_pruning.print_pruning(
+                reasons, frontier_pruning.count_saved_fetches(
+                    frontier, english_dicts))
+        if archive is not None:
+            archive.record_crawl(list_sources, candidate_links)
+
+    def get_page_dicts(english_dict):
+        return get_translation_dicts(english_dict, args.cache_dir, archive,
+                                     letters)
+
+    # Scrape each URL added above, and save the results. With a budget,
+    #   scrape the most useful pages first, and only save those scraped
+    #   before the budget runs out.
+    if budget is not None:
+        english_dicts, page_dicts, coverage = crawl_budget.crawl(
+            english_dicts,
+            crawl_budget.get_page_values(english_dicts, candidate_links,
+                                         args.cache_dir),
+            budget, get_page_dicts)
+    else:
+        page_dicts = map(get_page_dicts, english_dicts)
+    save_results(english_dicts, page_dicts, args.output_dir, formats,
+                 args.compression, args.compression_level)
+    if budget is not None:
+        crawl_budget.print_coverage(coverage)
+    letters.close()
+    if archive is not None:
+        archive.close()
+    if letters.count > 0:
+        print(f"{letters.count} pages failed; see {failures_path}.")
+    save_profile()
+
+
+if __name__ == "__main__":
+    main()
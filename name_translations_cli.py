@@ -0,0 +1,204 @@
+#! python3
+# name_translations_cli.py
+
+"""
+This program is a single command-line entry point for looking up the
+    results of name_translations.py and for running the other programs.
+    Its query commands only import what they need (sqlite3, for the
+    cube), so they start in tens of milliseconds rather than the hundreds
+    it takes to import pandas and BeautifulSoup, and can be run many
+    times from shell pipelines.
+
+The commands are:
+
+        lookup      List the top translations of an English name, from
+                    the cube saved by frequency_cube.py.
+        sources     Count rows per source, from the cube.
+        coverage    Count rows and people per language, from the cube.
+        similar     List the names most similar to a name, from the index
+                    saved by name_similarity.py (this imports numpy).
+        complete    List the most frequent names that start with a
+                    prefix, from the index saved by name_prefix_index.py
+                    (this imports numpy).
+        crawl       Run name_translations.py with the arguments given.
+        derive      Run derive_names.py with the arguments given.
+
+For instance:
+
+    python name_translations_cli.py lookup Henry --lang French
+    python name_translations_cli.py crawl --output-dir results
+
+lookup exits with status 1 if it finds nothing, so it can be used in
+    scripts, and every query command exits with status 2, and says how
+    to build it, if its cube or index does not exist.
+"""
+
+# Import libraries. Only the standard library is imported here; each
+#   command imports what it needs.
+import argparse
+import os
+import sys
+
+DEFAULT_CUBE = "name_translations_cube.sqlite"
+DEFAULT_INDEX = "name_similarity.npz"
+DEFAULT_PREFIX_INDEX = "name_translations_prefix.npz"
+
+
+def is_missing(path, program):
+    """
+    Return True, after saying how to build it with program, if the file
+        at path does not exist.
+    """
+    if os.path.exists(path):
+        return False
+    print(f"{path} does not exist; build it with "
+          f"\"python {program} build\".", file=sys.stderr)
+    return True
+
+
+def lookup(args):
+    if is_missing(args.cube, "frequency_cube.py"):
+        return 2
+    import frequency_cube
+
+    connection = frequency_cube.connect(args.cube)
+    rows = frequency_cube.top_translations(connection, args.english_name,
+                                           args.lang, args.k)
+    connection.close()
+    for language, name, count in rows:
+        print(f"{count:>8}  {name} ({language})")
+    return 0 if rows else 1
+
+
+def sources(args):
+    if is_missing(args.cube, "frequency_cube.py"):
+        return 2
+    import frequency_cube
+
+    connection = frequency_cube.connect(args.cube)
+    for source, count in frequency_cube.counts_per_source(
+            connection, args.english_name, args.lang, args.name):
+        print(f"{count:>8}  {source}")
+    connection.close()
+    return 0
+
+
+def coverage(args):
+    if is_missing(args.cube, "frequency_cube.py"):
+        return 2
+    import frequency_cube
+
+    connection = frequency_cube.connect(args.cube)
+    for language, rows, persons, share in frequency_cube.language_coverage(
+            connection, not args.all_scripts):
+        print(f"{rows:>8}  {persons:>8}  {share:6.1%}  {language}")
+    connection.close()
+    return 0
+
+
+def similar(args):
+    if is_missing(args.index, "name_similarity.py"):
+        return 2
+    import name_similarity
+
+    similarity = name_similarity.NameSimilarity(args.index)
+    results = similarity.similar(args.lang, args.name, args.k,
+                                 args.measure)
+    for (language, name), value in results:
+        print(f"{value:8.3f}  {name} ({language})")
+    return 0 if results else 1
+
+
+def complete(args):
+    if is_missing(args.index, "name_prefix_index.py"):
+        return 2
+    import name_prefix_index
+
+    index = name_prefix_index.PrefixIndex(args.index)
+    results = index.complete(args.prefix, args.k, args.lang)
+    for name, count, languages in results:
+        print(f"{count:>8}  {name} ({', '.join(languages)})")
+    return 0 if results else 1
+
+
+def run_program(module_name, arguments):
+    """
+    Run the main() function of a program as if it had been called with
+        arguments.
+    """
+    import importlib
+
+    module = importlib.import_module(module_name)
+    sys.argv = [module_name + ".py"] + arguments
+    module.main()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="name-translations",
+        description="Look up and produce translations of people's names.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    lookup_parser = subparsers.add_parser(
+        "lookup", help="list the top translations of an English name")
+    lookup_parser.add_argument("english_name")
+    lookup_parser.add_argument("--lang", help="language, such as French")
+    lookup_parser.add_argument("-k", type=int, default=10,
+                               help="number of translations to list")
+    lookup_parser.add_argument("--cube", default=DEFAULT_CUBE,
+                               help="database saved by frequency_cube.py")
+    lookup_parser.set_defaults(function=lookup)
+
+    sources_parser = subparsers.add_parser(
+        "sources", help="count rows per source")
+    sources_parser.add_argument("--english-name")
+    sources_parser.add_argument("--lang")
+    sources_parser.add_argument("--name")
+    sources_parser.add_argument("--cube", default=DEFAULT_CUBE)
+    sources_parser.set_defaults(function=sources)
+
+    coverage_parser = subparsers.add_parser(
+        "coverage", help="count rows and people per language")
+    coverage_parser.add_argument("--all-scripts", action="store_true",
+                                 help="include rows in unfamiliar scripts")
+    coverage_parser.add_argument("--cube", default=DEFAULT_CUBE)
+    coverage_parser.set_defaults(function=coverage)
+
+    similar_parser = subparsers.add_parser(
+        "similar", help="list the names most similar to a name")
+    similar_parser.add_argument("name")
+    similar_parser.add_argument("--lang", default="English")
+    similar_parser.add_argument("-k", type=int, default=10)
+    similar_parser.add_argument("--measure", choices=["cosine", "pmi"],
+                                default="cosine")
+    similar_parser.add_argument("--index", default=DEFAULT_INDEX,
+                                help="index saved by name_similarity.py")
+    similar_parser.set_defaults(function=similar)
+
+    complete_parser = subparsers.add_parser(
+        "complete", help="list the most frequent names with a prefix")
+    complete_parser.add_argument("prefix")
+    complete_parser.add_argument("--lang", help="language, such as French")
+    complete_parser.add_argument("-k", type=int, default=10)
+    complete_parser.add_argument("--index", default=DEFAULT_PREFIX_INDEX,
+                                 help="index saved by name_prefix_index.py")
+    complete_parser.set_defaults(function=complete)
+
+    for command, module_name in [("crawl", "name_translations"),
+                                 ("derive", "derive_names")]:
+        program_parser = subparsers.add_parser(
+            command, help=f"run {module_name}.py", add_help=False)
+        program_parser.set_defaults(program=module_name)
+
+    # Pass the arguments that aren't this program's to crawl and derive.
+    args, arguments = parser.parse_known_args()
+    if "program" in args:
+        return run_program(args.program, arguments)
+    if arguments:
+        parser.error("unrecognized arguments: " + " ".join(arguments))
+    return args.function(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,442 @@
+# output_writers.py
+
+"""
+This module writes the rows produced by a crawl to several outputs at
+    once, so that other formats don't have to be made by reading the csv
+    again.
+
+A FanOutWriter takes batches of rows from the crawl and hands them to a
+    writer thread through a bounded queue. The thread passes each batch
+    to every sink for its stream ("raw" for the raw results, "derived"
+    for the derived names), and each sink keeps its own buffer, which it
+    writes out once it holds buffer_rows rows. The crawl only waits on the
+    writer when the queue is full.
+
+The sinks are:
+
+        csv         A csv, as written by pandas. With a compression,
+                    the csv is compressed as it is written (see
+                    compressed_files.py), and no uncompressed copy is
+                    saved.
+        parquet     A Parquet file, written a row group at a time. This
+                    needs pyarrow, which the rest of the program does not.
+        sqlite      A table in an SQLite database.
+        cube        The translation counts of frequency_cube.py, saved
+                    when the writer is closed.
+        prefix      The prefix index of name_prefix_index.py, for
+                    type-ahead over the given names, saved when the
+                    writer is closed. This needs numpy.
+        table       The translation table of bulk_translation.py, for
+                    translating whole columns of names, saved when the
+                    writer is closed. This needs numpy.
+
+For instance:
+
+    writer = output_writers.FanOutWriter(output_writers.make_sinks(
+        "output", ["csv", "sqlite"], compression="zstd"))
+    writer.write("derived", rows)
+    writer.close()
+"""
+
+# Import libraries.
+import csv
+import os
+import queue
+import sqlite3
+import threading
+
+import compressed_files
+import frequency_cube
+import stage_profiler
+
+FORMATS = ["csv", "parquet", "sqlite", "cube", "prefix", "table"]
+DEFAULT_FORMATS = ["csv", "cube"]
+
+# Name the files written to the output directory.
+RAW_NAME = "name_translations_raw"
+FRONTIER_NAME = "name_translations_frontier.json"
+DERIVED_NAME = "name_translations"
+CUBE_NAME = "name_translations_cube.sqlite"
+PREFIX_NAME = "name_translations_prefix.npz"
+TABLE_NAME = "name_translations_table.npz"
+
+# Set the number of rows a sink holds before writing them out.
+BUFFER_ROWS = 10000
+
+
+def get_value(value):
+    """
+    Return a value as written to a csv by pandas, with missing values
+        left empty.
+    """
+    if value is None or value != value:
+        return ""
+    return value
+
+
+class Sink:
+    """
+    Buffer rows of one stream and write them out in batches. Subclasses
+        write the batches in write_batch() and release their files in
+        finish().
+    """
+
+    def __init__(self, stream, columns, buffer_rows=BUFFER_ROWS):
+        self.stream = stream
+        self.columns = columns
+        self.buffer_rows = buffer_rows
+        self.buffer = []
+        self.count = 0
+
+    def add(self, rows):
+        self.buffer.extend(rows)
+        if len(self.buffer) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.count += len(self.buffer)
+            self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.finish()
+
+    def write_batch(self, rows):
+        raise NotImplementedError
+
+    def finish(self):
+        pass
+
+
+class CsvSink(Sink):
+    """
+    Write rows to a csv, compressed with compression if it is not None.
+        With index=True, the rows are numbered in an unnamed first column,
+        as pandas does by default.
+    """
+
+    def __init__(self, stream, columns, path, index=False,
+                 encoding="utf-8", compression=None, level=None,
+                 buffer_rows=BUFFER_ROWS):
+        super().__init__(stream, columns, buffer_rows)
+        self.path = path
+        self.index = index
+        self.file = compressed_files.open_text(path, "w", compression,
+                                               level, encoding)
+        self.writer = csv.writer(self.file, lineterminator="\n")
+        self.writer.writerow(([""] if index else []) + columns)
+
+    def write_batch(self, rows):
+        start = self.count
+        self.writer.writerows(
+            ([start + number] if self.index else []) +
+            [get_value(row.get(column)) for column in self.columns]
+            for number, row in enumerate(rows))
+
+    def finish(self):
+        self.file.close()
+
+
+class ParquetSink(Sink):
+    """
+    Write rows to a Parquet file, with every column as strings.
+    """
+
+    def __init__(self, stream, columns, path, buffer_rows=BUFFER_ROWS):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(stream, columns, buffer_rows)
+        self.pa = pa
+        self.path = path
+        self.schema = pa.schema([(column, pa.string())
+                                 for column in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_batch(self, rows):
+        self.writer.write_table(self.pa.Table.from_pydict(
+            {column: [get_value(row.get(column)) for row in rows]
+             for column in self.columns}, schema=self.schema))
+
+    def finish(self):
+        self.writer.close()
+
+
+class SqliteSink(Sink):
+    """
+    Write rows to a table in an SQLite database, replacing any table of
+        the same name.
+    """
+
+    def __init__(self, stream, columns, path, table,
+                 buffer_rows=BUFFER_ROWS):
+        super().__init__(stream, columns, buffer_rows)
+        self.path = path
+        # Open the database on the writer thread, which is the only
+        #   thread that uses it.
+        self.connection = None
+        self.table = table
+
+    def connect(self):
+        names = ", ".join(f'"{column}" TEXT' for column in self.columns)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(f'DROP TABLE IF EXISTS "{self.table}"')
+        self.connection.execute(f'CREATE TABLE "{self.table}" ({names})')
+
+    def write_batch(self, rows):
+        if self.connection is None:
+            self.connect()
+        self.connection.executemany(
+            f'INSERT INTO "{self.table}" VALUES '
+            f'({", ".join("?" * len(self.columns))})',
+            ([get_value(row.get(column)) for column in self.columns]
+             for row in rows))
+        self.connection.commit()
+
+    def close(self):
+        # Create the table even if there are no rows.
+        if self.connection is None:
+            self.connect()
+        super().close()
+
+    def finish(self):
+        if self.connection is not None:
+            self.connection.close()
+
+
+class FrameSink(Sink):
+    """
+    Keep some columns of the rows and, when closed, pass them to build
+        as a dataframe.
+    """
+
+    def __init__(self, stream, columns, path, buffer_rows=BUFFER_ROWS):
+        super().__init__(stream, columns, buffer_rows)
+        self.path = path
+        self.batches = []
+
+    def write_batch(self, rows):
+        self.batches.append([[row.get(column) for column in self.columns]
+                             for row in rows])
+
+    def close(self):
+        import pandas as pd
+
+        self.flush()
+        df = pd.DataFrame([row for batch in self.batches for row in batch],
+                          columns=self.columns)
+        self.build(df)
+
+
+class CubeSink(FrameSink):
+    """
+    Keep the columns that frequency_cube.py groups by and save the cube
+        when closed.
+    """
+
+    def __init__(self, stream, path, buffer_rows=BUFFER_ROWS):
+        super().__init__(stream, frequency_cube.DIMENSIONS + ["URL"], path,
+                         buffer_rows)
+
+    def build(self, df):
+        frequency_cube.build_cube(df, self.path)
+
+
+class PrefixIndexSink(FrameSink):
+    """
+    Keep the columns that name_prefix_index.py indexes and save the index
+        when closed.
+    """
+
+    def __init__(self, stream, path, buffer_rows=BUFFER_ROWS):
+        super().__init__(stream, ["URL", "Language", "Name",
+                                  "Name (English)"], path, buffer_rows)
+
+    def build(self, df):
+        import name_prefix_index
+
+        name_prefix_index.build_index(df, self.path)
+
+
+class TranslationTableSink(FrameSink):
+    """
+    Keep the columns that bulk_translation.py joins on and save the
+        translation table when closed.
+    """
+
+    def __init__(self, stream, path, buffer_rows=BUFFER_ROWS):
+        super().__init__(stream, ["URL", "Language", "Name",
+                                  "Name (English)"], path, buffer_rows)
+
+    def build(self, df):
+        import bulk_translation
+
+        bulk_translation.build_table(df, self.path)
+
+
+def make_sink(output_format, get_path, compression=None, level=None,
+              buffer_rows=BUFFER_ROWS):
+    """
+    Return a sink that writes the derived names in output_format, to a
+        path returned by get_path for the file's name.
+    """
+    import derive_names
+
+    columns = derive_names.DERIVED_COLUMNS
+    if output_format == "csv":
+        path = get_path(compressed_files.add_extension(
+            DERIVED_NAME + ".csv", compression))
+        return CsvSink("derived", columns, path, index=True,
+                       encoding="utf-8-sig", compression=compression,
+                       level=level, buffer_rows=buffer_rows)
+    if output_format == "parquet":
+        return ParquetSink("derived", columns,
+                           get_path(DERIVED_NAME + ".parquet"), buffer_rows)
+    if output_format == "sqlite":
+        return SqliteSink("derived", columns,
+                          get_path(DERIVED_NAME + ".sqlite"),
+                          "translations", buffer_rows)
+    if output_format == "cube":
+        return CubeSink("derived", get_path(CUBE_NAME), buffer_rows)
+    if output_format == "prefix":
+        return PrefixIndexSink("derived", get_path(PREFIX_NAME),
+                               buffer_rows)
+    if output_format == "table":
+        return TranslationTableSink("derived", get_path(TABLE_NAME),
+                                    buffer_rows)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+def make_sinks(output_dir, formats, compression=None, level=None,
+               buffer_rows=BUFFER_ROWS):
+    """
+    Return a list of sinks that write the raw results and the derived
+        names in each format to output_dir. The raw results always go to
+        a csv, so that the names can be derived again. The csvs are
+        compressed with compression ("gzip" or "zstd") at level, if
+        given.
+    """
+    import derive_names
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    def get_path(name):
+        return os.path.join(output_dir, name)
+
+    raw_columns = derive_names.RAW_COLUMNS
+    sinks = []
+    try:
+        raw_path = get_path(compressed_files.add_extension(
+            RAW_NAME + ".csv", compression))
+        sinks.append(CsvSink("raw", raw_columns, raw_path,
+                             compression=compression, level=level,
+                             buffer_rows=buffer_rows))
+        for output_format in formats:
+            sinks.append(make_sink(output_format, get_path, compression,
+                                   level, buffer_rows))
+    except Exception:
+        # Close the files of the sinks already made.
+        for sink in sinks:
+            sink.finish()
+        raise
+    return sinks
+
+
+def add_arguments(parser):
+    """
+    Add the options that choose the outputs to an argparse parser.
+    """
+    parser.add_argument("--output-dir", default=".",
+                        help="directory in which to save the results")
+    parser.add_argument("--format", action="append", choices=FORMATS,
+                        dest="formats",
+                        help="format in which to save the names (may be "
+                             "repeated; the default is csv and cube)")
+    parser.add_argument("--compression",
+                        choices=list(compressed_files.EXTENSIONS),
+                        help="compress the csvs as they are written")
+    parser.add_argument("--compression-level", type=int,
+                        help="level of compression (gzip: 1 to 9, zstd: "
+                             "1 to 22)")
+
+
+class FanOutWriter:
+    """
+    Pass batches of rows to sinks on a writer thread. If threaded is
+        False, the rows are passed to the sinks in the calling thread
+        instead (as when profiling, so that writing is profiled with the
+        stage that does it).
+    """
+
+    def __init__(self, sinks, queue_size=64, threaded=True):
+        self.sinks = sinks
+        self.queue = queue.Queue(queue_size)
+        self.error = None
+        self.thread = None
+        if threaded:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def add(self, stream, rows):
+        if self.error is not None:
+            return
+        try:
+            with stage_profiler.stage("output"):
+                for sink in self.sinks:
+                    if sink.stream == stream:
+                        sink.add(rows)
+        except Exception as error:
+            self.error = error
+
+    def close_sinks(self):
+        # Close every sink, even after an error, so that no file is left
+        #   open.
+        with stage_profiler.stage("output"):
+            for sink in self.sinks:
+                try:
+                    sink.close()
+                except Exception as error:
+                    if self.error is None:
+                        self.error = error
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            self.add(*item)
+        self.close_sinks()
+
+    def check(self):
+        if self.error is not None:
+            raise self.error
+
+    def write(self, stream, rows):
+        """
+        Queue a list of rows (dictionaries) for the sinks of stream.
+        """
+        self.check()
+        if rows and self.thread is None:
+            self.add(stream, list(rows))
+        elif rows:
+            self.queue.put((stream, list(rows)))
+
+    def close(self):
+        """
+        Write out every sink's buffer, close the sinks, and raise any
+            error from the writer thread.
+        """
+        if self.thread is None:
+            self.close_sinks()
+        else:
+            self.queue.put(None)
+            self.thread.join()
+        self.check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,424 @@
+#! python3
+# page_archive.py
+
+"""
+This program keeps an archive of every page that name_translations.py
+    scrapes, and replays a crawl from the archive without the network.
+
+The archive is a WARC-style file (for instance, pages.warc.gz) of
+    "resource" records, one per list page or person page, each of which
+    is compressed as a separate gzip member and only ever appended. Each
+    record has these headers along with the page:
+
+        WARC-Target-URI     The URL of the page.
+        WARC-Date           When the page was fetched.
+        X-Page-Kind         "list" or "person".
+        X-Source            The Wikipedia list the page came from.
+        X-Status            The HTTP status of the response, or "cache"
+                            if the page was read from the page cache.
+        X-Elapsed           The seconds the request took.
+
+An index beside the archive (pages.warc.gz.idx) has a line of JSON for
+    each record, with its offset and length in the archive, so that any
+    page can be read without decompressing the others. If a page was
+    archived more than once, its latest record is used. The index also
+    has a line for each crawl (with "kind" "crawl"), with the list
+    sources that the crawl selected and the links of interest that it
+    found on them (after any pruning), or, for a crawl of a plan's
+    frontier, the frontier; and a line for each page that the crawl
+    failed to scrape (with "kind" "failure"), with the failure that it
+    recorded in its dead-letter file (see dead_letters.py).
+
+To record a crawl:
+
+    python name_translations.py --archive pages.warc.gz
+
+and to replay it, with the pages parsed in parallel on every core:
+
+    python page_archive.py replay --archive pages.warc.gz \
+        --output-dir replayed
+
+The replay takes the frontier from the links recorded in the index, so
+    it needs neither the network nor the list sources of the crawl, and
+    replays the person pages that the crawl scraped, in the order in
+    which it scraped them. Pages that the crawl did not scrape (for
+    instance, because it ran out of budget or was stopped) are skipped,
+    and pages that it failed to scrape are recorded in the replay's own
+    dead-letter file, as the crawl recorded them in its own.
+    With --extract-links, the links are extracted again from the
+    archived list pages instead. The replay writes the same outputs as
+    the crawl, so two versions of the extraction can be compared on the
+    same snapshot.
+"""
+
+# Import libraries.
+import argparse
+import datetime
+import gzip
+import json
+import multiprocessing
+import os
+import uuid
+
+import dead_letters
+import frontier_pruning
+import name_translations
+import output_writers
+
+
+def get_index_path(path):
+    """
+    Return the path of the index of the archive at path.
+    """
+    return path + ".idx"
+
+
+def get_date():
+    return datetime.datetime.now(datetime.timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ")
+
+
+class PageArchive:
+    """
+    Append pages to an archive and its index.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "ab")
+        self.index_file = open(get_index_path(path), "a", encoding="utf-8")
+
+    def record(self, url, data, metadata):
+        """
+        Append the text of the page at url to the archive, with a
+            dictionary of metadata ("kind", "source", "status", and
+            "elapsed").
+        """
+        body = data.encode("utf-8")
+        date = get_date()
+        headers = [
+            "WARC/1.0",
+            "WARC-Type: resource",
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+            f"WARC-Date: {date}",
+            f"WARC-Target-URI: {url}",
+            "Content-Type: text/html; charset=utf-8",
+            f"X-Page-Kind: {metadata.get('kind', '')}",
+            f"X-Source: {metadata.get('source', '')}",
+            f"X-Status: {metadata.get('status', '')}",
+            f"X-Elapsed: {metadata.get('elapsed', '')}",
+            f"Content-Length: {len(body)}"
+            ]
+        record = gzip.compress(
+            ("\r\n".join(headers) + "\r\n\r\n").encode("utf-8") + body +
+            b"\r\n\r\n")
+        offset = self.file.tell()
+        self.file.write(record)
+        self.file.flush()
+        # Index the record only once it is in the archive, so that the
+        #   index never points past the end of the archive.
+        self.write_index({"url": url, "offset": offset,
+                          "length": len(record), "date": date, **metadata})
+
+    def record_crawl(self, list_sources, candidate_links, frontier=None):
+        """
+        Add a line to the index for a crawl of the (URL, name, extraction
+            style) tuples in list_sources, which found the (list name,
+            href, title) tuples in candidate_links, or of the English
+            language dictionaries in frontier.
+        """
+        entry = {"kind": "crawl", "date": get_date(),
+                 "sources": [list(list_source)
+                             for list_source in list_sources],
+                 "links": [list(link) for link in candidate_links]}
+        if frontier is not None:
+            entry["frontier"] = list(frontier)
+        self.write_index(entry)
+
+    def record_failure(self, failure):
+        """
+        Add a line to the index for a failure to scrape a page, a
+            dictionary made by dead_letters.make_failure.
+        """
+        self.write_index({"kind": "failure", **failure})
+
+    def write_index(self, entry):
+        self.index_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.index_file.flush()
+
+    def close(self):
+        self.file.close()
+        self.index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_index(path):
+    """
+    Return, from the index of the archive at path, a dictionary from
+        each URL in the archive to the index entry of its latest record,
+        a dictionary from each URL that failed to the index entry of its
+        latest failure, a list of the index entries of the crawls, and a
+        dictionary from each URL to the position in the index at which
+        it was first recorded or failed.
+    """
+    entries = {}
+    failures = {}
+    crawls = []
+    positions = {}
+    with open(get_index_path(path), encoding="utf-8") as index_file:
+        for line in index_file:
+            if line.strip():
+                entry = json.loads(line)
+                if entry.get("kind") == "crawl":
+                    crawls.append(entry)
+                    continue
+                if entry.get("kind") == "failure":
+                    failures[entry["url"]] = entry
+                else:
+                    entries[entry["url"]] = entry
+                positions.setdefault(entry["url"], len(positions))
+    return entries, failures, crawls, positions
+
+
+class ArchiveReader:
+    """
+    Read pages from an archive. get_page() takes the same arguments as
+        name_translations.get_page, so it can be used in its place, and
+        raises a KeyError for a page that is not in the archive.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        (self.entries, self.failures, self.crawls,
+         self.positions) = read_index(path)
+        self.file = open(path, "rb")
+
+    def get_page(self, url, cache_dir=None, archive=None, metadata=None):
+        entry = self.entries.get(url)
+        if entry is None:
+            raise KeyError(f"{url} is not in {self.path}")
+        self.file.seek(entry["offset"])
+        record = gzip.decompress(self.file.read(entry["length"]))
+        header, body = record.split(b"\r\n\r\n", 1)
+        for line in header.decode("utf-8").split("\r\n"):
+            if line.startswith("Content-Length: "):
+                length = int(line[len("Content-Length: "):])
+        return body[:length].decode("utf-8")
+
+    def get_failure(self, url):
+        """
+        Return the dictionary of the latest failure to scrape url, as it
+            was recorded in the crawl's dead-letter file.
+        """
+        return {key: value for key, value in self.failures[url].items()
+                if key != "kind"}
+
+    def close(self):
+        self.file.close()
+
+
+# Create the reader of each replay worker process.
+reader = None
+
+
+def start_worker(path):
+    """
+    Open the archive in a replay worker process and serve pages from it
+        in place of scraping them.
+    """
+    global reader
+    reader = ArchiveReader(path)
+    name_translations.get_page = reader.get_page
+
+
+def extract_archived_list(url, styles):
+    return url, name_translations.extract_list_links(
+        name_translations.get_page(url), styles,
+        name_translations.get_namespaces(url))
+
+
+def get_archived_translation_dicts(english_dict):
+    """
+    Return the translation dictionaries of an archived page, and the
+        dictionary of its failure, or None if it did not fail. A page
+        that the crawl failed to scrape fails with the crawl's failure.
+    """
+    url = english_dict["URL"]
+    if url not in reader.entries:
+        return [], reader.get_failure(url)
+    try:
+        return name_translations.get_translation_dicts(english_dict), None
+    except Exception as error:
+        return [], dead_letters.make_failure(url, "parse", error,
+                                             english_dict)
+
+
+def get_failed_lists(archive_reader, list_sources):
+    """
+    Return a list of the dictionaries of the failures of the lists in
+        list_sources that the crawls in an archive failed to scrape.
+    """
+    failures = []
+    for url in dict.fromkeys(url for url, name, style in list_sources):
+        if (url in archive_reader.failures and
+                url not in archive_reader.entries):
+            failures.append(archive_reader.get_failure(url))
+    return failures
+
+
+def get_crawled_sources(archive_reader):
+    """
+    Return a list of the (URL, name, extraction style) tuples for the
+        list sources of the crawls in an archive, in the order in which
+        they were first selected. For an archive in which no crawl was
+        recorded, these are the sources of name_translations.py whose
+        list pages are in the archive.
+    """
+    if not archive_reader.crawls:
+        return [list_source for list_source in
+                name_translations.get_list_sources()
+                if list_source[0] in archive_reader.entries]
+    return list(dict.fromkeys(tuple(list_source)
+                              for crawl in archive_reader.crawls
+                              for list_source in crawl["sources"]))
+
+
+def extract_links(pool, list_sources, archive_reader):
+    """
+    Parse the archived list pages of list_sources on a pool of processes
+        and return a list of (list name, href, title) tuples for their
+        links of interest, in the order of a crawl. Lists that are not
+        in the archive have no links.
+    """
+    list_styles = name_translations.get_list_styles(
+        [list_source for list_source in list_sources
+         if list_source[0] in archive_reader.entries])
+    list_links = {}
+    for url, links in pool.starmap(extract_archived_list,
+                                   list_styles.items()):
+        for style in links:
+            list_links[(url, style)] = name_translations.resolve_links(
+                url, links[style])
+    return [(name, href, title) for url, name, style in list_sources
+            for href, title in list_links.get((url, style), [])]
+
+
+def get_frontier(pool, archive_reader, prune=False, reextract=False):
+    """
+    Return a list of the English language dictionaries of the person
+        pages that the crawls in an archive scraped, in the order in
+        which they were scraped, and the number of pages in the crawls'
+        frontiers that were not scraped. The frontiers are built from
+        the links recorded for the crawls or, if reextract is True or no
+        crawl was recorded, from the links in the archived list pages.
+    """
+    if reextract or not archive_reader.crawls:
+        candidate_links = extract_links(
+            pool, get_crawled_sources(archive_reader), archive_reader)
+    else:
+        candidate_links = [tuple(link) for crawl in archive_reader.crawls
+                           for link in crawl["links"]]
+    if prune:
+        # Read the namespaces of other wikis on a worker, which reads
+        #   pages from the archive.
+        candidate_links, reasons = frontier_pruning.prune_links(
+            candidate_links, namespaces=pool.apply(
+                name_translations.get_wiki_namespaces, (candidate_links,)))
+    english_dicts = name_translations.get_english_dicts(candidate_links)
+    # Add the frontiers of crawls of plans.
+    urls = {english_dict["URL"] for english_dict in english_dicts}
+    for crawl in archive_reader.crawls:
+        for english_dict in crawl.get("frontier", []):
+            if english_dict["URL"] not in urls:
+                urls.add(english_dict["URL"])
+                english_dicts.append(english_dict)
+
+    # Keep the pages that were scraped or failed, in the order in which
+    #   they were first recorded.
+    positions = archive_reader.positions
+    scraped = [english_dict for english_dict in english_dicts
+               if english_dict["URL"] in positions]
+    scraped.sort(key=lambda english_dict: positions[english_dict["URL"]])
+    return scraped, len(english_dicts) - len(scraped)
+
+
+def replay(path, output_dir, formats, compression=None, level=None,
+           prune=False, processes=None, reextract=False):
+    """
+    Run the crawl of name_translations.py from the archive at path, with
+        the pages parsed by a pool of processes, and save the results to
+        output_dir. Lists and pages that the crawl failed to scrape, and
+        pages that fail to parse, are recorded in a dead-letter file in
+        output_dir. Return the numbers of person pages replayed, of pages
+        in the frontier that were not in the archive, and so were
+        skipped, and of failures.
+    """
+    archive_reader = ArchiveReader(path)
+    archive_reader.close()
+    os.makedirs(output_dir, exist_ok=True)
+    failures_path = os.path.join(output_dir, dead_letters.FILE_NAME)
+    if os.path.exists(failures_path):
+        os.remove(failures_path)
+    with dead_letters.DeadLetters(failures_path) as letters, \
+            multiprocessing.Pool(processes, start_worker, (path,)) as pool:
+        for failure in get_failed_lists(archive_reader,
+                                        get_crawled_sources(archive_reader)):
+            letters.write(failure)
+        english_dicts, skipped = get_frontier(pool, archive_reader, prune,
+                                              reextract)
+
+        def get_page_dicts():
+            for dicts, failure in pool.imap(get_archived_translation_dicts,
+                                            english_dicts, chunksize=16):
+                if failure is not None:
+                    letters.write(failure)
+                yield dicts
+
+        name_translations.save_results(english_dicts, get_page_dicts(),
+                                       output_dir, formats, compression,
+                                       level)
+    return len(english_dicts), skipped, letters.count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a crawl from an archive of its pages.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = subparsers.add_parser(
+        "replay", help="run the crawl from the archive")
+    replay_parser.add_argument("--archive", default="pages.warc.gz",
+                               help="archive written by name_translations.py")
+    replay_parser.add_argument("--processes", type=int,
+                               help="number of processes (by default, one "
+                                    "per core)")
+    replay_parser.add_argument("--prune", action="store_true",
+                               help="skip links that do not lead to "
+                                    "articles")
+    replay_parser.add_argument("--extract-links", action="store_true",
+                               help="extract the links from the archived "
+                                    "list pages again, rather than use "
+                                    "the links recorded by the crawl")
+    output_writers.add_arguments(replay_parser)
+
+    args = parser.parse_args()
+    pages, skipped, failed = replay(
+        args.archive, args.output_dir,
+        args.formats or output_writers.DEFAULT_FORMATS, args.compression,
+        args.compression_level, args.prune, args.processes,
+        args.extract_links)
+    print(f"Replayed {pages} person pages to {args.output_dir}.")
+    if skipped > 0:
+        print(f"Skipped {skipped} pages that the crawl did not scrape.")
+    if failed > 0:
+        print(f"{failed} pages failed; see "
+              f"{os.path.join(args.output_dir, dead_letters.FILE_NAME)}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# page_urls.py
+
+"""
+This module puts Wikipedia URLs into a canonical form. It has no
+    dependencies, so programs that only handle results don't have to
+    import the crawler.
+"""
+
+# Import libraries.
+from urllib.parse import unquote, urlsplit
+
+
+def canonical_url(url):
+    """
+    Return a canonical form of a Wikipedia URL, so that differently
+        encoded links to the same page (for instance, "%C3%86thelstan"
+        and "Æthelstan") are treated as the same page.
+    """
+    parts = urlsplit(url)
+    path = unquote(parts.path).replace(" ", "_")
+    return parts.netloc.lower() + path
@@ -0,0 +1,159 @@
+# script_detection.py
+
+"""
+This module tells which writing system (script) a name is written in,
+    from the Unicode code points of its characters. It replaces the
+    per-language "fs" flag in languages.py for deciding whether a name is
+    in a familiar-ish script, since a language's flag is wrong whenever a
+    title uses another script (for instance, a Serbian or Kazakh title in
+    Latin rather than Cyrillic) and is missing for unknown languages.
+
+Code points are looked up in a sorted table of ranges. Characters that
+    belong to no particular script (spaces, digits, punctuation, and
+    combining marks) are ignored, and a text's script is the one that
+    most of its remaining characters belong to, or "Common" if none do.
+
+detect_script() classifies one text. detect_scripts() classifies a
+    whole pandas series at once, looking up the code points of every
+    text in a single numpy pass.
+"""
+
+# Import libraries.
+import bisect
+
+# Create a list of (first code point, last code point, script) ranges.
+#   The ranges cover letters only; anything outside them is "Common".
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, "Latin"), (0x0061, 0x007A, "Latin"),
+    (0x00AA, 0x00AA, "Latin"), (0x00BA, 0x00BA, "Latin"),
+    (0x00C0, 0x00D6, "Latin"), (0x00D8, 0x00F6, "Latin"),
+    (0x00F8, 0x02AF, "Latin"), (0x0370, 0x0373, "Greek"),
+    (0x0376, 0x03FF, "Greek"), (0x0400, 0x052F, "Cyrillic"),
+    (0x0531, 0x058F, "Armenian"), (0x0591, 0x05FF, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"), (0x0700, 0x074F, "Syriac"),
+    (0x0750, 0x077F, "Arabic"), (0x0780, 0x07BF, "Thaana"),
+    (0x07C0, 0x07FF, "NKo"), (0x0800, 0x083F, "Samaritan"),
+    (0x08A0, 0x08FF, "Arabic"), (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"), (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"), (0x0B00, 0x0B7F, "Oriya"),
+    (0x0B80, 0x0BFF, "Tamil"), (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"), (0x0D00, 0x0D7F, "Malayalam"),
+    (0x0D80, 0x0DFF, "Sinhala"), (0x0E00, 0x0E7F, "Thai"),
+    (0x0E80, 0x0EFF, "Lao"), (0x0F00, 0x0FFF, "Tibetan"),
+    (0x1000, 0x109F, "Myanmar"), (0x10A0, 0x10FF, "Georgian"),
+    (0x1100, 0x11FF, "Hangul"), (0x1200, 0x139F, "Ethiopic"),
+    (0x13A0, 0x13FF, "Cherokee"),
+    (0x1400, 0x167F, "Canadian Aboriginal"), (0x1680, 0x169F, "Ogham"),
+    (0x16A0, 0x16FF, "Runic"), (0x1780, 0x17FF, "Khmer"),
+    (0x1800, 0x18AF, "Mongolian"), (0x1950, 0x197F, "Tai Le"),
+    (0x1A00, 0x1A1F, "Buginese"), (0x1B00, 0x1B7F, "Balinese"),
+    (0x1B80, 0x1BBF, "Sundanese"), (0x1C50, 0x1C7F, "Ol Chiki"),
+    (0x1C80, 0x1C8F, "Cyrillic"), (0x1C90, 0x1CBF, "Georgian"),
+    (0x1D00, 0x1D25, "Latin"), (0x1D26, 0x1D2A, "Greek"),
+    (0x1D2B, 0x1D2B, "Cyrillic"), (0x1D2C, 0x1D7F, "Latin"),
+    (0x1E00, 0x1EFF, "Latin"), (0x1F00, 0x1FFF, "Greek"),
+    (0x2C00, 0x2C5F, "Glagolitic"), (0x2C60, 0x2C7F, "Latin"),
+    (0x2C80, 0x2CFF, "Coptic"), (0x2D00, 0x2D2F, "Georgian"),
+    (0x2D30, 0x2D7F, "Tifinagh"), (0x2D80, 0x2DDF, "Ethiopic"),
+    (0x2DE0, 0x2DFF, "Cyrillic"), (0x2E80, 0x2FDF, "Han"),
+    (0x3005, 0x3005, "Han"), (0x3007, 0x3007, "Han"),
+    (0x3021, 0x3029, "Han"), (0x3038, 0x303B, "Han"),
+    (0x3041, 0x309F, "Hiragana"), (0x30A1, 0x30FA, "Katakana"),
+    (0x30FD, 0x30FF, "Katakana"), (0x3105, 0x312F, "Bopomofo"),
+    (0x3131, 0x318F, "Hangul"), (0x31A0, 0x31BF, "Bopomofo"),
+    (0x31F0, 0x31FF, "Katakana"), (0x3400, 0x4DBF, "Han"),
+    (0x4E00, 0x9FFF, "Han"), (0xA000, 0xA4CF, "Yi"),
+    (0xA640, 0xA69F, "Cyrillic"), (0xA720, 0xA7FF, "Latin"),
+    (0xA980, 0xA9DF, "Javanese"), (0xAB30, 0xAB6F, "Latin"),
+    (0xAB70, 0xABBF, "Cherokee"), (0xAC00, 0xD7AF, "Hangul"),
+    (0xF900, 0xFAFF, "Han"), (0xFB00, 0xFB06, "Latin"),
+    (0xFB13, 0xFB17, "Armenian"), (0xFB1D, 0xFB4F, "Hebrew"),
+    (0xFB50, 0xFDFF, "Arabic"), (0xFE70, 0xFEFF, "Arabic"),
+    (0xFF21, 0xFF3A, "Latin"), (0xFF41, 0xFF5A, "Latin"),
+    (0xFF66, 0xFF9D, "Katakana"), (0x10330, 0x1034F, "Gothic"),
+    (0x20000, 0x2FA1F, "Han")
+    ]
+
+# Create a set of the scripts that count as familiar-ish. These are the
+#   scripts of the languages marked "fs": "Yes" in languages.py.
+FAMILIAR_SCRIPTS = {"Latin", "Cyrillic", "Greek", "Arabic"}
+
+COMMON = "Common"
+
+# Create the lookup arrays. Script number 0 is "Common".
+SCRIPTS = [COMMON] + sorted({script for start, end, script in
+                             SCRIPT_RANGES})
+RANGE_STARTS = [start for start, end, script in SCRIPT_RANGES]
+RANGE_ENDS = [end for start, end, script in SCRIPT_RANGES]
+RANGE_SCRIPTS = [SCRIPTS.index(script) for start, end, script in
+                 SCRIPT_RANGES]
+
+
+def get_script_number(code_point):
+    """
+    Return the number in SCRIPTS of the script of a code point.
+    """
+    position = bisect.bisect_right(RANGE_STARTS, code_point) - 1
+    if position >= 0 and code_point <= RANGE_ENDS[position]:
+        return RANGE_SCRIPTS[position]
+    return 0
+
+
+def detect_script(text):
+    """
+    Return the script that most of the letters in text are written in, or
+        "Common" if text has no letters.
+    """
+    counts = {}
+    for character in text:
+        number = get_script_number(ord(character))
+        if number != 0:
+            counts[number] = counts.get(number, 0) + 1
+    if not counts:
+        return COMMON
+    # Break ties in favor of the script that appears first.
+    return SCRIPTS[max(counts, key=counts.get)]
+
+
+def detect_scripts(texts):
+    """
+    Return a pandas series of the script of each text in a series of
+        texts, with the same index.
+    """
+    import numpy as np
+    import pandas as pd
+
+    texts = texts.fillna("").astype(str)
+    lengths = texts.str.len().to_numpy()
+    # Decode every text's code points at once.
+    code_points = np.frombuffer("".join(texts.tolist()).encode(
+        "utf-32-le"), dtype=np.uint32).astype(np.int64)
+    rows = np.repeat(np.arange(len(texts)), lengths)
+
+    # Look up the range of each code point.
+    starts = np.array(RANGE_STARTS, dtype=np.int64)
+    ends = np.array(RANGE_ENDS, dtype=np.int64)
+    range_scripts = np.array(RANGE_SCRIPTS, dtype=np.int64)
+    positions = np.searchsorted(starts, code_points, side="right") - 1
+    clipped = np.maximum(positions, 0)
+    in_range = (positions >= 0) & (code_points <= ends[clipped])
+    numbers = np.where(in_range, range_scripts[clipped], 0)
+
+    # Count each text's letters per script and keep the most common
+    #   script of each text. Ties go to the script that appears first.
+    letters = numbers != 0
+    rows = rows[letters]
+    numbers = numbers[letters]
+    first_seen = np.arange(len(numbers))
+    keys, first_index, counts = np.unique(
+        rows * len(SCRIPTS) + numbers, return_index=True,
+        return_counts=True)
+    key_rows = keys // len(SCRIPTS)
+    result = np.zeros(len(texts), dtype=np.int64)
+    if len(keys) > 0:
+        order = np.lexsort((first_seen[first_index], -counts, key_rows))
+        best = order[np.r_[True, key_rows[order][1:] !=
+                           key_rows[order][:-1]]]
+        result[key_rows[best]] = keys[best] % len(SCRIPTS)
+    return pd.Series(np.array(SCRIPTS, dtype=object)[result],
+                     index=texts.index)
@@ -0,0 +1,257 @@
+#! python3
+# sharded_crawl.py
+
+"""
+This program splits the crawl done by name_translations.py across
+    several worker processes or machines. It has three commands:
+
+        frontier    Scrapes the Wikipedia lists and saves the English
+                    language pages of all selected list items (the
+                    "frontier") to a shared directory.
+        worker      Scrapes the interlanguage links of one shard of the
+                    frontier and saves the results to the shared
+                    directory. Each page is assigned to a shard by a hash
+                    of its canonical URL, so every worker agrees on the
+                    split without talking to the others.
+        merge       Combines the frontier and all shard results into the
+                    same raw and derived csvs that name_translations.py
+                    produces.
+
+A list or page that fails is recorded in a dead-letter file of its own
+    command (see dead_letters.py) and skipped, so one failure does not
+    lose the work of a whole shard. The merge combines those files into
+    name_translations_failed.jsonl next to its output, and saves the
+    frontier there too, so the failed pages can be scraped again with
+    name_translations.py --retry-failed.
+
+For instance, to split the crawl across four workers:
+
+    python sharded_crawl.py frontier --dir shared
+    python sharded_crawl.py worker --dir shared --shard 0 --shards 4
+    ...
+    python sharded_crawl.py worker --dir shared --shard 3 --shards 4
+    python sharded_crawl.py merge --dir shared --shards 4
+
+The workers can run on separate hosts as long as they all point at the
+    same shared directory.
+"""
+
+# Import libraries.
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+import dead_letters
+import derive_names
+import name_translations
+import output_writers
+from page_urls import canonical_url
+
+# Name the files that the commands write to the shared directory.
+FRONTIER_FILE = "frontier.csv"
+SHARD_FILE = "shard-{shard}-of-{shards}.csv"
+FRONTIER_FAILURES_FILE = "frontier.failed.jsonl"
+SHARD_FAILURES_FILE = "shard-{shard}-of-{shards}.failed.jsonl"
+
+# Name the column that records each row's position in the frontier, so
+#   that the merge can restore the order of a single-process run.
+ORDER_COLUMN = "Order"
+
+
+def shard_of(url, shards):
+    """
+    Return the shard, from 0 to shards - 1, to which a URL belongs. This
+        uses a hash of the canonical URL rather than Python's hash(),
+        which is salted differently in every process.
+    """
+    digest = hashlib.md5(canonical_url(url).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def read_csv(path):
+    """
+    Read a csv written by this program, keeping every value as a string.
+        (Otherwise pandas would turn names such as "Nan" into NaN.)
+    """
+    return pd.read_csv(path, dtype=str, keep_default_na=False,
+                       encoding="utf-8")
+
+
+def write_csv(df, path):
+    """
+    Write a dataframe to a csv by way of a temporary file, so that a
+        worker on another host never sees a half-written file.
+    """
+    temp_path = path + ".tmp"
+    df.to_csv(temp_path, index=False, encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def open_dead_letters(path):
+    """
+    Return a dead_letters.DeadLetters for a new dead-letter file at path,
+        removing the file of an earlier run of the same command.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    return dead_letters.DeadLetters(path)
+
+
+def build_frontier(directory, plan=None):
+    """
+    Scrape the Wikipedia lists, or read the frontier of a plan saved by
+        crawl_plan.py, and save the frontier to directory. The lists that
+        cannot be scraped are recorded in directory's
+        FRONTIER_FAILURES_FILE.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open_dead_letters(os.path.join(directory,
+                                        FRONTIER_FAILURES_FILE)) as letters:
+        if plan is not None:
+            with open(plan, encoding="utf-8") as plan_file:
+                english_dicts = json.load(plan_file)["frontier"]
+        else:
+            english_dicts = name_translations.get_frontier(letters=letters)
+    write_csv(pd.DataFrame(english_dicts),
+              os.path.join(directory, FRONTIER_FILE))
+    print(f"Saved {len(english_dicts)} pages to the frontier.")
+    if letters.count > 0:
+        print(f"{letters.count} lists failed; see {letters.path}.")
+
+
+def run_worker(directory, shard, shards):
+    """
+    Scrape the pages of the frontier that belong to shard and save their
+        interlanguage links to directory. The pages that cannot be
+        scraped or parsed are recorded in the shard's SHARD_FAILURES_FILE.
+    """
+    frontier = read_csv(os.path.join(directory, FRONTIER_FILE))
+    translation_dicts = []
+    failures_path = os.path.join(directory, SHARD_FAILURES_FILE.format(
+        shard=shard, shards=shards))
+    with open_dead_letters(failures_path) as letters:
+        for order, english_dict in enumerate(frontier.to_dict("records")):
+            if shard_of(english_dict["URL"], shards) != shard:
+                continue
+            for translation_dict in name_translations.get_translation_dicts(
+                    english_dict, letters=letters):
+                translation_dict[ORDER_COLUMN] = order
+                translation_dicts.append(translation_dict)
+    df = pd.DataFrame(translation_dicts,
+                      columns=list(frontier.columns) + [ORDER_COLUMN])
+    write_csv(df, os.path.join(
+        directory, SHARD_FILE.format(shard=shard, shards=shards)))
+    print(f"Saved {len(df)} rows for shard {shard} of {shards}.")
+    if letters.count > 0:
+        print(f"{letters.count} pages failed; see {failures_path}.")
+
+
+def merge(directory, shards, output):
+    """
+    Combine the frontier and the results of all shards into raw results
+        and derived names identical to the ones name_translations.py
+        writes. The raw results are saved next to output, with "_raw"
+        added to the file name, and so are the frontier and the failures
+        of every command, as name_translations.py saves them, so that
+        name_translations.py --retry-failed can scrape the failed pages
+        again (if output has its default name).
+    """
+    frontier = read_csv(os.path.join(directory, FRONTIER_FILE))
+    shard_paths = [
+        os.path.join(directory, SHARD_FILE.format(shard=shard,
+                                                  shards=shards))
+        for shard in range(shards)]
+    missing = [path for path in shard_paths if not os.path.exists(path)]
+    if missing:
+        raise SystemExit("Missing shard results: " + ", ".join(missing))
+    translations = pd.concat([read_csv(path) for path in shard_paths],
+                             ignore_index=True)
+    # Drop rows that appear twice, for instance because a shard's
+    #   results were copied into the directory more than once.
+    translations = translations.drop_duplicates()
+    # Put the rows back in frontier order, as name_translations.py saves
+    #   them: the English language pages first, and then each page's
+    #   interlanguage links, in the order in which they appeared on the
+    #   page, leaving out people already seen.
+    translations[ORDER_COLUMN] = translations[ORDER_COLUMN].astype(int)
+    english_dicts = frontier.to_dict("records")
+    page_dicts = [[] for english_dict in english_dicts]
+    for order, rows in translations.groupby(ORDER_COLUMN):
+        page_dicts[order] = rows.drop(columns=ORDER_COLUMN).to_dict(
+            "records")
+    raw_dicts = [english_dict for english_dict in english_dicts
+                 if english_dict["Language Code"] == "en"]
+    for dicts, derive_dicts in name_translations.resolve_page_dicts(
+            english_dicts, page_dicts):
+        raw_dicts.extend(dicts)
+    raw = pd.DataFrame(raw_dicts, columns=frontier.columns)
+    root, extension = os.path.splitext(output)
+    raw.to_csv(root + "_raw" + extension, index=False, encoding="utf-8")
+    df = derive_names.derive_frame(raw)
+    df.to_csv(output, encoding="utf-8-sig")
+    print(f"Saved {len(df)} rows to {output}.")
+
+    output_dir = os.path.dirname(output)
+    with open(os.path.join(output_dir, output_writers.FRONTIER_NAME), "w",
+              encoding="utf-8") as frontier_file:
+        json.dump({"frontier": english_dicts}, frontier_file,
+                  ensure_ascii=False)
+    failures_path = os.path.join(output_dir, dead_letters.FILE_NAME)
+    with open_dead_letters(failures_path) as letters:
+        for path in [os.path.join(directory, FRONTIER_FAILURES_FILE)] + [
+                os.path.join(directory, SHARD_FAILURES_FILE.format(
+                    shard=shard, shards=shards))
+                for shard in range(shards)]:
+            for failure in dead_letters.read_dead_letters(path):
+                letters.write(failure)
+    if letters.count > 0:
+        print(f"{letters.count} pages failed; see {failures_path}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split the name translations crawl into shards.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    frontier_parser = subparsers.add_parser(
+        "frontier", help="scrape the lists and save the frontier")
+    frontier_parser.add_argument("--dir", required=True,
+                                 help="shared directory")
+    frontier_parser.add_argument("--plan",
+                                 help="plan saved by crawl_plan.py to use "
+                                      "instead of scraping the lists")
+
+    worker_parser = subparsers.add_parser(
+        "worker", help="scrape one shard of the frontier")
+    worker_parser.add_argument("--dir", required=True,
+                               help="shared directory")
+    worker_parser.add_argument("--shard", type=int, required=True,
+                               help="shard to scrape, from 0")
+    worker_parser.add_argument("--shards", type=int, required=True,
+                               help="total number of shards")
+
+    merge_parser = subparsers.add_parser(
+        "merge", help="combine the shards into one csv")
+    merge_parser.add_argument("--dir", required=True,
+                              help="shared directory")
+    merge_parser.add_argument("--shards", type=int, required=True,
+                              help="total number of shards")
+    merge_parser.add_argument("--output", default="name_translations.csv",
+                              help="path of the csv to write")
+
+    args = parser.parse_args()
+    if args.command == "frontier":
+        build_frontier(args.dir, args.plan)
+    elif args.command == "worker":
+        if not 0 <= args.shard < args.shards:
+            parser.error("--shard must be between 0 and --shards - 1")
+        run_worker(args.dir, args.shard, args.shards)
+    else:
+        merge(args.dir, args.shards, args.output)
+
+
+if __name__ == "__main__":
+    main()
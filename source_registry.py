@@ -0,0 +1,62 @@
+# source_registry.py
+
+"""
+This module reads the Wikipedia lists that name_translations.py scrapes
+    from a config file (sources.json), so that lists can be added, or a
+    single list run, without changing the code.
+
+The config file has two parts:
+
+        strategies  The ways in which links of interest are selected
+                    from a list, by name. Each has a CSS selector, for
+                    reading, and the equivalent XPath expression, which is
+                    what is run.
+        sources     The lists, in the order in which they are scraped.
+                    Each has a name, a URL, and the name of a strategy. A
+                    list that needs more than one strategy appears once
+                    for each, and is still only scraped once.
+
+Each strategy's XPath expression is compiled once, when the config is
+    read, and run with lxml on each list's parse tree.
+"""
+
+# Import libraries.
+import json
+import os
+
+from lxml import etree
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "sources.json")
+
+
+def load_config(path=DEFAULT_PATH):
+    """
+    Read a config file and return a dictionary from each strategy's name
+        to its compiled XPath expression, and a list of (URL, name,
+        strategy) tuples for the sources.
+    """
+    with open(path, encoding="utf-8") as config_file:
+        config = json.load(config_file)
+    strategies = {name: etree.XPath(strategy["xpath"])
+                  for name, strategy in config["strategies"].items()}
+    list_sources = []
+    for source in config["sources"]:
+        if source["strategy"] not in strategies:
+            raise ValueError(f"{source['name']} has an unknown strategy: "
+                             f"{source['strategy']}")
+        list_sources.append((source["url"], source["name"],
+                             source["strategy"]))
+    return strategies, list_sources
+
+
+def select_sources(list_sources, names):
+    """
+    Return the sources in list_sources with the given names, in the order
+        of list_sources. Raise a ValueError if a name is not a source.
+    """
+    unknown = set(names) - {name for url, name, style in list_sources}
+    if unknown:
+        raise ValueError("Unknown sources: " + ", ".join(sorted(unknown)))
+    return [list_source for list_source in list_sources
+            if list_source[1] in names]
@@ -0,0 +1,416 @@
+# stage_profiler.py
+
+"""
+This module profiles each stage of a crawl, so that it can be seen at a
+    glance which stage, and which function in it, makes a run slow or
+    memory-hungry. The stages are:
+
+        list_fetch          Downloading (or reading from the cache) the
+                            Wikipedia lists.
+        link_extraction     Parsing the lists and selecting their links.
+        person_fetch        Downloading the person pages.
+        person_parse        Parsing the person pages' interlanguage links.
+        normalisation       Cleaning titles into names and detecting their
+                            scripts (derive_names.derive_frame).
+        row_building        Building dataframes from the raw dictionaries
+                            and dictionaries from the derived dataframes.
+        output              Writing rows to every output.
+
+The pipeline marks each stage with stage(). Unless profiling has been
+    started, stage() does nothing. Run name_translations.py with
+    --profile cpu, --profile memory, or --profile time to start it; the
+    reports are saved to the output directory when the run ends:
+
+        cpu     Each stage runs under its own cProfile profiler. For each
+                stage, profile_cpu_<stage>.prof holds the raw statistics
+                (for pstats or snakeviz) and profile_cpu_<stage>.folded
+                the time in microseconds of each call stack, in the
+                collapsed format read by flamegraph.pl and speedscope.
+                profile_cpu.txt lists the functions that take the most
+                time in each stage.
+        memory  Allocations are traced with tracemalloc. Each stage's peak
+                is measured every time it runs, and its allocations are
+                sampled, by comparing snapshots, once in SAMPLE_EVERY
+                runs. profile_memory_<stage>.folded holds the bytes still
+                allocated at the end of the sampled runs by each call
+                stack, and profile_memory.txt lists each stage's peak and
+                its top allocation sites. tracemalloc only sees memory
+                allocated through Python, so the parse trees that lxml
+                builds in libxml2 are left out, and the peaks of
+                link_extraction and person_parse are too low; measure
+                those with the process's peak RSS instead (as
+                benchmarks/bench_list_phase.py does).
+        time    Each run of each stage is timed, without the time of any
+                stage run within it. profile_time.txt lists each stage's
+                total time and the percentiles of its runs' latencies.
+                This adds almost nothing to a run, so the benchmarks use
+                it (see benchmarks/bench.py).
+
+While profiling, output_writers.FanOutWriter writes in the calling
+    thread, so that the output stage is profiled like the others.
+"""
+
+# Import libraries.
+import contextlib
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+
+MODES = ["cpu", "memory", "time"]
+
+# Name the percentiles of each stage's latencies that are reported.
+PERCENTILES = [50, 95, 99]
+
+# Set how many runs of each stage pass between allocation samples, and
+#   how many frames of each allocation's call stack are traced.
+SAMPLE_EVERY = 20
+TRACEBACK_FRAMES = 25
+
+# Set the number of functions or allocation sites listed per stage.
+TOP_COUNT = 15
+
+# Set the least time, in seconds, that a call stack must take to be
+#   written to a cpu stack file.
+MIN_STACK_SECONDS = 1e-6
+
+# Name the call that ends each profiled run, which is left out of the
+#   stack files.
+PROFILER_DISABLE = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+profiler = None
+null_stage = contextlib.nullcontext()
+
+
+def stage(name):
+    """
+    Return a context manager that profiles the code run within it as
+        part of the stage name, if profiling has been started.
+    """
+    if profiler is None:
+        return null_stage
+    return profiler.stage(name)
+
+
+def is_profiling():
+    return profiler is not None
+
+
+def start(mode):
+    """
+    Start profiling the stages of the pipeline in mode ("cpu",
+        "memory", or "time").
+    """
+    global profiler
+    if mode == "cpu":
+        profiler = CpuProfiler()
+    elif mode == "memory":
+        profiler = MemoryProfiler()
+    elif mode == "time":
+        profiler = TimingProfiler()
+    else:
+        raise ValueError(f"Unknown profile mode: {mode}")
+
+
+def stop(output_dir):
+    """
+    Stop profiling and save the reports to output_dir. Return a list of
+        the paths saved.
+    """
+    global profiler
+    if profiler is None:
+        return []
+    finished, profiler = profiler, None
+    finished.close()
+    os.makedirs(output_dir, exist_ok=True)
+    return finished.save(output_dir)
+
+
+def get_label(filename, lineno, function=None):
+    """
+    Return a frame's label in a stack file, such as
+        "get_page (name_translations.py:105)".
+    """
+    location = f"{os.path.basename(filename)}:{lineno}"
+    if function is None:
+        label = location
+    elif filename == "~":
+        label = function
+    else:
+        label = f"{function} ({location})"
+    # Semicolons separate frames in the collapsed format.
+    return label.replace(";", ":")
+
+
+def get_percentile(values, percentile):
+    """
+    Return a percentile of a sorted list of values, by the nearest rank.
+    """
+    rank = max(-(-len(values) * percentile // 100), 1)
+    return values[rank - 1]
+
+
+def write_stacks(stacks, path):
+    """
+    Write a dictionary from each call stack (a tuple of labels, outermost
+        first) to its weight in the collapsed format.
+    """
+    with open(path, "w", encoding="utf-8") as stack_file:
+        for stack, weight in sorted(stacks.items()):
+            if weight > 0:
+                stack_file.write(f"{';'.join(stack)} {weight}\n")
+
+
+class StageProfiler:
+    """
+    Keep the stack of stages running, so that a stage run within another
+        pauses the outer stage's profiling until it ends.
+    """
+
+    def __init__(self):
+        self.stages = []
+        self.calls = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.stages:
+            self.pause(self.stages[-1])
+        self.stages.append(name)
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit(name)
+            self.stages.pop()
+            if self.stages:
+                self.resume(self.stages[-1])
+
+    def close(self):
+        pass
+
+
+class CpuProfiler(StageProfiler):
+
+    def __init__(self):
+        super().__init__()
+        self.profiles = {}
+        self.seconds = {}
+        self.started = {}
+
+    def resume(self, name):
+        if name not in self.profiles:
+            self.profiles[name] = cProfile.Profile()
+        self.started[name] = time.perf_counter()
+        self.profiles[name].enable()
+
+    def pause(self, name):
+        self.profiles[name].disable()
+        self.seconds[name] = (self.seconds.get(name, 0) +
+                              time.perf_counter() - self.started[name])
+
+    enter = resume
+    exit = pause
+
+    def get_stacks(self, stats):
+        """
+        Return a dictionary from each call stack in a pstats.Stats to
+            its time in microseconds. A function's time is shared among
+            the stacks that call it in proportion to the time of each
+            call, since cProfile only records callers and not whole
+            stacks.
+        """
+        callees = {}
+        roots = []
+        for function, (cc, nc, tt, ct, callers) in stats.stats.items():
+            if function[2] == PROFILER_DISABLE:
+                continue
+            if not callers:
+                roots.append(function)
+            for caller, edge in callers.items():
+                callees.setdefault(caller, []).append((function, edge[3]))
+
+        stacks = {}
+
+        def walk(function, share, path):
+            cc, nc, tt, ct, callers = stats.stats[function]
+            path = path + (get_label(*function),)
+            stacks[path] = stacks.get(path, 0) + round(tt * share * 1e6)
+            for callee, edge_seconds in callees.get(function, []):
+                callee_seconds = stats.stats[callee][3]
+                if callee in walked or callee_seconds <= 0:
+                    continue
+                callee_share = share * edge_seconds / callee_seconds
+                if callee_share * callee_seconds >= MIN_STACK_SECONDS:
+                    walked.add(callee)
+                    walk(callee, callee_share, path)
+                    walked.discard(callee)
+
+        for root in roots:
+            walked = {root}
+            walk(root, 1, ())
+        return stacks
+
+    def save(self, output_dir):
+        paths = []
+        summary_path = os.path.join(output_dir, "profile_cpu.txt")
+        with open(summary_path, "w", encoding="utf-8") as summary:
+            summary.write(f"{'Stage':<20}{'Runs':>10}{'Seconds':>12}\n")
+            for name, profile in self.profiles.items():
+                summary.write(f"{name:<20}{self.calls[name]:>10}"
+                              f"{self.seconds[name]:>12.3f}\n")
+            for name, profile in self.profiles.items():
+                stats_path = os.path.join(output_dir,
+                                          f"profile_cpu_{name}.prof")
+                profile.dump_stats(stats_path)
+                stats = pstats.Stats(profile, stream=summary)
+                summary.write(f"\n{name}\n")
+                stats.sort_stats("tottime").print_stats(TOP_COUNT)
+                stacks_path = os.path.join(output_dir,
+                                           f"profile_cpu_{name}.folded")
+                write_stacks(self.get_stacks(stats), stacks_path)
+                paths.extend([stats_path, stacks_path])
+        return [summary_path] + paths
+
+
+class MemoryProfiler(StageProfiler):
+
+    def __init__(self):
+        super().__init__()
+        # Keep a [traced memory at the start, snapshot or None, peak so
+        #   far] list for each stage running.
+        self.states = []
+        self.peaks = {}
+        self.samples = {}
+        self.retained = {}
+        tracemalloc.start(TRACEBACK_FRAMES)
+
+    def take_snapshot(self):
+        # Leave out the profiler's own allocations.
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__, all_frames=True)])
+
+    def enter(self, name):
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = None
+        if (self.calls[name] - 1) % SAMPLE_EVERY == 0:
+            snapshot = self.take_snapshot()
+        tracemalloc.reset_peak()
+        self.states.append([current, snapshot, current])
+
+    def pause(self, name):
+        # Keep the outer stage's peak so far, since an inner stage
+        #   resets the peak. Once the inner stage ends, the peak since
+        #   then includes the inner stage's, which is also the outer's.
+        state = self.states[-1]
+        state[2] = max(state[2], tracemalloc.get_traced_memory()[1])
+
+    resume = pause
+
+    def exit(self, name):
+        self.pause(name)
+        start, snapshot, peak = self.states.pop()
+        self.peaks[name] = max(self.peaks.get(name, 0), peak - start)
+        if snapshot is not None:
+            self.samples[name] = self.samples.get(name, 0) + 1
+            retained = self.retained.setdefault(name, {})
+            for difference in self.take_snapshot().compare_to(
+                    snapshot, "traceback"):
+                if difference.size_diff > 0:
+                    key = tuple(difference.traceback)
+                    retained[key] = (retained.get(key, 0) +
+                                     difference.size_diff)
+
+    def close(self):
+        tracemalloc.stop()
+
+    def save(self, output_dir):
+        paths = []
+        summary_path = os.path.join(output_dir, "profile_memory.txt")
+        with open(summary_path, "w", encoding="utf-8") as summary:
+            summary.write(f"{'Stage':<20}{'Runs':>10}{'Sampled':>10}"
+                          f"{'Peak MB':>12}\n")
+            for name in self.calls:
+                summary.write(f"{name:<20}{self.calls[name]:>10}"
+                              f"{self.samples.get(name, 0):>10}"
+                              f"{self.peaks.get(name, 0) / 2 ** 20:>12.2f}"
+                              "\n")
+            for name, retained in self.retained.items():
+                summary.write(f"\n{name}: top allocation sites still "
+                              f"allocated at the end of "
+                              f"{self.samples[name]} sampled runs\n")
+                sites = {}
+                for traceback, size in retained.items():
+                    site = traceback[-1]
+                    sites[site] = sites.get(site, 0) + size
+                for site, size in sorted(sites.items(),
+                                         key=lambda item: -item[1]
+                                         )[:TOP_COUNT]:
+                    summary.write(f"{size / 1024:>12.1f} KiB  "
+                                  f"{site.filename}:{site.lineno}\n")
+                stacks_path = os.path.join(output_dir,
+                                           f"profile_memory_{name}.folded")
+                write_stacks({tuple(get_label(frame.filename, frame.lineno)
+                                    for frame in traceback): size
+                              for traceback, size in retained.items()},
+                             stacks_path)
+                paths.append(stacks_path)
+        return [summary_path] + paths
+
+
+class TimingProfiler(StageProfiler):
+
+    def __init__(self):
+        super().__init__()
+        # Keep a [start, seconds paused, start of the pause] list for each
+        #   stage running.
+        self.states = []
+        self.durations = {}
+
+    def enter(self, name):
+        self.states.append([time.perf_counter(), 0, None])
+
+    def pause(self, name):
+        self.states[-1][2] = time.perf_counter()
+
+    def resume(self, name):
+        state = self.states[-1]
+        state[1] += time.perf_counter() - state[2]
+
+    def exit(self, name):
+        start, paused, pause_start = self.states.pop()
+        self.durations.setdefault(name, []).append(
+            time.perf_counter() - start - paused)
+
+    def get_summary(self):
+        """
+        Return a dictionary from each stage to a dictionary of its number
+            of runs, its total seconds, and the percentiles of its runs'
+            latencies in milliseconds (such as "p95_ms").
+        """
+        summary = {}
+        for name, durations in self.durations.items():
+            durations = sorted(durations)
+            summary[name] = {"runs": len(durations),
+                             "seconds": sum(durations)}
+            for percentile in PERCENTILES:
+                summary[name][f"p{percentile}_ms"] = get_percentile(
+                    durations, percentile) * 1000
+        return summary
+
+    def save(self, output_dir):
+        summary_path = os.path.join(output_dir, "profile_time.txt")
+        with open(summary_path, "w", encoding="utf-8") as summary_file:
+            summary_file.write(f"{'Stage':<20}{'Runs':>10}{'Seconds':>12}" +
+                               "".join(f"{f'p{percentile} ms':>12}"
+                                       for percentile in PERCENTILES) +
+                               "\n")
+            for name, stage_summary in self.get_summary().items():
+                summary_file.write(
+                    f"{name:<20}{stage_summary['runs']:>10}"
+                    f"{stage_summary['seconds']:>12.3f}" +
+                    "".join(f"{stage_summary[f'p{percentile}_ms']:>12.3f}"
+                            for percentile in PERCENTILES) + "\n")
+        return [summary_path]
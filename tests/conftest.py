@@ -0,0 +1,89 @@
+# conftest.py
+
+"""
+This module sets up the tests: it makes the programs in the repository
+    and the benchmark fixtures importable, and provides pytest fixtures
+    that serve synthetic pages in place of Wikipedia and run crawls on
+    them.
+"""
+
+# Import libraries.
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "benchmarks"))
+
+import fixtures
+import name_translations
+
+# Name a few small lists to crawl, so that the tests run quickly, and
+#   add lists on other wikis. The lists on other wikis are versions of
+#   English language lists, one of which is crawled too, so that some of
+#   their people are already on other lists.
+SOURCES = ["List of Belgian monarchs", "List of English monarchs",
+           "List of Roman women"]
+FOREIGN_SOURCES = [
+    ("https://fr.wikipedia.org/wiki/Liste_des_monarques_de_France",
+     "Liste des monarques de France", "first_columns"),
+    ("https://de.wikipedia.org/wiki/Liste_der_Herrscher_Frankreichs",
+     "Liste der Herrscher Frankreichs", "first_li_links"),
+    ("https://it.wikipedia.org/wiki/Sovrani_del_Belgio",
+     "Sovrani del Belgio", "first_columns")]
+TRANSLATIONS = {
+    FOREIGN_SOURCES[0][0]:
+        "https://en.wikipedia.org/wiki/List_of_French_monarchs",
+    FOREIGN_SOURCES[1][0]:
+        "https://en.wikipedia.org/wiki/List_of_French_monarchs",
+    FOREIGN_SOURCES[2][0]:
+        "https://en.wikipedia.org/wiki/List_of_Belgian_monarchs"}
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """
+    Crawl only the lists above, and serve small fixture pages in place of
+        name_translations.get_page.
+    """
+    monkeypatch.setattr(name_translations, "list_sources",
+                        name_translations.get_list_sources(SOURCES) +
+                        FOREIGN_SOURCES)
+    fixture_pages = fixtures.FixturePages(list_rows=5, languages=6,
+                                          translations=TRANSLATIONS)
+    monkeypatch.setattr(name_translations, "get_page",
+                        fixture_pages.get_page)
+    return fixture_pages
+
+
+@pytest.fixture
+def crawl(pages):
+    """
+    Return a function that runs name_translations.py on the fixture pages
+        with the given arguments, writing csvs to output_dir, and returns
+        output_dir.
+    """
+    def run_crawl(output_dir, *arguments):
+        with contextlib.redirect_stdout(io.StringIO()):
+            name_translations.main(["--output-dir", str(output_dir),
+                                    "--format", "csv", *arguments])
+        return output_dir
+
+    return run_crawl
+
+
+def read_outputs(output_dir):
+    """
+    Return a dictionary from the name of each csv in output_dir to its
+        contents.
+    """
+    outputs = {}
+    for name in sorted(os.listdir(output_dir)):
+        if name.endswith(".csv"):
+            with open(os.path.join(output_dir, name), "rb") as file:
+                outputs[name] = file.read()
+    return outputs
@@ -0,0 +1,47 @@
+# test_bench.py
+
+"""
+These tests check that bench.py compare only flags changes that its runs
+    can show.
+"""
+
+# Import libraries.
+import random
+
+import bench
+
+
+def make_runs(version, values):
+    """
+    Return results of runs of version, one for each value of the metrics.
+    """
+    return [{"version": version, "settings": {},
+             "metrics": {"pages_per_second": 1000 / value, "seconds": value,
+                         "link_extraction.p50_ms": value / 10}}
+            for value in values]
+
+
+def get_verdicts(runs):
+    return {row[0]: row[6] for row in bench.compare(runs, "base",
+                                                    "candidate")}
+
+
+def test_identical_runs_are_not_flagged():
+    rng = random.Random(0)
+    for count in [2, 3, bench.MIN_RUNS, 10]:
+        values = [rng.gauss(10, 1) for run in range(count)]
+        runs = (make_runs("base", values) +
+                make_runs("candidate", values[::-1]))
+        assert set(get_verdicts(runs).values()) == {""}
+
+
+def test_few_runs_are_not_flagged():
+    # Two runs each differ by far more than --min-change, but are too few
+    #   to show it.
+    runs = make_runs("base", [10.0, 10.1]) + make_runs("candidate",
+                                                       [12.0, 12.1])
+    assert set(get_verdicts(runs).values()) == {""}
+
+    runs = (make_runs("base", [10.0, 10.1] * 3) +
+            make_runs("candidate", [12.0, 12.1] * 3))
+    assert set(get_verdicts(runs).values()) == {"regression"}
@@ -0,0 +1,117 @@
+# test_foreign_seeds.py
+
+"""
+These tests crawl fixture lists on other wikis as well as English
+    language ones, and check that replaying the crawl, splitting it into
+    shards, and retrying its failed pages (in a single crawl or in
+    shards) all give the same outputs as a crawl that scrapes everything
+    at once.
+"""
+
+# Import libraries.
+import os
+
+import derive_names
+import name_translations
+import output_writers
+import page_archive
+import sharded_crawl
+from conftest import FOREIGN_SOURCES, read_outputs
+
+
+def read_raw(output_dir):
+    return derive_names.read_raw(os.path.join(
+        output_dir, output_writers.RAW_NAME + ".csv"))
+
+
+def get_seeds(language_code):
+    """
+    Return the frontier's dictionaries for the pages on the wiki of
+        language_code.
+    """
+    return [english_dict for english_dict in name_translations.get_frontier()
+            if english_dict["Language Code"] == language_code]
+
+
+def test_crawl_of_foreign_seeds(tmp_path, crawl):
+    raw = read_raw(crawl(tmp_path / "crawled"))
+    # The people on the German list are those on the French one, and the
+    #   people on the Italian list are those on the English language list
+    #   of Belgian monarchs, so the German seeds are left out, and so are
+    #   the Italian seeds whose pages link to English language pages.
+    seeds = {(english_dict["Language Code"], english_dict["Title"])
+             for code in ["fr", "de", "it"]
+             for english_dict in get_seeds(code)}
+    seed_rows = raw[[key in seeds for key in
+                     zip(raw["Language Code"], raw["Title"])]]
+    counts = seed_rows["Language Code"].value_counts()
+    assert counts["fr"] == len(get_seeds("fr"))
+    assert "de" not in counts
+    assert 0 < counts["it"] < len(get_seeds("it"))
+    # Each seed saved is under the URL of its own person.
+    assert seed_rows["URL"].is_unique
+    assert seed_rows["URL"].str.startswith(
+        "https://www.wikidata.org/").any()
+
+
+def test_replay_of_foreign_seeds(tmp_path, crawl):
+    archive_path = tmp_path / "pages.warc.gz"
+    crawled = crawl(tmp_path / "crawled", "--archive", str(archive_path))
+    for reextract in [False, True]:
+        replayed = tmp_path / f"replayed-{reextract}"
+        page_archive.replay(str(archive_path), str(replayed), ["csv"],
+                            processes=2, reextract=reextract)
+        assert read_outputs(replayed) == read_outputs(crawled)
+
+
+def test_merge_of_foreign_seeds(tmp_path, crawl):
+    crawled = crawl(tmp_path / "crawled")
+    shared = str(tmp_path / "shared")
+    sharded_crawl.build_frontier(shared)
+    for shard in range(3):
+        sharded_crawl.run_worker(shared, shard, 3)
+    merged = tmp_path / "merged"
+    merged.mkdir()
+    sharded_crawl.merge(shared, 3, str(merged / "name_translations.csv"))
+    assert read_outputs(merged) == read_outputs(crawled)
+
+
+def test_retry_of_foreign_seeds(tmp_path, crawl, pages):
+    crawled = crawl(tmp_path / "crawled")
+    # Fail the last list, a page on it, and pages on the other lists,
+    #   both for people who are on other lists and for people who are
+    #   not.
+    french_seeds = get_seeds("fr")
+    pages.failing = {FOREIGN_SOURCES[-1][0], french_seeds[0]["URL"],
+                     french_seeds[-1]["URL"], get_seeds("de")[0]["URL"],
+                     get_seeds("en")[1]["URL"]}
+    retried = crawl(tmp_path / "retried")
+    assert read_outputs(retried) != read_outputs(crawled)
+
+    pages.failing = set()
+    crawl(retried, "--retry-failed")
+    assert read_outputs(retried) == read_outputs(crawled)
+    assert not os.path.exists(os.path.join(retried, "name_translations_"
+                                                    "failed.jsonl"))
+
+
+def test_sharded_retry_of_foreign_seeds(tmp_path, crawl, pages):
+    crawled = crawl(tmp_path / "crawled")
+    # Fail the last list while the frontier is built, and pages in the
+    #   shards, which go on with their other pages.
+    pages.failing = {FOREIGN_SOURCES[-1][0], get_seeds("fr")[0]["URL"],
+                     get_seeds("en")[1]["URL"]}
+    shared = str(tmp_path / "shared")
+    sharded_crawl.build_frontier(shared)
+    for shard in range(3):
+        sharded_crawl.run_worker(shared, shard, 3)
+    merged = tmp_path / "merged"
+    merged.mkdir()
+    sharded_crawl.merge(shared, 3, str(merged / "name_translations.csv"))
+    assert read_outputs(merged) != read_outputs(crawled)
+
+    pages.failing = set()
+    crawl(merged, "--retry-failed")
+    assert read_outputs(merged) == read_outputs(crawled)
+    assert not os.path.exists(os.path.join(merged, "name_translations_"
+                                                   "failed.jsonl"))
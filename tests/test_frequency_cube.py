@@ -0,0 +1,34 @@
+# test_frequency_cube.py
+
+"""
+These tests check the counts that frequency_cube.py answers from its
+    database.
+"""
+
+# Import libraries.
+import pandas as pd
+
+import frequency_cube
+
+
+def make_row(english_name, language, name, familiar, url):
+    return {"Name (English)": english_name, "Language": language,
+            "Name": name, "Familiar-ish Script": familiar,
+            "Source": "List of Serbian monarchs", "URL": url}
+
+
+def test_coverage_counts_each_person_once(tmp_path):
+    # The first person has names in Serbian in both kinds of script.
+    path = str(tmp_path / "cube.sqlite")
+    frequency_cube.build_cube(pd.DataFrame([
+        make_row("Peter", "Serbian", "Petar", "Yes", "/wiki/Peter_I"),
+        make_row("Peter", "Serbian", "Петар", "No", "/wiki/Peter_I"),
+        make_row("Milan", "Serbian", "Милан", "No", "/wiki/Milan_I"),
+        make_row("Milan", "German", "Milan", "Yes", "/wiki/Milan_I")]),
+        path)
+    connection = frequency_cube.connect(path)
+    assert frequency_cube.language_coverage(connection, False) == [
+        ("Serbian", 3, 2, 1.0), ("German", 1, 1, 0.5)]
+    assert sorted(frequency_cube.language_coverage(connection)) == [
+        ("German", 1, 1, 0.5), ("Serbian", 1, 1, 0.5)]
+    connection.close()
@@ -0,0 +1,98 @@
+# test_frontier_pruning.py
+
+"""
+These tests check that crawls with --prune drop the links of list pages
+    that do not lead to articles, and report what they dropped.
+"""
+
+# Import libraries.
+import json
+import os
+
+import frontier_pruning
+import name_translations
+import output_writers
+import page_archive
+from conftest import FOREIGN_SOURCES, read_outputs
+
+BELGIAN_MONARCHS = "https://en.wikipedia.org/wiki/List_of_Belgian_monarchs"
+FRENCH_MONARCHS = FOREIGN_SOURCES[0]
+
+
+def read_frontier(output_dir):
+    """
+    Return the URLs of the frontier saved to output_dir.
+    """
+    with open(os.path.join(output_dir, output_writers.FRONTIER_NAME),
+              encoding="utf-8") as frontier_file:
+        return [english_dict["URL"] for english_dict in
+                json.load(frontier_file)["frontier"]]
+
+
+def serve_list(pages, url, links):
+    """
+    Serve a list page at url with a table whose first column holds the
+        (href, title) tuples in links.
+    """
+    rows = "".join(f'<tr><td><a href="{href}" title="{title}">x</a></td>'
+                   f"</tr>" for href, title in links)
+    pages.pages[url] = (f'<html><body><table class="wikitable">{rows}'
+                        "</table></body></html>")
+
+
+def test_crawl_reports_pruning(tmp_path, pages, capsys):
+    serve_list(pages, BELGIAN_MONARCHS, [
+        ("/wiki/Leopold_I", "Leopold I"),
+        ("/wiki/Category:Kings", "Category:Kings"),
+        ("/wiki/Help:IPA", "Help:IPA"),
+        ("/wiki/List_of_Belgian_queens", "List of Belgian queens")])
+    name_translations.main(["--output-dir", str(tmp_path), "--format",
+                            "csv", "--source", "List of Belgian monarchs",
+                            "--prune"])
+    output = capsys.readouterr().out
+    assert "Links dropped by pruning:" in output
+    for reason in ["namespace Category", "namespace Help", "list"]:
+        assert f"     1  {reason}\n" in output
+    assert "     3  List of Belgian monarchs\n" in output
+
+
+def test_links_from_foreign_list(pages):
+    serve_list(pages, FRENCH_MONARCHS[0], [
+        ("/wiki/Louis_IX", "Louis IX"),
+        ("/wiki/Fichier:Blason.svg", "Fichier:Blason.svg"),
+        ("/wiki/Cat%C3%A9gorie:Rois_de_France", "Catégorie:Rois de France"),
+        ("/wiki/Aide:Alphabet_phon%C3%A9tique_international",
+         "Aide:Alphabet phonétique international"),
+        ("/wiki/Wikip%C3%A9dia:Accueil", "Wikipédia:Accueil"),
+        ("/wiki/Category:Kings", "Category:Kings")])
+    links = list(name_translations.get_candidate_links([FRENCH_MONARCHS]))
+    # The link to a file is not extracted.
+    assert len(links) == 5
+    assert not any("Fichier" in href for name, href, title in links)
+
+    links, reasons = frontier_pruning.prune_links(
+        links, namespaces=name_translations.get_wiki_namespaces(links))
+    assert [href for name, href, title in links] == [
+        "https://fr.wikipedia.org/wiki/Louis_IX"]
+    assert reasons == {"namespace Catégorie": 1, "namespace Aide": 1,
+                       "namespace Wikipédia": 1, "namespace Category": 1}
+
+
+def test_crawl_prunes_foreign_list(tmp_path, pages, capsys):
+    serve_list(pages, FRENCH_MONARCHS[0], [
+        ("/wiki/Louis_IX", "Louis IX"),
+        ("/wiki/Cat%C3%A9gorie:Rois_de_France", "Catégorie:Rois de France")])
+    archive_path = str(tmp_path / "pages.warc.gz")
+    crawled = tmp_path / "crawled"
+    name_translations.main(["--output-dir", str(crawled), "--format",
+                            "csv", "--source", FRENCH_MONARCHS[1],
+                            "--prune", "--archive", archive_path])
+    assert read_frontier(crawled) == [
+        "https://fr.wikipedia.org/wiki/Louis_IX"]
+    assert "     1  namespace Catégorie\n" in capsys.readouterr().out
+
+    # A replay reads the wiki's namespaces from the archive.
+    replayed = tmp_path / "replayed"
+    page_archive.replay(archive_path, str(replayed), ["csv"], prune=True,
+                        processes=2, reextract=True)
+    assert read_outputs(replayed) == read_outputs(crawled)
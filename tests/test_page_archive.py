@@ -0,0 +1,101 @@
+# test_page_archive.py
+
+"""
+These tests record crawls of fixture pages in an archive and check that
+    page_archive.py replays them to the same outputs.
+"""
+
+# Import libraries.
+import os
+
+import requests
+
+import crawl_budget
+import dead_letters
+import name_translations
+import page_archive
+from conftest import FOREIGN_SOURCES, SOURCES, read_outputs
+
+BELGIAN_MONARCHS = "https://en.wikipedia.org/wiki/List_of_Belgian_monarchs"
+
+
+def replay(tmp_path, archive_path, **kwargs):
+    """
+    Replay the archive at archive_path to a directory in tmp_path and
+        return the directory, with the numbers of pages replayed, pages
+        skipped, and failures.
+    """
+    output_dir = tmp_path / "replayed"
+    return (output_dir, *page_archive.replay(
+        str(archive_path), str(output_dir), ["csv"], processes=2,
+        **kwargs))
+
+
+def read_failures(output_dir):
+    """
+    Return the failures in the dead-letter file in output_dir, without
+        the times at which they were recorded.
+    """
+    return [{key: value for key, value in failure.items() if key != "time"}
+            for failure in dead_letters.read_dead_letters(
+                os.path.join(output_dir, dead_letters.FILE_NAME))]
+
+
+def test_replay_of_selected_sources(tmp_path, crawl):
+    archive_path = tmp_path / "pages.warc.gz"
+    # Leave out the first list, which replaying the crawl must not ask
+    #   for.
+    crawled = crawl(tmp_path / "crawled", "--archive", str(archive_path),
+                    "--source", SOURCES[1], "--source", SOURCES[2],
+                    "--source", FOREIGN_SOURCES[0][1])
+    for reextract in [False, True]:
+        replayed, pages, skipped, failed = replay(tmp_path, archive_path,
+                                                  reextract=reextract)
+        assert (skipped, failed) == (0, 0)
+        assert read_outputs(replayed) == read_outputs(crawled)
+
+
+def test_replay_of_budgeted_crawl(tmp_path, crawl, monkeypatch):
+    def get_offline(*args, **kwargs):
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(crawl_budget.requests, "get", get_offline)
+    archive_path = tmp_path / "pages.warc.gz"
+    crawled = crawl(tmp_path / "crawled", "--archive", str(archive_path),
+                    "--budget-requests", "10")
+    replayed, pages, skipped, failed = replay(tmp_path, archive_path)
+    assert pages == 10
+    assert skipped > 0
+    assert read_outputs(replayed) == read_outputs(crawled)
+
+
+def test_replay_of_stopped_crawl(tmp_path, crawl):
+    archive_path = tmp_path / "pages.warc.gz"
+    crawl(tmp_path / "crawled", "--archive", str(archive_path))
+    # Cut the index after the first five person pages, as if the crawl
+    #   had been stopped there.
+    index_path = page_archive.get_index_path(str(archive_path))
+    with open(index_path, encoding="utf-8") as index_file:
+        lines = index_file.readlines()
+    people = [number for number, line in enumerate(lines)
+              if '"kind": "person"' in line]
+    with open(index_path, "w", encoding="utf-8") as index_file:
+        index_file.writelines(lines[:people[5]])
+
+    replayed, pages, skipped, failed = replay(tmp_path, archive_path)
+    assert pages == 5
+    assert skipped > 0
+
+
+def test_replay_of_failed_pages(tmp_path, crawl, pages):
+    failed_page = name_translations.get_frontier()[-3]["URL"]
+    pages.failing = {BELGIAN_MONARCHS, failed_page}
+    archive_path = tmp_path / "pages.warc.gz"
+    crawled = crawl(tmp_path / "crawled", "--archive", str(archive_path))
+    assert [failure["url"] for failure in read_failures(crawled)] == [
+        BELGIAN_MONARCHS, failed_page]
+
+    replayed, pages, skipped, failed = replay(tmp_path, archive_path)
+    assert (skipped, failed) == (0, 2)
+    assert read_outputs(replayed) == read_outputs(crawled)
+    assert read_failures(replayed) == read_failures(crawled)